@@ -37,7 +37,23 @@ if "bpy" in locals():
     import importlib
     importlib.reload(loadldraw)
 else:
-    from .loadldraw import loadldraw
+    import importlib.util
+    import sys
+
+    def lazyImport(name):
+        """Create a module that is only executed when one of its attributes is first used"""
+
+        if name in sys.modules:
+            return sys.modules[name]
+        spec = importlib.util.find_spec(name)
+        spec.loader = importlib.util.LazyLoader(spec.loader)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        return module
+
+    # loadldraw does the import work, registering the operator does not need it
+    loadldraw = lazyImport(__package__ + ".loadldraw.loadldraw")
 
 import configparser
 import sys
@@ -67,6 +83,7 @@ studLogoDirectory             =
 addEnvironment                = True
 bevelEdges                    = True
 bevelWidth                    = 0.5
+bakeBevel                     = False
 blendfileTrusted              = False
 cameraBorderPercentage        = 0.5
 curvedWalls                   = True
@@ -234,7 +251,7 @@ class ImportLDrawOps(bpy.types.Operator, ImportHelper):
     ldrawPath: StringProperty(
         name="",
         description="Full filepath to the LDraw Parts Library (download from http://www.ldraw.org)",
-        default=prefs.get("ldrawDirectory", loadldraw.Configure.findDefaultLDrawDirectory())
+        default=prefs.get("ldrawDirectory", "")
     )
 
     realScale: FloatProperty(
@@ -401,6 +418,12 @@ class ImportLDrawOps(bpy.types.Operator, ImportHelper):
         default=prefs.get("bevelWidth", 0.5)
     )
 
+    bakeBevel: BoolProperty(
+        name="Bake Bevel",
+        description="Apply the bevel once to each part mesh instead of adding a Bevel modifier to every part",
+        default=prefs.get("bakeBevel", False)
+    )
+
     addEnvironment: BoolProperty(
         name="Add Environment",
         description="Adds a ground plane and environment texture (for realistic look only)",
@@ -515,6 +538,13 @@ class ImportLDrawOps(bpy.types.Operator, ImportHelper):
     )
     # End Hidden properties
 
+    def invoke(self, context, event):
+        """Find the default LDraw directory when the file browser is first shown."""
+
+        if self.ldrawPath == "":
+            self.ldrawPath = loadldraw.Configure.findDefaultLDrawDirectory()
+        return super().invoke(context, event)
+
     def draw(self, context):
         """Display import options."""
 
@@ -558,6 +588,7 @@ class ImportLDrawOps(bpy.types.Operator, ImportHelper):
         box.prop(self, "addSubsurface")
         box.prop(self, "bevelEdges")
         box.prop(self, "bevelWidth")
+        box.prop(self, "bakeBevel")
         box.prop(self, "addGaps")
         box.prop(self, "gapWidthMM")
         box.prop(self, "curvedWalls")
@@ -602,6 +633,7 @@ class ImportLDrawOps(bpy.types.Operator, ImportHelper):
             self.addSubsurface           = ImportLDrawOps.prefs.get("addSubsurface",        self.addSubsurface)
             self.bevelEdges              = ImportLDrawOps.prefs.get("bevelEdges",           self.bevelEdges)
             self.bevelWidth              = ImportLDrawOps.prefs.get("bevelWidth",           self.bevelWidth)
+            self.bakeBevel               = ImportLDrawOps.prefs.get("bakeBevel",            self.bakeBevel)
             self.cameraBorderPercentage  = ImportLDrawOps.prefs.get("cameraBorderPercentage", self.cameraBorderPercentage)
             self.useColourScheme         = ImportLDrawOps.prefs.get("useColourScheme",      self.useColourScheme)
             self.curvedWalls             = ImportLDrawOps.prefs.get("curvedWalls",          self.curvedWalls)
@@ -652,6 +684,7 @@ class ImportLDrawOps(bpy.types.Operator, ImportHelper):
             ImportLDrawOps.prefs.set("addSubsurface",          self.addSubsurface)
             ImportLDrawOps.prefs.set("bevelEdges",             self.bevelEdges)
             ImportLDrawOps.prefs.set("bevelWidth",             self.bevelWidth)
+            ImportLDrawOps.prefs.set("bakeBevel",              self.bakeBevel)
             ImportLDrawOps.prefs.set("cameraBorderPercentage", self.cameraBorderPercentage)
             ImportLDrawOps.prefs.set("curvedWalls",            self.curvedWalls)
             ImportLDrawOps.prefs.set("flattenHierarchy",       self.flatten)
@@ -692,6 +725,7 @@ class ImportLDrawOps(bpy.types.Operator, ImportHelper):
         loadldraw.Options.addSubsurface               = self.addSubsurface
         loadldraw.Options.addWorldEnvironmentTexture  = self.addEnvironment
         loadldraw.Options.bevelWidth                  = self.bevelWidth
+        loadldraw.Options.bakeBevel                   = self.bakeBevel
         loadldraw.Options.cameraBorderPercent         = self.cameraBorderPercentage / 100.0
         loadldraw.Options.createInstances             = self.linkParts
         loadldraw.Options.curvedWalls                 = self.curvedWalls
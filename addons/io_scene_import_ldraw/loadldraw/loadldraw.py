@@ -46,7 +46,10 @@ import bmesh
 import time
 import platform
 import operator
+import numpy as np
 from zipfile import ZipFile
+from io_scene_render_ldraw.modelglobals import caches
+from io_scene_render_ldraw.modelglobals import instrumentation
 
 
 # **************************************************************************************
@@ -271,6 +274,7 @@ class Options:
 
     addBevelModifier   = True           # Adds a bevel modifier to each part (for rounded edges)
     bevelWidth         = 0.5            # Width of bevel
+    bakeBevel          = False          # Apply the bevel to each mesh once instead of a modifier per part
 
     addWorldEnvironmentTexture = True   # Add an environment texture
     addGroundPlane     = True           # Add a ground plane
@@ -309,16 +313,21 @@ class Options:
                          str(Options.studLogoDirectory),
                          str(Options.resolveAmbiguousNormals),
                          str(Options.addBevelModifier),
-                         str(Options.bevelWidth)])
+                         str(Options.bevelWidth),
+                         str(Options.bakeBevel)])
 
 # **************************************************************************************
 # Globals
 globalBrickCount = 0
+globalObjectNames = {}          # Number of objects created per name, for unique object names
 globalObjectsToAdd = []         # Blender objects to add to the scene
+globalGroupObjects = {}         # Group empty of each group path created by this import
 globalCamerasToAdd = []         # Camera data to add to the scene
 globalLightsToAdd  = []         # Light data to add to the scene
 globalContext = None
-globalPoints = []
+globalPoints = []                # Hull points of each instance in global space, for positioning
+globalMeshHulls = caches.BoundedCache("legacy_mesh_hulls")                 # Convex hull points of each mesh in local space
+globalMeshTransparency = caches.BoundedCache("legacy_mesh_transparency")   # Whether each mesh has a transparent material
 globalScaleFactor = Options.realScale   # rollback realScale: 0.0004
 globalWeldDistance = 0.0005
 
@@ -355,6 +364,11 @@ class Math:
     def clamp01(value):
         return max(min(value, 1.0), 0.0)
 
+    def transformPoints(matrix, points):
+        """Transform an (n, 3) array of points by a 4x4 matrix"""
+        matrix = np.array(matrix)
+        return points @ matrix[:3, :3].T + matrix[:3, 3]
+
     def __init__(self):
         global globalScaleFactor
 
@@ -1230,6 +1244,27 @@ class FileSystem:
     Reads text files in different encodings. Locates full filepath for a part.
     """
 
+    __resolvedPaths = caches.BoundedCache("legacy_resolved_paths")  # Result of locate, including misses (None), keyed by (filename, rootPath)
+    __searchRoots = caches.BoundedCache("legacy_search_roots")      # Case corrected search path directories
+
+    def clearCache():
+        FileSystem.__resolvedPaths.clear()
+        FileSystem.__searchRoots.clear()
+
+    def __directoryNames(dirname):
+        """Returns the lowercase to actual name map of a directory, listing it only once."""
+
+        names = CachedDirectoryFilenames.getCached(dirname)
+        if names is None:
+            names = {}
+            try:
+                for name in os.listdir(dirname):
+                    names.setdefault(name.lower(), name)
+            except OSError:
+                pass
+            CachedDirectoryFilenames.addToCache(dirname, names)
+        return names
+
     # Takes a case-insensitive filepath and constructs a case sensitive version (based on an actual existing file)
     # See https://stackoverflow.com/questions/8462449/python-case-insensitive-file-name/8462613#8462613
     def pathInsensitive(path):
@@ -1282,19 +1317,8 @@ class FileSystem:
 
         # at this point, the directory exists but not the file
 
-        try:  # we are expecting dirname to be a directory, but it could be a file
-            files = CachedDirectoryFilenames.getCached(dirname)
-            if files is None:
-                files = os.listdir(dirname)
-                CachedDirectoryFilenames.addToCache(dirname, files)
-        except OSError:
-            return
-
-        baselow = base.lower()
-        try:
-            basefinal = next(fl for fl in files if fl.lower() == baselow)
-        except StopIteration:
-            return
+        # we are expecting dirname to be a directory, but it could be a file (no names then)
+        basefinal = FileSystem.__directoryNames(dirname).get(base.lower())
 
         if basefinal:
             return os.path.join(dirname, basefinal) + suffix
@@ -1344,6 +1368,49 @@ class FileSystem:
     def locate(filename, rootPath = None):
         """Given a file name of an ldraw file, find the full path"""
 
+        with instrumentation.span("file_resolution"):
+            return FileSystem.__locate(filename, rootPath)
+
+    def __locate(filename, rootPath):
+        key = (filename, rootPath)
+        if key in FileSystem.__resolvedPaths:
+            instrumentation.cache_hit("file_resolution")
+            result = FileSystem.__resolvedPaths[key]
+        else:
+            instrumentation.cache_miss("file_resolution")
+            result = FileSystem.__resolve(filename, rootPath)
+            FileSystem.__resolvedPaths[key] = result
+
+        if result is None:
+            instrumentation.count("missing_files")
+        return result
+
+    def __searchRoot(path):
+        """Returns a search path with its case corrected, resolved once."""
+
+        root = FileSystem.__searchRoots.get(path)
+        if root is None:
+            root = FileSystem.pathInsensitive(path)
+            FileSystem.__searchRoots[path] = root
+        return root
+
+    def __findInDirectory(dirname, partName):
+        """Case-insensitive lookup of a lowercase relative path using the cached directory names."""
+
+        path = dirname
+        for component in partName.replace("/", os.path.sep).split(os.path.sep):
+            if component == '' or component == '.':
+                continue
+            if component == '..':
+                path = os.path.dirname(path)
+                continue
+            name = FileSystem.__directoryNames(path).get(component)
+            if name is None:
+                return None
+            path = os.path.join(path, name)
+        return path
+
+    def __resolve(filename, rootPath):
         partName = filename.lower()
         partName = partName.replace("\\", os.path.sep)
         partName = os.path.expanduser(partName)
@@ -1355,12 +1422,15 @@ class FileSystem:
         if rootPath not in allSearchPaths:
             allSearchPaths.append(rootPath)
 
-        for path in allSearchPaths:
-            fullPathName = os.path.join(path, partName)
-            fullPathName = FileSystem.pathInsensitive(fullPathName)
-
+        if os.path.isabs(partName):
+            fullPathName = FileSystem.pathInsensitive(partName)
             if os.path.exists(fullPathName):
                 return fullPathName
+        else:
+            for path in allSearchPaths:
+                fullPathName = FileSystem.__findInDirectory(FileSystem.__searchRoot(path), partName)
+                if fullPathName is not None:
+                    return fullPathName
 
         if haveArchiveLibraries is True:
             allSearchPaths = Configure.archiveSearchPaths[:]
@@ -1369,8 +1439,7 @@ class FileSystem:
                 library = CachedLibraries.cachedFileExists(fullPathName)
                 
                 if library != CachedLibraries.notFound:
-                    resultSet = set([library, fullPathName])
-                    return resultSet
+                    return (library, fullPathName)
 
         return None
 
@@ -1378,9 +1447,9 @@ class FileSystem:
 # **************************************************************************************
 # **************************************************************************************
 class CachedDirectoryFilenames:
-    """Cached dictionary of directory filenames keyed by directory path"""
+    """Cached dictionary of lowercase to actual filenames of a directory, keyed by directory path"""
 
-    __cache = {}        # Dictionary
+    __cache = caches.BoundedCache("legacy_directory_filenames")
 
     def getCached(key):
         if key in CachedDirectoryFilenames.__cache:
@@ -1391,7 +1460,7 @@ class CachedDirectoryFilenames:
         CachedDirectoryFilenames.__cache[key] = value
 
     def clearCache():
-        CachedDirectoryFilenames.__cache = {}
+        CachedDirectoryFilenames.__cache.clear()
 
 
 # **************************************************************************************
@@ -1407,9 +1476,9 @@ class CachedLibraries:
     # Dictionary list - holds populated dictionaries
     __cache           = []
 
-    # Library Dictionaries
-    __officialcache   = {}
-    __unofficialcache = {}
+    # Library Dictionaries, released archives are read again by the next import
+    __officialcache   = caches.BoundedCache("legacy_official_library", on_release=lambda: CachedLibraries.releaseLibraries())
+    __unofficialcache = caches.BoundedCache("legacy_unofficial_library", on_release=lambda: CachedLibraries.releaseLibraries())
 
     __initialUpdate   = True
 
@@ -1453,31 +1522,43 @@ class CachedLibraries:
                     return None
 
     def setOfficialCache(library):
-        CachedLibraries.__officialcache = {key: library.read(key) for key in library.namelist()}
+        CachedLibraries.__officialcache.clear()
+        for key in library.namelist():
+            CachedLibraries.__officialcache[key] = library.read(key)
         CachedLibraries.__cache.append(CachedLibraries.__officialcache)
 
     def setUnofficialCache(library):
-        CachedLibraries.__unofficialcache = {key: library.read(key) for key in library.namelist()}
+        CachedLibraries.__unofficialcache.clear()
+        for key in library.namelist():
+            CachedLibraries.__unofficialcache[key] = library.read(key)
         CachedLibraries.__cache.append(CachedLibraries.__unofficialcache)
         CachedLibraries.__initialUpdate = False
 
     def updateUnofficialCache(library):
-        dictionary = {key: library.read(key) for key in library.namelist()}
-        CachedLibraries.__unofficialcache.update(dictionary)
+        for key in library.namelist():
+            CachedLibraries.__unofficialcache[key] = library.read(key)
 
     def clearCache():
-        CachedLibraries.__officialcache = {}
-        CachedLibraries.__unofficialcache = {}
+        CachedLibraries.__officialcache.clear()
+        CachedLibraries.__unofficialcache.clear()
         del CachedLibraries.__cache[:]
 
+    def releaseLibraries():
+        """Forget the loaded archives so the next import reads them again"""
+        CachedLibraries.clearCache()
+        CachedLibraries.__initialUpdate = True
+        Configure.loadedLibraries = []
+        Configure.hasOfficialLibrary = False
+        Configure.hasUnofficialLibrary = False
+
 
 # **************************************************************************************
 # **************************************************************************************
 class CachedFiles:
     """Cached dictionary of LDrawFile objects keyed by filename"""
 
-    __cache = {}        # Dictionary of exact filenames as keys, and file contents as values
-    __lowercache = {}   # Dictionary of lowercase filenames as keys, and file contents as values
+    __cache = caches.BoundedCache("legacy_files")                  # Dictionary of exact filenames as keys, and file contents as values
+    __lowercache = caches.BoundedCache("legacy_lowercase_files")   # Dictionary of lowercase filenames as keys, and file contents as values
 
     def getCached(key):
         # Look for an exact match in the cache first
@@ -1494,16 +1575,16 @@ class CachedFiles:
         CachedFiles.__lowercache[key.lower()] = value
 
     def clearCache():
-        CachedFiles.__cache = {}
-        CachedFiles.__lowercache = {}
+        CachedFiles.__cache.clear()
+        CachedFiles.__lowercache.clear()
 
 
 # **************************************************************************************
 # **************************************************************************************
 class CachedGeometry:
-    """Cached dictionary of LDrawGeometry objects"""
+    """Cached dictionary of LDrawGeometry objects, evicted geometry is baked again"""
 
-    __cache = {}        # Dictionary
+    __cache = caches.BoundedCache("legacy_geometry", max_bytes=caches.default_budget, sizeof=lambda geometry: geometry.nbytes())
 
     def getCached(key):
         if key in CachedGeometry.__cache:
@@ -1514,29 +1595,126 @@ class CachedGeometry:
         CachedGeometry.__cache[key] = value
 
     def clearCache():
-        CachedGeometry.__cache = {}
-
-# **************************************************************************************
-# **************************************************************************************
-class FaceInfo:
-    def __init__(self, faceColour, culling, windingCCW, isGrainySlopeAllowed):
-        self.faceColour = faceColour
-        self.culling = culling
-        self.windingCCW = windingCCW
-        self.isGrainySlopeAllowed = isGrainySlopeAllowed
-
+        CachedGeometry.__cache.clear()
 
 # **************************************************************************************
 # **************************************************************************************
 class LDrawGeometry:
-    """Stores the geometry for an LDrawFile"""
+    """
+    Stores the geometry for an LDrawFile as numpy arrays.
+
+    Faces never share points: face i uses the faceSizes[i] points following those of
+    the faces before it, so its point indices are implied by its offset (faceStarts).
+    Per face there is a colour name and culling, winding and grainy slope flags.
+    Faces of the default colour 16 inherit the colour of the part they end up in,
+    they are only resolved when a mesh is created (see resolvedColours).
+    Parsed faces and appended blocks are collected, then joined when first read.
+    """
 
     def __init__(self):
-        self.points = []
-        self.faces = []
-        self.faceInfo = []
-        self.edges = []
-        self.edgeIndices = []
+        self.__points = np.empty((0, 3))
+        self.__faceSizes = np.empty(0, dtype=np.int32)
+        self.__faceColours = np.empty(0, dtype=object)
+        self.__faceCulling = np.empty(0, dtype=bool)
+        self.__faceCCW = np.empty(0, dtype=bool)
+        self.__faceGrainy = np.empty(0, dtype=bool)
+        self.__edges = np.empty((0, 2, 3))
+        self.__blocks = []          # (points, faceSizes, faceColours, faceCulling, faceCCW, faceGrainy)
+        self.__edgeBlocks = []
+        self.__parsedFaces = []     # (points, colour, cull, ccw, isGrainySlopeAllowed) of each parsed face
+        self.__parsedEdges = []
+        self.__inheritsColour = None
+        self.meshes = {}            # Meshes created from this geometry, by mesh name
+
+    def nbytes(self):
+        """Estimated bytes of the arrays and blocks this geometry owns, not its meshes"""
+        return caches.estimate_size(self, exclude=("meshes",))
+
+    def __flushParsed(self):
+        if self.__parsedFaces:
+            faces = self.__parsedFaces
+            self.__parsedFaces = []
+            self.__blocks.append((
+                np.array([p for face in faces for p in face[0]], dtype=np.float64).reshape(-1, 3),
+                np.array([len(face[0]) for face in faces], dtype=np.int32),
+                np.array([face[1] for face in faces], dtype=object),
+                np.array([face[2] for face in faces], dtype=bool),
+                np.array([face[3] for face in faces], dtype=bool),
+                np.array([face[4] for face in faces], dtype=bool),
+            ))
+        if self.__parsedEdges:
+            self.__edgeBlocks.append(np.array(self.__parsedEdges, dtype=np.float64).reshape(-1, 2, 3))
+            self.__parsedEdges = []
+
+    def __join(self):
+        self.__flushParsed()
+        if self.__blocks:
+            current = (self.__points, self.__faceSizes, self.__faceColours,
+                       self.__faceCulling, self.__faceCCW, self.__faceGrainy)
+            fields = [np.concatenate(field) for field in zip(current, *self.__blocks)]
+            (self.__points, self.__faceSizes, self.__faceColours,
+             self.__faceCulling, self.__faceCCW, self.__faceGrainy) = fields
+            self.__blocks = []
+            self.__inheritsColour = None
+        if self.__edgeBlocks:
+            self.__edges = np.concatenate([self.__edges] + self.__edgeBlocks)
+            self.__edgeBlocks = []
+
+    @property
+    def points(self):
+        self.__join()
+        return self.__points
+
+    @property
+    def faceSizes(self):
+        self.__join()
+        return self.__faceSizes
+
+    @property
+    def faceStarts(self):
+        faceSizes = self.faceSizes
+        return np.cumsum(faceSizes) - faceSizes
+
+    @property
+    def faceCount(self):
+        return len(self.faceSizes)
+
+    @property
+    def faceColours(self):
+        self.__join()
+        return self.__faceColours
+
+    @property
+    def faceInheritsColour(self):
+        """Mask of the faces that take the colour of the part"""
+        faceColours = self.faceColours
+        if self.__inheritsColour is None:
+            self.__inheritsColour = faceColours == "16"
+        return self.__inheritsColour
+
+    def resolvedColours(self, colourName):
+        """Face colours with the inherited colour replaced by colourName"""
+        return np.where(self.faceInheritsColour, colourName, self.faceColours)
+
+    @property
+    def faceCulling(self):
+        self.__join()
+        return self.__faceCulling
+
+    @property
+    def faceCCW(self):
+        self.__join()
+        return self.__faceCCW
+
+    @property
+    def faceGrainy(self):
+        self.__join()
+        return self.__faceGrainy
+
+    @property
+    def edges(self):
+        self.__join()
+        return self.__edges
 
     def parseFace(self, parameters, cull, ccw, isGrainySlopeAllowed):
         """Parse a face from parameters"""
@@ -1561,11 +1739,7 @@ class LDrawGeometry:
             elif (nB.dot(nC) < 0):
                 newPoints[2], newPoints[1] = newPoints[1], newPoints[2]
 
-        pointCount = len(self.points)
-        newFace = list(range(pointCount, pointCount + num_points))
-        self.points.extend(newPoints)
-        self.faces.append(newFace)
-        self.faceInfo.append(FaceInfo(colourName, cull, ccw, isGrainySlopeAllowed))
+        self.__parsedFaces.append(([p.to_tuple() for p in newPoints], colourName, cull, ccw, isGrainySlopeAllowed))
 
     def parseEdge(self, parameters):
         """Parse an edge from parameters"""
@@ -1578,14 +1752,16 @@ class LDrawGeometry:
             blenderPos2 = Math.scaleMatrix @ mathutils.Vector( (float(parameters[5]),
                                                                 float(parameters[6]),
                                                                 float(parameters[7])) )
-            self.edges.append((blenderPos1, blenderPos2))
+            self.__parsedEdges.append((blenderPos1.to_tuple(), blenderPos2.to_tuple()))
+
+    def transform(self, matrix):
+        """Transform all points and edges in place"""
 
-    def verify(self, face, numPoints):
-        for i in face:
-            assert i < numPoints
-            assert i >= 0
+        self.__join()
+        self.__points = Math.transformPoints(matrix, self.__points)
+        self.__edges = Math.transformPoints(matrix, self.__edges.reshape(-1, 3)).reshape(-1, 2, 3)
 
-    def appendGeometry(self, geometry, matrix, isStud, isStudLogo, parentMatrix, cull, invert):
+    def appendGeometry(self, geometry, matrix, isStud, isStudLogo, parentMatrix, cull, invert, colourName="16"):
         combinedMatrix = parentMatrix @ matrix
         isReflected = combinedMatrix.determinant() < 0.0
         reflectStudLogo = isStudLogo and isReflected
@@ -1596,59 +1772,48 @@ class LDrawGeometry:
             invert = not invert
 
         # Append face information
-        pointCount = len(self.points)
-        newFaceInfo = []
-        for index, face in enumerate(geometry.faces):
-            # Gather points for this face (and transform points)
-            newPoints = []
-            for i in face:
-                newPoints.append(fixedMatrix @ geometry.points[i])
-
-            # Add clockwise and/or anticlockwise sets of points as appropriate
-            newFace = face.copy()
-            for i in range(len(newFace)):
-                newFace[i] += pointCount
-
-            faceInfo = geometry.faceInfo[index]
-            faceCCW = faceInfo.windingCCW != invert
-            faceCull = faceInfo.culling and cull
+        faceSizes = geometry.faceSizes
+        if len(faceSizes):
+            faceCCW = geometry.faceCCW != invert
+            faceCull = geometry.faceCulling & cull
 
             # If we are going to resolve ambiguous normals by "best guess" we will let
             # Blender calculate that for us later. Just cull with arbitrary winding for now.
-            if not faceCull:
-                if Options.resolveAmbiguousNormals == "guess":
-                    faceCull = True
-
-            if faceCCW or not faceCull:
-                self.points.extend(newPoints)
-                self.faces.append(newFace)
-
-                newFaceInfo.append(
-                    FaceInfo(faceInfo.faceColour, True, True, not isStud and faceInfo.isGrainySlopeAllowed))
-                self.verify(newFace, len(self.points))
-
-            if not faceCull:
-                newFace = newFace.copy()
-                pointCount += len(newPoints)
-                for i in range(len(newFace)):
-                    newFace[i] += len(newPoints)
-
-            if not faceCCW or not faceCull:
-                self.points.extend(newPoints[::-1])
-                self.faces.append(newFace)
-
-                newFaceInfo.append(
-                    FaceInfo(faceInfo.faceColour, True, True, not isStud and faceInfo.isGrainySlopeAllowed))
-                self.verify(newFace, len(self.points))
-
-        self.faceInfo.extend(newFaceInfo)
-        assert len(self.faces) == len(self.faceInfo)
+            if Options.resolveAmbiguousNormals == "guess":
+                faceCull = np.ones_like(faceCull)
+
+            # Each face is added as is if it winds anticlockwise, reversed if it winds clockwise,
+            # and both ways (as is first) if it is not culled
+            keep = np.stack((faceCCW | ~faceCull, ~faceCCW | ~faceCull), axis=1).ravel()
+            faceIndices = np.repeat(np.arange(len(faceSizes)), 2)[keep]
+            isReversed = np.tile((False, True), len(faceSizes))[keep]
+
+            # Gather the points of each new face, backwards for reversed faces
+            newSizes = faceSizes[faceIndices]
+            corner = np.arange(newSizes.sum()) - np.repeat(np.cumsum(newSizes) - newSizes, newSizes)
+            corner = np.where(np.repeat(isReversed, newSizes), np.repeat(newSizes - 1, newSizes) - corner, corner)
+            pointIndices = np.repeat(geometry.faceStarts[faceIndices], newSizes) + corner
+
+            # A child with its own colour passes it on to the faces inheriting colour
+            newColours = geometry.faceColours[faceIndices]
+            if colourName != "16":
+                newColours[geometry.faceInheritsColour[faceIndices]] = colourName
+
+            self.__flushParsed()
+            self.__blocks.append((
+                Math.transformPoints(fixedMatrix, geometry.points)[pointIndices],
+                newSizes,
+                newColours,
+                np.ones(len(newSizes), dtype=bool),
+                np.ones(len(newSizes), dtype=bool),
+                geometry.faceGrainy[faceIndices] & (not isStud),
+            ))
 
         # Append edge information
-        newEdges = []
-        for edge in geometry.edges:
-            newEdges.append( (fixedMatrix @ edge[0], fixedMatrix @ edge[1]) )
-        self.edges.extend(newEdges)
+        edges = geometry.edges
+        if len(edges):
+            self.__flushParsed()
+            self.__edgeBlocks.append(Math.transformPoints(fixedMatrix, edges.reshape(-1, 3)).reshape(-1, 2, 3))
 
 
 # **************************************************************************************
@@ -1740,10 +1905,11 @@ class LDrawNode:
 
     def load(self):
         # Is this file in the cache?
-        self.file = CachedFiles.getCached(self.filename)
+        self.file = instrumentation.cache_lookup("ldraw_file", CachedFiles.getCached(self.filename))
         if self.file is None:
             # Not in cache, so load file
-            self.file = LDrawFile(self.filename, self.isFullFilepath, self.parentFilepath, None, self.isSubPart)
+            with instrumentation.span("parse", file=self.filename):
+                self.file = LDrawFile(self.filename, self.isFullFilepath, self.parentFilepath, None, self.isSubPart)
             assert self.file is not None
 
             # Add the new file to the cache
@@ -1794,21 +1960,18 @@ class LDrawNode:
         ourColourName = LDrawNode.resolveColour(self.colourName, realColourName)
         code = LDrawNode.getBFCCode(accumCull, accumInvert, self.bfcCull, self.bfcInverted)
         meshName = "Mesh_{0}_{1}{2}".format(basename, ourColourName, code)
-        key = (self.filename, ourColourName, accumCull, accumInvert, self.bfcCull, self.bfcInverted)
-        bakedGeometry = CachedGeometry.getCached(key)
+        # The baked geometry does not depend on the colour, faces of colour 16 keep inheriting it
+        key = (self.filename, accumCull, accumInvert, self.bfcCull, self.bfcInverted)
+        bakedGeometry = instrumentation.cache_lookup("geometry", CachedGeometry.getCached(key))
         if bakedGeometry is None:
+            instrumentation.count("geometry_bakes")
             combinedMatrix = parentMatrix @ self.matrix
 
             # Start with a copy of our file's geometry
-            assert len(self.file.geometry.faces) == len(self.file.geometry.faceInfo)
             bakedGeometry = LDrawGeometry()
             bakedGeometry.appendGeometry(self.file.geometry, Math.identityMatrix, self.file.isStud,
                                          self.file.isStudLogo, combinedMatrix, self.bfcCull, self.bfcInverted)
 
-            # Replaces the default colour 16 in our faceColours list with a specific colour
-            for faceInfo in bakedGeometry.faceInfo:
-                faceInfo.faceColour = LDrawNode.resolveColour(faceInfo.faceColour, ourColourName)
-
             # Append each child's geometry
             for child in self.file.childNodes:
                 assert child.file is not None
@@ -1820,10 +1983,9 @@ class LDrawNode:
                     isStud = child.file.isStud
                     isStudLogo = child.file.isStudLogo
                     bakedGeometry.appendGeometry(bg, child.matrix, isStud, isStudLogo, combinedMatrix, self.bfcCull,
-                                                 self.bfcInverted)
+                                                 self.bfcInverted, child.colourName)
 
             CachedGeometry.addToCache(key, bakedGeometry)
-        assert len(bakedGeometry.faces) == len(bakedGeometry.faceInfo)
         return (meshName, bakedGeometry)
 
 
@@ -1952,7 +2114,7 @@ class LDrawFile:
             if result is None:
                 printWarningOnce("Missing file {0} in path {1}".format(filepath, parentDir))
                 return False
-            fromArchive = isinstance(result, (set)) and len(result) > 1 and haveArchiveLibraries
+            fromArchive = isinstance(result, tuple) and haveArchiveLibraries
             if fromArchive is True:
                 filepath = result[1]
             else:
@@ -2349,10 +2511,8 @@ class LDrawFile:
                         printWarningOnce("Found double-sided polygons in file {0}".format(self.filename))
                         self.isDoubleSided = True
 
-                    assert len(self.geometry.faces) == len(self.geometry.faceInfo)
                     self.geometry.parseFace(parameters, self.bfcCertified and bfcLocalCull, bfcWindingCCW,
                                             isGrainySlopeAllowed)
-                    assert len(self.geometry.faces) == len(self.geometry.faceInfo)
 
                 bfcInvertNext = False
 
@@ -2364,7 +2524,7 @@ class LDrawFile:
 class BlenderMaterials:
     """Creates and stores a cache of materials for Blender"""
 
-    __material_list = {}
+    __material_list = caches.BoundedCache("legacy_materials")
     __hasPrincipledShader = "ShaderNodeBsdfPrincipled" in [node.nodetype for node in getattr(bpy.types, "NODE_MT_category_SH_NEW_SHADER").category.items(None)]
 
     def __getGroupName(name):
@@ -2870,8 +3030,10 @@ class BlenderMaterials:
 
         # If it's already in the cache, use that
         if (colourName in BlenderMaterials.__material_list):
+            instrumentation.cache_hit("material")
             result = BlenderMaterials.__material_list[colourName]
             return result
+        instrumentation.cache_miss("material")
 
         # Create a name for the material based on the colour
         if Options.instructionsLook:
@@ -2888,7 +3050,8 @@ class BlenderMaterials:
 
         # Create new material
         col = BlenderMaterials.__getColourData(pureColourName)
-        material = BlenderMaterials.__createNodeBasedMaterial(blenderName, col, isSlopeMaterial)
+        with instrumentation.span("material_build"):
+            material = BlenderMaterials.__createNodeBasedMaterial(blenderName, col, isSlopeMaterial)
 
         if material is None:
             printWarningOnce("Could not create material for blenderName {0}".format(blenderName))
@@ -2899,7 +3062,7 @@ class BlenderMaterials:
 
     # **********************************************************************************
     def clearCache():
-        BlenderMaterials.__material_list = {}
+        BlenderMaterials.__material_list.clear()
 
     # **********************************************************************************
     def __createGroup(name, x1, y1, x2, y2, createShaderOutput):
@@ -3761,9 +3924,28 @@ class BlenderMaterials:
         BlenderMaterials.__createBlenderLegoMilkyWhiteNodeGroup()
 
 
+# **************************************************************************************
+def getBevelWeightLayer(bm, create=False):
+    """
+    Returns the bmesh edge layer holding bevel weights, or None if there is none.
+    Blender 4.0 replaced the bevel weight layer with the 'bevel_weight_edge' attribute.
+    """
+    if hasattr(bm.edges.layers, "bevel_weight"):
+        layers = bm.edges.layers.bevel_weight
+        if 'BevelWeight' in layers:
+            return layers['BevelWeight']
+        if '' in layers:
+            return layers['']
+        return layers.verify() if create else None
+
+    layer = bm.edges.layers.float.get('bevel_weight_edge')
+    if layer is None and create:
+        layer = bm.edges.layers.float.new('bevel_weight_edge')
+    return layer
+
 # **************************************************************************************
 def addSharpEdges(bm, geometry, filename):
-    if geometry.edges:
+    if len(geometry.edges):
         global globalWeldDistance
         epsilon = globalWeldDistance
 
@@ -3795,12 +3977,7 @@ def addSharpEdges(bm, geometry, filename):
                     edgeIndices[(e1, e0)] = True
 
         # Find layer for bevel weights
-        if 'BevelWeight' in bm.edges.layers.bevel_weight:
-            bwLayer = bm.edges.layers.bevel_weight['BevelWeight']
-        elif '' in bm.edges.layers.bevel_weight:
-            bwLayer = bm.edges.layers.bevel_weight['']
-        else:
-            bwLayer = None
+        bwLayer = getBevelWeightLayer(bm, create=True)
 
         # Find the appropriate mesh edges and make them sharp (i.e. not smooth)
         for meshEdge in bm.edges:
@@ -3892,7 +4069,7 @@ def meshIsReusable(meshName, geometry):
         # A mesh loses it's materials information when it is no longer in use.
         # We must check the number of faces matches, otherwise we can't re-set the
         # materials.
-        if mesh.users == 0 and (len(mesh.polygons) != len(geometry.faces)):
+        if mesh.users == 0 and (len(mesh.polygons) != geometry.faceCount):
             # debugPrint("meshIsReusable says no users and num faces changed.")
             return False
 
@@ -3910,22 +4087,22 @@ def meshIsReusable(meshName, geometry):
 
 # **************************************************************************************
 def addNodeToParentWithGroups(parentObject, groupNames, newObject):
+    global globalGroupObjects
+
     if not Options.flattenGroups:
-        # Create groups as needed
+        # Create groups as needed, each group path below a parent is created once per import
+        groupPath = (parentObject,)
         for groupName in groupNames:
-            # The max length of a Blender node name appears to be 63 bytes when encoded as UTF-8. We make sure it fits.
-            while len(groupName.encode("utf8")) > 63:
-                groupName = groupName[:-1]
-
-            # Check if we already have this node name, or if we need to create a new node
-            groupObj = None
-            for obj in bpy.data.objects:
-                if (obj.name == groupName):
-                    groupObj = obj
-            if (groupObj is None):
-                groupObj = bpy.data.objects.new(groupName, None)
+            groupPath += (groupName,)
+
+            # Check if we already have this group node, or if we need to create a new node
+            groupObj = globalGroupObjects.get(groupPath)
+            if groupObj is None:
+                # The max length of a Blender node name appears to be 63 bytes when encoded as UTF-8. We make sure it fits.
+                groupObj = bpy.data.objects.new(clampName(groupName), None)
                 groupObj.parent = parentObject
                 globalObjectsToAdd.append(groupObj)
+                globalGroupObjects[groupPath] = groupObj
             parentObject = groupObj
 
     newObject.parent = parentObject
@@ -4052,127 +4229,136 @@ def parseParentsFile(file):
 
 
 # **************************************************************************************
-def setupImplicitParents():
-    global globalScaleFactor
+# Parsed parents file, reused while the file is unchanged
+globalParentsCache = caches.BoundedCache("legacy_parents")
 
-    if not Options.minifigHierarchy:
-        return
+def getPartsHierarchy(file):
+    """
+    Returns (partsHierarchy, parentParts, childParts) for the parents file,
+    parsing it only when it has not been seen or has been modified.
+    """
+    global globalParentsCache
 
-    parseParentsFile(Options.parentsFile)
-    # print(partsHierarchy)
-    if not partsHierarchy:
-        return
+    try:
+        mtime = os.path.getmtime(file)
+    except OSError:
+        return None, set(), set()
 
-    bpy.context.view_layer.update()
+    cached = globalParentsCache.get(file)
+    if cached is not None and cached[0] == mtime:
+        instrumentation.cache_hit("parents_file")
+        return cached[1]
+    instrumentation.cache_miss("parents_file")
+
+    parseParentsFile(file)
+    if not partsHierarchy:
+        return None, set(), set()
 
-    # create a set of the parent parts and a set of child parts from the partsHierarchy
+    # create a set of the parent parts and a set of child parts from the partsHierarchy,
+    # with the children of each parent as a set for quick membership tests
+    hierarchy = {}
     parentParts = set()
     childParts = set()
     for parent, childrenData in partsHierarchy.items():
+        hierarchy[parent] = (childrenData[0], set(childrenData[1]))
         parentParts.add(parent)
         childParts.update(childrenData[1])
 
-    # create a flat set of all interesting parts (parents and children together)
-    interestingParts = set()
-    interestingParts.update(parentParts)
-    interestingParts.update(childParts)
+    globalParentsCache[file] = (mtime, (hierarchy, parentParts, childParts))
+    return hierarchy, parentParts, childParts
+
+# **************************************************************************************
+def setupImplicitParents():
+    global globalScaleFactor
+
+    if not Options.minifigHierarchy:
+        return
+
+    hierarchy, parentParts, childParts = getPartsHierarchy(Options.parentsFile)
+    # print(hierarchy)
+    if not hierarchy:
+        return
+
+    bpy.context.view_layer.update()
 
     # print('Parent parts: %s' % (parentParts,))
     # print('Child parts: %s' % (childParts,))
-    # print('Interesting parts: %s' % (interestingParts,))
 
     tolerance = globalScaleFactor * 5 # in LDraw units
     squaredTolerance = tolerance * tolerance
     # print(" Squared tolerance: %s" % (squaredTolerance,))
 
-    # For each interesting mesh in the scene, remember the bare part number and the children
-    parentMeshParts = {}        # bare part numbers of the parents
-    childMeshParts = {}         # bare part numbers of the children
-    parentableMeshes = {}       # interesting children
-    lego_part_pattern = "([A-Za-z]?\d+)($|\D)"
-
-    # for each object in the scene
+    def cellOf(location):
+        return (math.floor(location[0] / tolerance),
+                math.floor(location[1] / tolerance),
+                math.floor(location[2] / tolerance))
+
+    # Bare part number of each mesh in the scene, matched once per mesh
+    meshParts = {}
+    lego_part_pattern = re.compile("([A-Za-z]?\d+)($|\D)")
+
+    def partNameOf(name):
+        partName = meshParts.get(name)
+        if partName is None:
+            partName = ''
+            if name.startswith('Mesh_'):
+                # skip 'Mesh_' and get part of name that is just digits (possibly with a letter in front)
+                test_name = name[5:]
+                if " - " in test_name:
+                    test_name = test_name.split(" - ",1)[1]
+                m = lego_part_pattern.match(test_name)
+                if m:
+                    partName = m.group(1)
+            meshParts[name] = partName
+        return partName
+
+    # Gather the interesting objects in one pass. Children are put in a spatial hash of
+    # cells the size of the tolerance, so each slot only looks at its neighbouring cells
+    parentObjects = []
+    childCells = {}
     for obj in bpy.data.objects:
         if obj.type != 'MESH':
             continue
 
-        name = obj.data.name
-        if not name.startswith('Mesh_'):
+        partName = partNameOf(obj.data.name)
+        if not partName:
             continue
 
-        # skip 'Mesh_' and get part of name that is just digits (possibly with a letter in front)
-        test_name = name[5:]
-        if " - " in test_name:
-            test_name = test_name.split(" - ",1)[1]
-
-        partName = ''
-        m = re.match(lego_part_pattern, test_name)
-        if m:
-            partName = m.group(1)
-
-        # For each interesting parent mesh in the scene, remember the bare part number and the children
         if partName in parentParts:
-            # remember the bare part number for each interesting mesh in the scene
-            parentMeshParts[name] = partName
-
-            # remember possible children of the mesh in the scene
-            children = partsHierarchy.get(partName)
-            if children:
-                parentableMeshes[name] = children
+            parentObjects.append((obj, hierarchy[partName]))
+            # print("Possible parent object %s has matrix %s" % (obj.name, obj.matrix_world))
 
-        # For each interesting child mesh in the scene, remember the bare part number
         if partName in childParts:
-            # remember the bare part number for each interesting mesh in the scene
-            childMeshParts[name] = partName
+            childLocation = obj.matrix_world.to_translation()
+            childCells.setdefault(cellOf(childLocation), []).append((obj, partName, childLocation))
 
-    # Now, iterate through the objects in the scene and gather the interesting ones
-    parentObjects = []
-    childObjects = []
-    for obj in bpy.data.objects:
-        if obj.type != 'MESH':
-            continue
-        meshName = obj.data.name
-        if meshName in parentMeshParts:
-            parentObjects.append(obj)
-            # print("Possible parent object %s has matrix %s" % (obj.name, obj.matrix_world))
-        if meshName in childMeshParts:
-            childObjects.append(obj)
+    if not childCells:
+        return
+
+    neighbours = [(x, y, z) for x in (-1, 0, 1) for y in (-1, 0, 1) for z in (-1, 0, 1)]
 
     # for each interesting parent object
-    for obj in parentObjects:
-        meshName = obj.data.name
-        childrenData = parentableMeshes.get(meshName)
-        if not childrenData:
-            continue
-        # parentLocation = obj.matrix_world @ mathutils.Vector((0, 0, 0))
-        # parentMatrixInverted = obj.matrix_world.inverted()
-        # print("Looking for children of %s (at %s)" % (obj.name, parentLocation))
-
-        slotLocations = []
-        for slot in childrenData[0]:
-            loc = obj.matrix_world @ (mathutils.Vector(slot) * globalScaleFactor)
-            slotLocations.append(loc)
-        # print(" Slot locations: %s" % (slotLocations,))
-
-        # for each interesting child object
-        for childObj in childObjects:
-            childMeshName = childObj.data.name
-            childPartName = childMeshParts[childMeshName]
-            if childPartName not in childrenData[1]:
-                continue
-            childLocation = childObj.matrix_world.to_translation()
-            # print("  Found possible child %s" % (childObj.name,))
-            for slotLocation in slotLocations:
-                # print("  Slot location:%s   Child Location:%s" % (slotLocation, childLocation))
-                diff = slotLocation - childLocation
-                squaredDistance = diff.length_squared
-                # print("  location: %s (squared distance: %s)" % (childLocation, squaredDistance))
-                if squaredDistance <= squaredTolerance:
-                    temp = childObj.matrix_world
-                    childObj.parent = obj
-                    # childObj.matrix_parent_inverse = parentMatrixInverted
-                    childObj.matrix_world = temp
-                    # print("    Got it! Parent '%s' now has child '%s'" % (obj.name, childObj.name))
+    for obj, childrenData in parentObjects:
+        attachPoints, childPartNames = childrenData
+        # print("Looking for children of %s" % (obj.name,))
+
+        for slot in attachPoints:
+            slotLocation = obj.matrix_world @ (mathutils.Vector(slot) * globalScaleFactor)
+            cx, cy, cz = cellOf(slotLocation)
+
+            # for each interesting child object near the slot
+            for dx, dy, dz in neighbours:
+                for childObj, childPartName, childLocation in childCells.get((cx + dx, cy + dy, cz + dz), ()):
+                    if childPartName not in childPartNames:
+                        continue
+                    # print("  Slot location:%s   Child Location:%s" % (slotLocation, childLocation))
+                    squaredDistance = (slotLocation - childLocation).length_squared
+                    if squaredDistance <= squaredTolerance:
+                        temp = childObj.matrix_world.copy()
+                        childObj.parent = obj
+                        # childObj.matrix_parent_inverse = parentMatrixInverted
+                        childObj.matrix_world = temp
+                        # print("    Got it! Parent '%s' now has child '%s'" % (obj.name, childObj.name))
 
 # **************************************************************************************
 def slopeAnglesForPart(partName):
@@ -4197,53 +4383,81 @@ def slopeAnglesForPart(partName):
 
 
 # **************************************************************************************
-def isSlopeFace(slopeAngles, isGrainySlopeAllowed, faceVertices):
+def slopeFaces(slopeAngles, geometry):
     """
-    Checks whether a given face should receive a grainy slope material.
+    Returns a mask of the faces of the geometry that should receive a grainy slope material.
     """
 
     # Step 1: Ignore some faces (studs) when checking for a grainy face
-    if not isGrainySlopeAllowed:
-        return False
+    isSlope = geometry.faceGrainy.copy()
+    if not isSlope.any():
+        return isSlope
 
     # Step 2: Calculate angle of face normal to the ground
-    faceNormal = (faceVertices[1] - faceVertices[0]).cross(faceVertices[2] - faceVertices[0])
-    faceNormal.normalize()
+    points = geometry.points
+    faceStarts = geometry.faceStarts
+    p0 = points[faceStarts]
+    faceNormals = np.cross(points[faceStarts + 1] - p0, points[faceStarts + 2] - p0)
+    lengths = np.linalg.norm(faceNormals, axis=1)
 
     # Clamp value to range -1 to 1 (ensure we are in the strict range of the acos function, taking account of rounding errors)
-    cosine = min(max(faceNormal.y, -1.0), 1.0)
+    # A degenerate face has a zero normal, as with Vector.normalize()
+    cosines = np.divide(faceNormals[:, 1], lengths, out=np.zeros(len(lengths)), where=lengths > 0)
+    cosines = np.clip(cosines, -1.0, 1.0)
 
     # Calculate angle of face normal to the ground (-90 to 90 degrees)
-    angleToGroundDegrees = math.degrees(math.acos(cosine)) - 90
-
-    # debugPrint("Angle to ground {0}".format(angleToGroundDegrees))
+    anglesToGroundDegrees = np.degrees(np.arccos(cosines)) - 90
 
     # Step 3: Check angle of normal to ground is within one of the acceptable ranges for this part
-    return any(c[0] <= angleToGroundDegrees <= c[1] for c in slopeAngles)
+    inRange = np.zeros(len(anglesToGroundDegrees), dtype=bool)
+    for c in slopeAngles:
+        inRange |= (c[0] <= anglesToGroundDegrees) & (anglesToGroundDegrees <= c[1])
+    return isSlope & inRange
+
+# **************************************************************************************
+def fillMesh(mesh, geometry):
+    """Fills an empty mesh with the points and faces of the geometry."""
+
+    pointCount = len(geometry.points)
+    faceSizes = geometry.faceSizes
+
+    mesh.vertices.add(pointCount)
+    mesh.vertices.foreach_set("co", geometry.points.astype(np.float32).ravel())
+
+    # Faces never share points, so each loop uses the point of the same index
+    mesh.loops.add(pointCount)
+    mesh.loops.foreach_set("vertex_index", np.arange(pointCount, dtype=np.int32))
+
+    mesh.polygons.add(len(faceSizes))
+    mesh.polygons.foreach_set("loop_start", geometry.faceStarts.astype(np.int32))
+    # Blender 3.6 and later derive the loop totals from the loop starts
+    if not bpy.types.MeshPolygon.bl_rna.properties["loop_total"].is_readonly:
+        mesh.polygons.foreach_set("loop_total", faceSizes.astype(np.int32))
 
 # **************************************************************************************
-def createMesh(name, meshName, geometry):
+def createMesh(name, meshName, geometry, colourName):
     # Are there any points?
-    if not geometry.points:
+    if not len(geometry.points):
         return (None, False)
 
     newMeshCreated = False
 
     # Have we already cached this mesh?
-    if Options.createInstances and hasattr(geometry, 'mesh'):
-        mesh = geometry.mesh
+    if Options.createInstances and meshName in geometry.meshes:
+        instrumentation.cache_hit("mesh")
+        mesh = geometry.meshes[meshName]
     else:
         # Does this mesh already exist in Blender?
         if meshIsReusable(meshName, geometry):
+            instrumentation.cache_hit("mesh")
             mesh = bpy.data.meshes[meshName]
         else:
+            instrumentation.cache_miss("mesh")
             # Create new mesh
             # debugPrint("Creating Mesh for node {0}".format(node.filename))
             mesh = bpy.data.meshes.new(meshName)
 
-            points = [p.to_tuple() for p in geometry.points]
-
-            mesh.from_pydata(points, [], geometry.faces)
+            fillMesh(mesh, geometry)
 
             mesh.validate()
             mesh.update()
@@ -4256,40 +4470,61 @@ def createMesh(name, meshName, geometry):
 
         # Create materials and assign material to each polygon
         if mesh.users == 0:
-            assert len(mesh.polygons) == len(geometry.faces)
-            assert len(geometry.faces) == len(geometry.faceInfo)
+            assert len(mesh.polygons) == geometry.faceCount
 
             slopeAngles = slopeAnglesForPart(name)
-            isSloped = slopeAngles is not None
-            for i, f in enumerate(mesh.polygons):
-                faceInfo = geometry.faceInfo[i]
-                isSlopeMaterial = isSloped and isSlopeFace(slopeAngles, faceInfo.isGrainySlopeAllowed,
-                                                           [geometry.points[j] for j in geometry.faces[i]])
-                faceColour = faceInfo.faceColour
+            if slopeAngles is not None:
+                isSlope = slopeFaces(slopeAngles, geometry)
+            else:
+                isSlope = np.zeros(geometry.faceCount, dtype=bool)
+
+            # One material per unique colour and slope pair, in order of first use
+            faceColours = geometry.resolvedColours(colourName)
+            materialKeys = np.char.add(faceColours.astype(str), np.where(isSlope, "_s", ""))
+            uniqueKeys, firstFaces, faceKeys = np.unique(materialKeys, return_index=True, return_inverse=True)
+
+            slotIndices = np.zeros(len(uniqueKeys), dtype=np.int32)
+            for key in np.argsort(firstFaces):
+                faceColour = faceColours[firstFaces[key]]
                 # For debugging purposes, we can make sloped faces blue:
-                # if isSlopeMaterial:
+                # if isSlope[firstFaces[key]]:
                 #     faceColour = "1"
-                material = BlenderMaterials.getMaterial(faceColour, isSlopeMaterial)
+                material = BlenderMaterials.getMaterial(faceColour, bool(isSlope[firstFaces[key]]))
 
                 if material is not None:
                     if mesh.materials.get(material.name) is None:
                         mesh.materials.append(material)
-                    f.material_index = mesh.materials.find(material.name)
+                    slotIndices[key] = mesh.materials.find(material.name)
                 else:
                     printWarningOnce("Could not find material '{0}' in mesh '{1}'.".format(faceColour, name))
 
+            mesh.polygons.foreach_set("material_index", slotIndices[faceKeys.ravel()])
+
     # Cache mesh
     if newMeshCreated:
-        geometry.mesh = mesh
+        geometry.meshes[meshName] = mesh
 
     return (mesh, newMeshCreated)
 
+# **************************************************************************************
+def isMeshTransparent(mesh):
+    """Whether any material of the mesh is transparent, worked out once per mesh."""
+
+    global globalMeshTransparency
+
+    isTransparent = globalMeshTransparency.get(mesh.name)
+    if isTransparent is None:
+        isTransparent = any(material is not None and material.get("Lego.isTransparent", False)
+                            for material in mesh.materials)
+        globalMeshTransparency[mesh.name] = isTransparent
+    return isTransparent
+
 # **************************************************************************************
 def addModifiers(ob):
     global globalScaleFactor
 
     # Add Bevel modifier to each instance
-    if Options.addBevelModifier:
+    if Options.addBevelModifier and not Options.bakeBevel:
         bevelModifier = ob.modifiers.new("Bevel", type='BEVEL')
         bevelModifier.width = Options.bevelWidth * globalScaleFactor
         bevelModifier.segments = 4
@@ -4304,38 +4539,94 @@ def addModifiers(ob):
         edgeModifier.split_angle = math.radians(30.0)
 
 # **************************************************************************************
-def smoothShadingAndFreestyleEdges(ob):
-    # We would like to avoid using bpy.ops functions altogether since it
-    # slows down progressively as more objects are added to the scene, but
-    # we have no choice but to use it here (a) for smoothing and (b) for
-    # marking freestyle edges (no bmesh options exist currently). To minimise
-    # the performance drop, we add one object only to the scene, smooth it,
-    # then remove it again. Only at the end of the import process are all the
-    # objects properly added to the scene.
+def bakeBevel(mesh):
+    """Apply the bevel of addModifiers to the mesh, limited to edges with a bevel weight."""
+
+    global globalScaleFactor
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+
+    bwLayer = getBevelWeightLayer(bm)
+
+    if bwLayer is not None:
+        edges = [e for e in bm.edges if e[bwLayer] > 0.0]
+        if edges:
+            with instrumentation.span("bevel_bake"):
+                if bpy.app.version < (2, 90):
+                    bevelAffect = {'vertex_only': False}
+                else:
+                    bevelAffect = {'affect': 'EDGES'}
+                bmesh.ops.bevel(bm, geom=edges, offset=Options.bevelWidth * globalScaleFactor, offset_type='OFFSET',
+                                segments=4, profile=0.5, clamp_overlap=True, **bevelAffect)
+            bm.to_mesh(mesh)
 
-    # Temporarily add object to scene
-    linkToScene(ob)
+    bm.free()
+    mesh.update()
 
-    # Select object
-    selectObject(ob)
+# **************************************************************************************
+def smoothShadingAndFreestyleEdges(ob):
+    # Set directly on the mesh data rather than through bpy.ops, which needs the
+    # object linked to the scene and selected, slows down progressively as more
+    # objects are added to the scene and depends on the UI context.
+    mesh = ob.data
 
     # Smooth shading
     if Options.smoothShading:
-        # Smooth the mesh
-        bpy.ops.object.shade_smooth()
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
 
     if Options.instructionsLook:
         # Mark all sharp edges as freestyle edges
-        me = bpy.context.object.data
-        for e in me.edges:
-            e.use_freestyle_mark = e.use_edge_sharp
+        sharp = np.empty(len(mesh.edges), dtype=bool)
+        mesh.edges.foreach_get("use_edge_sharp", sharp)
+        mesh.edges.foreach_set("use_freestyle_mark", sharp)
+
+    mesh.update()
+
+
+# **************************************************************************************
+def clampName(name, maxBytes=63):
+    """Blender cuts names to 63 bytes, which can make distinct names collide"""
+
+    encoded = name.encode("utf-8")
+    if len(encoded) <= maxBytes:
+        return name
+    return encoded[:maxBytes].decode("utf-8", errors="ignore")
+
+# **************************************************************************************
+def existingObjectNameCounts():
+    """
+    Counts for uniqueObjectName that continue after the objects already in the
+    blend file, so a second import does not reuse the names of the first.
+    """
+
+    counts = {}
+    for obj in bpy.data.objects:
+        match = re.match(r"^(.*)\.(\d{3,})$", obj.name)
+        if match is None:
+            name, count = obj.name, 1
+        else:
+            name, count = match.group(1), int(match.group(2)) + 1
+        counts[name] = max(counts.get(name, 0), count)
+    return counts
 
-    # Deselect object
-    deselectObject(ob)
+# **************************************************************************************
+def uniqueObjectName(name):
+    """
+    Returns name, then name.001, name.002 etc. for repeats of the name in the blend file.
+    Counting the repeats ourselves avoids Blender searching for a free suffix
+    on every new object, which slows down as the number of repeats grows.
+    """
 
-    # Remove object from scene
-    unlinkFromScene(ob)
+    global globalObjectNames
 
+    name = clampName(name)
+    count = globalObjectNames.get(name, 0)
+    globalObjectNames[name] = count + 1
+    if count == 0:
+        return name
+    suffix = ".{0}".format(str(count).zfill(3))
+    return clampName(name, 63 - len(suffix)) + suffix
 
 # **************************************************************************************
 def createBlenderObjectsFromNode(node,
@@ -4359,14 +4650,17 @@ def createBlenderObjectsFromNode(node,
 
     if node.isBlenderObjectNode():
         ourColourName = LDrawNode.resolveColour(node.colourName, realColourName)
-        meshName, geometry = node.getBlenderGeometry(ourColourName, name)
-        mesh, newMeshCreated = createMesh(name, meshName, geometry)
+        with instrumentation.span("flatten"):
+            meshName, geometry = node.getBlenderGeometry(ourColourName, name)
+        with instrumentation.span("mesh_build"):
+            mesh, newMeshCreated = createMesh(name, meshName, geometry, ourColourName)
+        instrumentation.count("parts")
 
         # Format a name for the Blender Object
         if Options.numberNodes:
-            blenderName = str(globalBrickCount).zfill(5) + "_" + name
+            blenderName = clampName(str(globalBrickCount).zfill(5) + "_" + name)
         else:
-            blenderName = name
+            blenderName = uniqueObjectName(name)
         globalBrickCount = globalBrickCount + 1
 
         # Create Blender Object
@@ -4379,31 +4673,9 @@ def createBlenderObjectsFromNode(node,
             # See discussion: http://blender.stackexchange.com/questions/7358/python-performance-with-blender-operators
 
             # Use bevel weights (added to sharp edges) - Only available for Blender version < 3.4
+            # Later versions get the bevel weight layer from addSharpEdges (see getBevelWeightLayer)
             if hasattr(ob.data, "use_customdata_edge_bevel"):
                 ob.data.use_customdata_edge_bevel = True
-            else:
-                # Add to scene
-                linkToScene(ob)
-
-                # Blender 3.4 removed 'ob.data.use_customdata_edge_bevel', so this seems to be the alternative:
-                # See https://blender.stackexchange.com/a/270716
-                area_type = 'VIEW_3D' # change this to use the correct Area Type context you want to process in
-                areas  = [area for area in bpy.context.window.screen.areas if area.type == area_type]
-
-                if len(areas) <= 0:
-                    raise ValueError(f"Make sure an Area of type {area_type} is open or visible on your screen!")
-                selectObject(ob)
-                bpy.ops.object.mode_set(mode='EDIT')
-
-                with bpy.context.temp_override(
-                    window=bpy.context.window,
-                    area=areas[0],
-                    regions=[region for region in areas[0].regions if region.type == 'WINDOW'][0],
-                    screen=bpy.context.window.screen):
-                    bpy.ops.mesh.customdata_bevel_weight_edge_add()
-                bpy.ops.object.mode_set(mode='OBJECT')
-
-                unlinkFromScene(ob)
 
         # The lines out of an empty shown in the viewport are scaled to a reasonable size
         ob.empty_display_size = 5 * globalScaleFactor # rollback realScale: 250.0 * globalScaleFactor
@@ -4411,13 +4683,7 @@ def createBlenderObjectsFromNode(node,
         # Mark object as transparent if any polygon is transparent
         ob["Lego.isTransparent"] = False
         if mesh is not None:
-            for faceInfo in geometry.faceInfo:
-                material = BlenderMaterials.getMaterial(faceInfo.faceColour, False)
-                if material is not None:
-                    if "Lego.isTransparent" in material:
-                        if material["Lego.isTransparent"]:
-                            ob["Lego.isTransparent"] = True
-                            break
+            ob["Lego.isTransparent"] = isMeshTransparent(mesh)
 
         # Add any (LeoCAD) group nodes as parents of 'ob' (the new node), and as children of 'blenderNodeParent'.
         # Also add all objects to 'globalObjectsToAdd'.
@@ -4478,12 +4744,13 @@ def createBlenderObjectsFromNode(node,
             bm.clear()
             bm.free()
 
-            # Show the sharp edges in Edit Mode
-            for area in bpy.context.screen.areas:  # iterate through areas in current screen
-                if area.type == 'VIEW_3D':
-                    for space in area.spaces:  # iterate through spaces in current VIEW_3D area
-                        if space.type == 'VIEW_3D':  # check if space is a 3D view
-                            space.overlay.show_edge_sharp = True
+            # Show the sharp edges in Edit Mode (there is no screen when running in the background)
+            if bpy.context.screen is not None:
+                for area in bpy.context.screen.areas:  # iterate through areas in current screen
+                    if area.type == 'VIEW_3D':
+                        for space in area.spaces:  # iterate through spaces in current VIEW_3D area
+                            if space.type == 'VIEW_3D':  # check if space is a 3D view
+                                space.overlay.show_edge_sharp = True
 
             # Scale for Gaps
             if Options.gaps and node.file.isPart:
@@ -4527,15 +4794,18 @@ def createBlenderObjectsFromNode(node,
 
             smoothShadingAndFreestyleEdges(ob)
 
+            # Bevel the shared mesh once instead of a modifier on each instance
+            if Options.addBevelModifier and Options.bakeBevel:
+                bakeBevel(mesh)
+
         # Keep track of all vertices in global space, for positioning the camera and/or root object at the end
         # Notice that we do this after scaling for Options.gaps
         if Options.positionObjectOnGroundAtOrigin or Options.positionCamera:
             if mesh and mesh.vertices:
                 localTransform = localToWorldSpaceMatrix @ localMatrix
-                points = [localTransform @ p.co for p in mesh.vertices]
 
-                # Remember all the points
-                globalPoints.extend(points)
+                # Only the hull of the mesh can bound the model, so only those points are transformed
+                globalPoints.append(getMeshHullPoints(mesh) @ np.array(localTransform).T)
 
         # Hide selection of studs
         if node.file.isStud:
@@ -5024,13 +5294,54 @@ def iterateCameraPosition(camera, render, vcentre3d, moveCamera):
         return offset3d.length
     return 0.0
 
+# **************************************************************************************
+def getMeshHullPoints(mesh):
+    """Returns the convex hull points of the mesh as homogeneous local coordinates.
+
+    Computed once per mesh and shared by all its instances.
+    """
+
+    global globalMeshHulls
+
+    hull = globalMeshHulls.get(mesh.name)
+    if hull is None:
+        co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+        co = co.reshape(-1, 3)
+
+        points = co
+        if len(co) > 4:
+            bm = bmesh.new()
+            for v in co:
+                bm.verts.new(v)
+            ret = bmesh.ops.convex_hull(bm, input=bm.verts, use_existing_faces=False)
+            hullPoints = [vert.co[:] for vert in ret["geom"] if isinstance(vert, bmesh.types.BMVert)]
+            # Flat meshes have no hull, keep all their points
+            if len(hullPoints) >= 3:
+                points = np.array(hullPoints, dtype=np.float32)
+            del ret
+            bm.free()
+
+        hull = np.ones((len(points), 4), dtype=np.float64)
+        hull[:, :3] = points
+        globalMeshHulls[mesh.name] = hull
+    return hull
+
 # **************************************************************************************
 def getConvexHull(minPoints = 3):
+    """Reduces the instance hull points to the hull of the whole model, as Vectors."""
+
     global globalPoints
 
-    if len(globalPoints) >= minPoints:
+    if not globalPoints:
+        return
+
+    points = np.concatenate(globalPoints)[:, :3]
+    globalPoints = []
+    if len(points) >= minPoints:
         bm = bmesh.new()
-        [bm.verts.new(v) for v in globalPoints]
+        for v in points:
+            bm.verts.new(v)
         bm.verts.ensure_lookup_table()
 
         ret = bmesh.ops.convex_hull(bm, input=bm.verts, use_existing_faces=False)
@@ -5039,9 +5350,13 @@ def getConvexHull(minPoints = 3):
         bm.clear()
         bm.free()
 
+    if len(globalPoints) < minPoints:
+        globalPoints = [mathutils.Vector(p) for p in points]
+
 # **************************************************************************************
 def loadFromFile(context, filename, isFullFilepath=True):
     startTime = time.time()
+    instrumentation.begin_import()
 
     global ldrawModelFile
     global ldrawModelLoaded
@@ -5091,7 +5406,8 @@ def loadFromFile(context, filename, isFullFilepath=True):
 
     # Make sure we have the latest configuration, including the latest ldraw directory
     # and the colours derived from that.
-    Configure()
+    with instrumentation.span("search_paths"):
+        Configure()
     Parameters()
     
     if Configure.ldrawInstallDirectory == "":
@@ -5103,6 +5419,7 @@ def loadFromFile(context, filename, isFullFilepath=True):
 
     # Clear caches
     CachedDirectoryFilenames.clearCache()
+    FileSystem.clearCache()
     CachedFiles.clearCache()
     CachedGeometry.clearCache()
     BlenderMaterials.clearCache()
@@ -5127,13 +5444,13 @@ def loadFromFile(context, filename, isFullFilepath=True):
 
     debugPrint("Loading LDraw part files")
     node = LDrawNode(filename, isFullFilepath, os.path.dirname(filename))
-    node.load()
+    with instrumentation.span("load_files"):
+        node.load()
     # node.printBFC()
 
     if node.file.isModel:
         # Fix top level rotation from LDraw coordinate space to Blender coordinate space
-        node.file.geometry.points = [Math.rotationMatrix * p for p in node.file.geometry.points]
-        node.file.geometry.edges  = [(Math.rotationMatrix @ e[0], Math.rotationMatrix @ e[1]) for e in node.file.geometry.edges]
+        node.file.geometry.transform(Math.rotationMatrix)
 
         for childNode in node.file.childNodes:
             childNode.matrix = Math.rotationMatrix @ childNode.matrix
@@ -5146,19 +5463,29 @@ def loadFromFile(context, filename, isFullFilepath=True):
     name = os.path.basename(filename)
 
     global globalBrickCount
+    global globalObjectNames
     global globalObjectsToAdd
+    global globalGroupObjects
     global globalPoints
+    global globalMeshHulls
+    global globalMeshTransparency
 
     globalBrickCount = 0
+    globalObjectNames = existingObjectNameCounts()
     globalObjectsToAdd = []
+    globalGroupObjects = {}
     globalPoints = []
+    globalMeshHulls.clear()
+    globalMeshTransparency.clear()
 
     debugPrint("Creating NodeGroups")
-    BlenderMaterials.createBlenderNodeGroups()
+    with instrumentation.span("node_groups"):
+        BlenderMaterials.createBlenderNodeGroups()
 
     # Create Blender objects from the loaded file
     debugPrint("Creating Blender objects")
-    rootOb = createBlenderObjectsFromNode(node, node.matrix, name)
+    with instrumentation.span("create_objects"):
+        rootOb = createBlenderObjectsFromNode(node, node.matrix, name)
 
     if not node.file.isModel:
         if rootOb.data:
@@ -5170,11 +5497,12 @@ def loadFromFile(context, filename, isFullFilepath=True):
     importedCameraName = ""
     lightName = "Light"
 
-    debugPrint("Number of vertices: " + str(len(globalPoints)))
+    debugPrint("Number of hull vertices: " + str(sum(len(p) for p in globalPoints)))
 
     # Take the convex hull of all the points in the scene (operation must have at least three vertices)
     # This results in far fewer points to consider when adjusting the object and/or camera position.
-    getConvexHull()
+    with instrumentation.span("convex_hull"):
+        getConvexHull()
     debugPrint("Number of convex hull vertices: " + str(len(globalPoints)))
 
     # Set camera type
@@ -5238,13 +5566,16 @@ def loadFromFile(context, filename, isFullFilepath=True):
                 # Must have at least three vertices to move the camera
                 if len(globalPoints) >= 3:
                     isOrtho = camera.data.type == 'ORTHO'
-                    if isOrtho:
-                        iterateCameraPosition(camera, render, vcentre, True)
-                    else:
-                        for i in range(20):
-                            error = iterateCameraPosition(camera, render, vcentre, True)
-                            if (error < 0.001):
-                                break
+                    with instrumentation.span("camera_fit"):
+                        if isOrtho:
+                            iterateCameraPosition(camera, render, vcentre, True)
+                            instrumentation.count("camera_fit_iterations")
+                        else:
+                            for i in range(20):
+                                error = iterateCameraPosition(camera, render, vcentre, True)
+                                instrumentation.count("camera_fit_iterations")
+                                if (error < 0.001):
+                                    break
 
         # Find the (first) 3D View, then set the view's 'look at' and 'distance'
         # Note: Not a camera object, but the point of view in the UI.
@@ -5278,12 +5609,14 @@ def loadFromFile(context, filename, isFullFilepath=True):
 
     # Finally add each object to the scene
     debugPrint("Adding {0} objects to scene".format(len(globalObjectsToAdd)))
-    for ob in globalObjectsToAdd:
-        linkToScene(ob)
+    with instrumentation.span("object_link"):
+        for ob in globalObjectsToAdd:
+            linkToScene(ob)
 
     # Parent only once everything has been added to the scene, otherwise the matrix_world's are
     # sometimes not updated properly - some are erroneously still the identity matrix.
-    setupImplicitParents()
+    with instrumentation.span("implicit_parents"):
+        setupImplicitParents()
 
     # Add lights to the scene
     for ob in globalLightsToAdd:
@@ -5352,12 +5685,16 @@ def loadFromFile(context, filename, isFullFilepath=True):
         scene.render.resolution_percentage = 100
 
     # Setup scene as appropriate
-    if Options.instructionsLook:
-        setupInstructionsLook()
-    else:
-        setupRealisticLook()
+    with instrumentation.span("scene_look"):
+        if Options.instructionsLook:
+            setupInstructionsLook()
+        else:
+            setupRealisticLook()
 
     ldrawLoadElapsed = time.time() - startTime
     ldrawModelLoaded = True
 
+    for line in instrumentation.report_lines():
+        debugPrint(line)
+
     return rootOb
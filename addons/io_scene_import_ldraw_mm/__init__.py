@@ -39,7 +39,8 @@ bl_info = {
 
 #############################################
 # support reloading sub-modules
-_modules_loaded = []
+import sys
+
 _modules = [
     'base64_handler',
     'blender_camera',
@@ -72,6 +73,10 @@ _modules = [
     'texmap'
 ]
 
+# Only the modules needed for registration are imported here, the importer
+# and exporter modules are imported on first use. Reload whichever are loaded.
+_modules_loaded = [sys.modules[f"{__name__}.{name}"] for name in _modules if f"{__name__}.{name}" in sys.modules]
+
 # Reload previously loaded modules
 if "bpy" in locals():
     from importlib import reload
@@ -87,12 +92,6 @@ else:
     from . import operator_import
     from . import operator_export
     from . import operator_panel_ldraw
-
-# First import the modules
-__import__(name=__name__, fromlist=_modules)
-_namespace = globals()
-_modules_loaded = [_namespace[name] for name in _modules]
-del _namespace
 # support reloading sub-modules
 #############################################
 
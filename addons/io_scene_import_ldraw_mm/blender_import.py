@@ -1,5 +1,6 @@
 import bpy
 import bmesh
+import numpy as np
 # lpub3d_mod
 from mathutils import Vector
 from mathutils import Euler
@@ -26,6 +27,9 @@ from . import matrices
 from . import ldraw_props
 # mod_end
 
+from io_scene_render_ldraw.modelglobals import caches
+from io_scene_render_ldraw.modelglobals import instrumentation
+
 
 def do_import(filepath):
     # lpub3d_mod
@@ -41,11 +45,14 @@ def do_import(filepath):
     ldraw_object.reset_caches()
     matrices.reset_caches()
 
-    FileSystem.build_search_paths(parent_filepath=filepath)
-    LDrawFile.read_color_table()
-    BlenderMaterials.create_blender_node_groups()
+    with instrumentation.span("search_paths"):
+        FileSystem.build_search_paths(parent_filepath=filepath)
+    with instrumentation.span("color_table"):
+        LDrawFile.read_color_table()
+    with instrumentation.span("node_groups"):
+        BlenderMaterials.create_blender_node_groups()
 
-    ldraw_file = LDrawFile.get_file(filepath)
+    ldraw_file = LDrawFile.get_file(filepath, stream=True)
     if ldraw_file is None:
         return
 
@@ -62,7 +69,11 @@ def do_import(filepath):
     group.groups_setup(root_node)
 
     # return root_node.load()
-    obj = root_node.load()
+    with instrumentation.span("flatten"):
+        obj = root_node.load()
+        if ImportOptions.chunk_size > 0:
+            LDrawNode.flush_chunk()
+    instrumentation.set_value("peak_rss", caches.peak_rss())
 
     # s = {str(k): v for k, v in sorted(LDrawNode.geometry_datas2.items(), key=lambda ele: ele[1], reverse=True)}
     # helpers.write_json("gs2.json", s, indent=4)
@@ -84,33 +95,24 @@ def do_import(filepath):
 
     if ImportOptions.add_environment or ImportOptions.position_camera:
         vertices = []
-        if mesh_objs:
-            bpy.ops.object.origin_set(type='ORIGIN_GEOMETRY')
-            for mesh_obj in mesh_objs:
-                points = [mesh_obj.matrix_world @ Vector(v[:]) for v in mesh_obj.bound_box]
-                vertices.extend(points)
-
-            # Calculate our bounding box in global coordinate space
-            bbox_min = Vector((0, 0, 0))
-            bbox_max = Vector((0, 0, 0))
-
-            bbox_min[0] = min(v[0] for v in vertices)
-            bbox_min[1] = min(v[1] for v in vertices)
-            bbox_min[2] = min(v[2] for v in vertices)
-            bbox_max[0] = max(v[0] for v in vertices)
-            bbox_max[1] = max(v[1] for v in vertices)
-            bbox_max[2] = max(v[2] for v in vertices)
-
-            bbox_ctr = (bbox_min + bbox_max) * 0.5
-            offset_to_centre_model = Vector((-bbox_ctr.x, -bbox_ctr.y, -bbox_min.z))
-
-            if top_obj:
-                top_obj.location += offset_to_centre_model
-
-            # Offset all points
-            vertices = [v + offset_to_centre_model for v in vertices]
-            offset_to_centre_model = Vector((0, 0, 0))
-            
+        with instrumentation.span("bounds"):
+            if mesh_objs:
+                vertices = __world_bound_points(mesh_objs)
+
+                # Calculate our bounding box in global coordinate space
+                bbox_min = Vector(vertices.min(axis=0).tolist())
+                bbox_max = Vector(vertices.max(axis=0).tolist())
+
+                bbox_ctr = (bbox_min + bbox_max) * 0.5
+                offset_to_centre_model = Vector((-bbox_ctr.x, -bbox_ctr.y, -bbox_min.z))
+
+                if top_obj:
+                    top_obj.location += offset_to_centre_model
+
+                # Offset all points
+                vertices += np.array(offset_to_centre_model)
+                offset_to_centre_model = Vector((0, 0, 0))
+
     if ImportOptions.position_camera:
         if ldraw_meta.cameras:
             imported_camera_name = ldraw_meta.cameras[0].name
@@ -127,14 +129,9 @@ def do_import(filepath):
                 # Must have at least three vertices to move the camera
                 if len(vertices) >= 3:
                     render = bpy.context.scene.render
-                    is_ortho = camera.data.type == 'ORTHO'
-                    if is_ortho:
-                        blender_camera.iterate_camera_position(camera, render, bbox_ctr, True, vertices)
-                    else:
-                        for i in range(20):
-                            error = blender_camera.iterate_camera_position(camera, render, bbox_ctr, True, vertices)
-                            if error < 0.001:
-                                break
+                    with instrumentation.span("camera_fit"):
+                        blender_camera.fit_camera_position(camera, render, vertices)
+                        instrumentation.count("camera_fit_iterations")
     # mod_end
     
     if ImportOptions.meta_step:
@@ -193,9 +190,11 @@ def do_import(filepath):
                             space.clip_end = max_clip_end
 
     if ImportOptions.add_environment:
-        __setup_environment()
-    
-    __setup_realistic_look()
+        with instrumentation.span("environment"):
+            __setup_environment()
+
+    with instrumentation.span("scene_look"):
+        __setup_realistic_look()
     # mod_end
 
     return obj
@@ -206,7 +205,7 @@ def __scene_setup():
     bpy.context.scene.eevee.use_ssr_refraction = True
     bpy.context.scene.eevee.use_taa_reprojection = True
 
-    if ImportOptions.color_strategy_value() == "vertex_colors":
+    if ImportOptions.color_strategy_value() in ["vertex_colors", "object_color"]:
         # view vertex colors in solid view
         for window in bpy.context.window_manager.windows:
             for area in window.screen.areas:
@@ -217,9 +216,11 @@ def __scene_setup():
                                 space.shading.show_backface_culling = True
                             space.shading.type = 'SOLID'
                             # Shading > Color > Object to see object colors
-                            space.shading.color_type = 'VERTEX'
+                            if ImportOptions.color_strategy_value() == "object_color":
+                                space.shading.color_type = 'OBJECT'
+                            else:
+                                space.shading.color_type = 'VERTEX'
                             # space.shading.color_type = 'MATERIAL'
-                            # space.shading.color_type = 'OBJECT'
 
     # https://blender.stackexchange.com/a/146838
     # TODO: use line art modifier with grease pencil object
@@ -256,6 +257,39 @@ def __scene_setup():
 def __unlink_from_scene(obj):
     if bpy.context.collection.objects.find(obj.name) >= 0:
         bpy.context.collection.objects.unlink(obj)
+
+# bounding box corners of each mesh are computed once and shared by its instances
+def __mesh_bound_corners(mesh):
+    count = len(mesh.vertices)
+    if count < 1:
+        return None
+    co = np.empty(count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3)
+    lo = co.min(axis=0)
+    hi = co.max(axis=0)
+    return np.array([(x, y, z, 1.0) for x in (lo[0], hi[0]) for y in (lo[1], hi[1]) for z in (lo[2], hi[2])])
+
+def __world_bound_points(mesh_objs):
+    bpy.context.view_layer.update()
+
+    mesh_corners = {}
+    corners = []
+    world_matrices = []
+    for mesh_obj in mesh_objs:
+        mesh = mesh_obj.data
+        if mesh.name not in mesh_corners:
+            mesh_corners[mesh.name] = __mesh_bound_corners(mesh)
+        if mesh_corners[mesh.name] is None:
+            continue
+        corners.append(mesh_corners[mesh.name])
+        world_matrices.append(np.array(mesh_obj.matrix_world))
+
+    if not corners:
+        return np.empty((0, 3))
+
+    points = np.einsum('nij,nkj->nki', np.array(world_matrices), np.array(corners))
+    return points[:, :, :3].reshape(-1, 3)
 # mod_end
 
 def __load_materials(file):
@@ -7,76 +7,103 @@ from .definitions import APP_ROOT
 from .ldraw_color import LDrawColor
 from .filesystem import FileSystem
 from .import_options import ImportOptions
+from . import base64_handler
 from . import strings
 
+from io_scene_render_ldraw.modelglobals import caches
+from io_scene_render_ldraw.modelglobals import instrumentation
+
 
 class BlenderMaterials:
-    __key_map = {}
+    __key_map = caches.BoundedCache("mm_material_keys")
+
+    # node group library path and the names it contains, kept for the session
+    __library_path = None
+    __library_node_groups = set()
 
     @classmethod
     def reset_caches(cls):
         cls.__key_map.clear()
 
     # https://github.com/bblanimation/abs-plastic-materials
+    # node groups are appended from the library on demand, the first time a material of that finish is built
     @classmethod
     def create_blender_node_groups(cls):
         cls.reset_caches()
+        cls.__node_group_library()
+
+    @classmethod
+    def __node_group_library(cls):
         path = os.path.join(APP_ROOT, 'materials', 'all_monkeys.blend')
         if bpy.app.version < (3, 4):
             path = os.path.join(APP_ROOT, 'materials', 'all_monkeys_33.blend')
-        with bpy.data.libraries.load(path) as (data_from, data_to):
-            all_node_groups = False
-            if all_node_groups:
-                data_to.node_groups = data_from.node_groups
-            else:
-                do_delete = False
-                if do_delete:  # deleting them will cause materials that use those nodes to render solid black
-                    data_to.node_groups = []
-                    for c in data_from.node_groups:
-                        existing_node_group = bpy.data.node_groups.get(c)
-                        if existing_node_group is not None:
-                            bpy.data.node_groups.remove(existing_node_group)
-                        if c.startswith("_") or c.startswith("LEGO"):
-                            data_to.node_groups.append(c)
-                else:  # don't import the node group again if there is already one that exists with that name
-                    data_to.node_groups = [c for c in data_from.node_groups if bpy.data.node_groups.get(c) is None and (c.startswith("_") or c.startswith("LEGO"))]
-        for node_group in data_to.node_groups:
-            node_group.use_fake_user = True
-
-    @classmethod
-    def get_material(cls, color_code, vertex_colors=None, use_backface_culling=True, part_slopes=None, parts_cloth=False, texmap=None, pe_texmap=None, easy_key=False):
+        if cls.__library_path != path:
+            with bpy.data.libraries.load(path) as (data_from, data_to):
+                cls.__library_node_groups = {c for c in data_from.node_groups if c.startswith("_") or c.startswith("LEGO")}
+            cls.__library_path = path
+        return cls.__library_path
+
+    @classmethod
+    def __get_node_group(cls, group_name):
+        # don't import the node group again if there is already one that exists with that name
+        # deleting them will cause materials that use those nodes to render solid black
+        node_group = bpy.data.node_groups.get(group_name)
+        if node_group is not None:
+            return node_group
+
+        path = cls.__node_group_library()
+        if group_name not in cls.__library_node_groups:
+            raise KeyError(f"Node group '{group_name}' not found in {os.path.basename(path)}")
+
+        # nested node groups used by this group are appended along with it
+        with instrumentation.span("node_group_append", node_group=group_name):
+            with bpy.data.libraries.load(path) as (data_from, data_to):
+                data_to.node_groups = [group_name]
+        instrumentation.count("node_groups_appended")
+
+        node_group = data_to.node_groups[0]
+        node_group.use_fake_user = True
+        return node_group
+
+    @classmethod
+    def get_material(cls, color_code, vertex_colors=None, use_backface_culling=True, part_slopes=None, parts_cloth=False, texmap=None, pe_texmap=None, easy_key=False, use_object_color=False):
         color = LDrawColor.get_color(color_code)
         use_backface_culling = use_backface_culling is True
 
         if easy_key:
             key = color_code
         else:
-            key = cls.__build_key(color, use_backface_culling, part_slopes, parts_cloth, texmap, pe_texmap)
+            key = cls.__build_key(color, use_backface_culling, part_slopes, parts_cloth, texmap, pe_texmap, use_object_color)
 
         # Reuse current material if it exists, otherwise create a new material
-        material = bpy.data.materials.get(key)
+        material = instrumentation.cache_lookup("material", bpy.data.materials.get(key))
         if material is not None:
             return material
 
-        material = cls.__create_node_based_material(
-            key,
-            color,
-            vertex_colors,
-            use_backface_culling=use_backface_culling,
-            part_slopes=part_slopes,
-            parts_cloth=parts_cloth,
-            texmap=texmap,
-            pe_texmap=pe_texmap,
-        )
+        with instrumentation.span("material_build"):
+            material = cls.__create_node_based_material(
+                key,
+                color,
+                vertex_colors,
+                use_backface_culling=use_backface_culling,
+                part_slopes=part_slopes,
+                parts_cloth=parts_cloth,
+                texmap=texmap,
+                pe_texmap=pe_texmap,
+                use_object_color=use_object_color,
+            )
+        instrumentation.count("materials")
         return material
 
     @classmethod
-    def __build_key(cls, color, use_backface_culling, part_slopes, parts_cloth, texmap, pe_texmap):
+    def __build_key(cls, color, use_backface_culling, part_slopes, parts_cloth, texmap, pe_texmap, use_object_color=False):
         _key = ()
 
-        if ImportOptions.color_strategy_value() == "vertex_colors":
-            # key is everything but the color
+        if ImportOptions.color_strategy_value() == "vertex_colors" or use_object_color:
+            # key is everything but the color, which leaves one material per finish
             _key += (
+                color.name == "Milky_White",
+                use_object_color,
                 color.alpha,
                 color.luminance,
                 color.material_name,
@@ -118,7 +145,7 @@ class BlenderMaterials:
         return key
 
     @classmethod
-    def __create_node_based_material(cls, key, color, vertex_colors, use_backface_culling=True, part_slopes=None, parts_cloth=False, texmap=None, pe_texmap=None):
+    def __create_node_based_material(cls, key, color, vertex_colors, use_backface_culling=True, part_slopes=None, parts_cloth=False, texmap=None, pe_texmap=None, use_object_color=False):
         material = bpy.data.materials.new(key)
         material.use_fake_user = True
         material.use_nodes = True
@@ -133,6 +160,8 @@ class BlenderMaterials:
 
         if ImportOptions.color_strategy_value() == "vertex_colors":
             node, vertex_color_node, mix_rgb_node = cls.__node_group_vertex_color_code(color, vertex_colors, nodes, links, 200, 0)
+        elif use_object_color:
+            node, attribute_node, mix_rgb_node = cls.__node_group_object_color_code(color, nodes, links, 200, 0)
         else:
             node, rgb_node, mix_rgb_node = cls.__node_group_color_code(color, nodes, links, 200, 0)
             diff_color = color.linear_color_a
@@ -176,7 +205,7 @@ class BlenderMaterials:
     @classmethod
     def __node_group(cls, group_name, nodes, x, y):
         node = nodes.new("ShaderNodeGroup")
-        node.node_tree = bpy.data.node_groups[group_name]
+        node.node_tree = cls.__get_node_group(group_name)
         node.name = node.node_tree.name
         node.location = x, y
         return node
@@ -211,6 +240,14 @@ class BlenderMaterials:
         node.location = x, y
         return node
 
+    @classmethod
+    def __node_object_color(cls, nodes, x, y):
+        node = nodes.new("ShaderNodeAttribute")
+        node.attribute_type = 'OBJECT'
+        node.attribute_name = "color"
+        node.location = x, y
+        return node
+
     @classmethod
     def __node_group_color_code(cls, color, nodes, links, x, y):
         diff_color = color.linear_color_d
@@ -242,6 +279,21 @@ class BlenderMaterials:
 
         return node, vertex_color_node, mix_rgb_node
 
+    # object color is set in ldraw_object.create_object
+    @classmethod
+    def __node_group_object_color_code(cls, color, nodes, links, x, y):
+        attribute_node = cls.__node_object_color(nodes, x + -600, y + 60)
+
+        mix_rgb_node = cls.__node_mix_rgb(nodes, x + -400, y + 0)
+        mix_rgb_node.inputs["Fac"].default_value = 0
+
+        node = cls.__node_color_code_material(nodes, color, x + -200, y + 0)
+
+        links.new(attribute_node.outputs["Color"], mix_rgb_node.inputs["Color1"])
+        links.new(mix_rgb_node.outputs["Color"], node.inputs["Color"])
+
+        return node, attribute_node, mix_rgb_node
+
     @classmethod
     def __node_color_code_material(cls, nodes, color, x, y):
         is_transparent = color.alpha < 1.0
@@ -333,11 +385,14 @@ class BlenderMaterials:
         if image is None:
             image_path = FileSystem.locate(image_name)
             if image_path is not None:
-                image = bpy.data.images.load(image_path)
+                if FileSystem.is_archive_path(image_path):
+                    image = base64_handler.image_from_data(image_name, FileSystem.read_bytes(image_path))
+                else:
+                    image = bpy.data.images.load(image_path)
+                    image.pack()
                 image.name = image_name
                 image[strings.ldraw_filename_key] = image_name
                 image.colorspace_settings.name = colorspace
-                image.pack()
 
         image = bpy.data.images.get(image_name)
         if image_name is not None:
@@ -1,11 +1,17 @@
 import os
+import io
+import codecs
 import string
 import glob
+import zipfile
 from sys import platform
 from pathlib import Path
 from . import helpers
 import tempfile
 
+from io_scene_render_ldraw.modelglobals import caches
+from io_scene_render_ldraw.modelglobals import instrumentation
+
 def locate_ldraw():
     ldraw_folder_name = 'ldraw'
 
@@ -94,22 +100,54 @@ def locate_studio_ldraw():
 
 
 def is_case_sensitive():
-    # By default mkstemp() creates a file with
+    # By default the temporary file has
     # a name that begins with 'tmp' (lowercase)
-    tmphandle, tmppath = tempfile.mkstemp()
-    if os.path.exists(tmppath.upper()):
-        return False
-    else:
-        return True
+    with tempfile.NamedTemporaryFile() as tmpfile:
+        return not os.path.exists(tmpfile.name.upper())
+
+
+class LDrawArchive:
+    """
+    A zipped library, indexed from its central directory. Members are decompressed when read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.mtime = os.path.getmtime(path)
+        self.library = None
+        self.members = {}
+        self.official = False
+        self.has_parts = False
+        self.prefix = ""
+        try:
+            self.library = zipfile.ZipFile(path)
+        except (OSError, zipfile.BadZipFile) as e:
+            print(f"WARNING: could not read archive {path}: {e}")
+            return
+
+        # lowercase to actual member names, directory entries are not files
+        for info in self.library.infolist():
+            if not info.is_dir():
+                self.members.setdefault(info.filename.lower(), info.filename)
+
+        # complete.zip is rooted at ldraw/, unofficial archives may or may not be
+        self.official = all(name in self.members for name in ("ldraw/ldconfig.ldr", "ldraw/parts/1.dat", "ldraw/p/h2.dat"))
+        self.has_parts = any(name.endswith((".dat", ".ldr", ".mpd")) for name in self.members)
+        self.prefix = "ldraw/" if self.official or any(name.startswith("ldraw/") for name in self.members) else ""
+
+    def close(self):
+        if self.library is not None:
+            self.library.close()
+            self.library = None
 
 
 class FileSystem:
     defaults = {}
 
-    defaults['ldraw_path'] = locate_ldraw()
+    defaults['ldraw_path'] = ''
     ldraw_path = defaults['ldraw_path']
 
-    defaults['studio_ldraw_path'] = locate_studio_ldraw()
+    defaults['studio_ldraw_path'] = ''
     studio_ldraw_path = defaults['studio_ldraw_path']
     
     defaults['environment_file'] = ''
@@ -130,7 +168,7 @@ class FileSystem:
     defaults['search_additional_paths'] = False
     search_additional_paths = defaults['search_additional_paths']
 
-    defaults['case_sensitive_filesystem'] = is_case_sensitive()
+    defaults['case_sensitive_filesystem'] = platform.startswith('linux')
     case_sensitive_filesystem = defaults['case_sensitive_filesystem']
 
     defaults['use_archive_library'] = False
@@ -145,17 +183,49 @@ class FileSystem:
     defaults['resolution'] = 1
     resolution = defaults['resolution']
 
+    __defaults_located = False
+
+    # library discovery and the case sensitivity probe touch the disk,
+    # so they run when the defaults are first needed rather than at import
+    @classmethod
+    def locate_defaults(cls):
+        if cls.__defaults_located:
+            return cls.defaults
+        cls.__defaults_located = True
+        cls.defaults['ldraw_path'] = locate_ldraw()
+        cls.defaults['studio_ldraw_path'] = locate_studio_ldraw()
+        cls.defaults['case_sensitive_filesystem'] = is_case_sensitive()
+        return cls.defaults
+
     @staticmethod
     def resolution_value():
         return FileSystem.resolution_choices[FileSystem.resolution][0]
 
-    search_dirs = []
-    lowercase_paths = {}
+    # folders and archive prefixes in search order, (path, None) for a folder, (prefix, archive) for an archive
+    search_paths = []
+    lowercase_paths = caches.BoundedCache("mm_lowercase_paths")
+
+    __archives = {}
+    __archive_paths = {}
+    # decoded member texts kept across imports, least recently used are dropped first
+    __archive_texts = caches.BoundedCache("mm_archive_text", max_entries=256,
+                                          on_release=lambda: FileSystem.close_archives())
 
     @classmethod
     def reset_caches(cls):
-        cls.search_dirs.clear()
+        cls.search_paths.clear()
         cls.lowercase_paths.clear()
+        cls.__archive_paths.clear()
+
+    # released archives are closed, they are reopened by the next import
+    @classmethod
+    def close_archives(cls):
+        for archive in cls.__archives.values():
+            archive.close()
+        cls.__archives.clear()
+        cls.__archive_paths.clear()
+        cls.__archive_texts.clear()
+        cls.search_paths[:] = [(path, archive) for path, archive in cls.search_paths if archive is None]
 
     @staticmethod
     def locate_environment_file():
@@ -244,34 +314,71 @@ class FileSystem:
                 ldraw_roots.append(os.path.join(cls.ldraw_path, "unofficial"))
                 ldraw_roots.append(os.path.join(cls.studio_ldraw_path, "unofficial"))
 
-        for root in ldraw_roots:
-            path = root
-            cls.append_search_path(path, root=True)
+        # the archives of a library root are searched right after its folders
+        # so prefer_unofficial and prefer_studio hold whether a library is unpacked or zipped
+        for index, root in enumerate(ldraw_roots):
+            for subdirs in cls.library_subdirs():
+                path = os.path.join(root, *subdirs)
+                cls.append_search_path(path, root=not subdirs)
 
-            path = os.path.join(root, "p")
-            cls.append_search_path(path)
+            is_model_dir = index == 0 and parent_filepath is not None
+            if cls.use_archive_library and not is_model_dir:
+                cls.append_archive_paths(root)
 
-            if cls.resolution_value() == "High":
-                path = os.path.join(root, "p", "48")
-                cls.append_search_path(path)
-            elif cls.resolution_value() == "Low":
-                path = os.path.join(root, "p", "8")
-                cls.append_search_path(path)
-
-            path = os.path.join(root, "parts")
-            cls.append_search_path(path)
-
-            path = os.path.join(root, "parts", "textures")
-            cls.append_search_path(path)
+    @classmethod
+    def library_subdirs(cls):
+        subdirs = [(), ("p",)]
+        if cls.resolution_value() == "High":
+            subdirs.append(("p", "48"))
+        elif cls.resolution_value() == "Low":
+            subdirs.append(("p", "8"))
+        subdirs.append(("parts",))
+        subdirs.append(("parts", "textures"))
+        subdirs.append(("models",))
+        return subdirs
+
+    # official archives stand in for a library root, unofficial archives for its unofficial folder
+    @classmethod
+    def append_archive_paths(cls, root):
+        unofficial = os.path.basename(root) == "unofficial"
+        library_dir = os.path.dirname(root) if unofficial else root
+        if library_dir == "" or not os.path.isdir(library_dir):
+            return
+
+        for name in sorted(os.listdir(library_dir)):
+            if not name.lower().endswith(".zip"):
+                continue
+
+            archive = cls.__archive(os.path.join(library_dir, name))
+            if archive.library is None:
+                continue
+            if unofficial == archive.official or not archive.has_parts:
+                continue
+
+            for subdirs in cls.library_subdirs():
+                prefix = archive.prefix + "".join(f"{subdir}/" for subdir in subdirs)
+                cls.search_paths.append((prefix, archive))
 
-            path = os.path.join(root, "models")
-            cls.append_search_path(path)
+    @classmethod
+    def __archive(cls, archive_path):
+        archive = cls.__archives.get(archive_path)
+        if archive is not None:
+            if archive.mtime == os.path.getmtime(archive_path):
+                return archive
+            archive.close()
+            for key in [key for key in cls.__archive_texts if key[0] == archive_path]:
+                del cls.__archive_texts[key]
+
+        with instrumentation.span("archive_index"):
+            archive = LDrawArchive(archive_path)
+        cls.__archives[archive_path] = archive
+        return archive
 
     # build a list of folders to search for parts
     # build a map of lowercase to actual filenames
     @classmethod
     def append_search_path(cls, path, root=False):
-        cls.search_dirs.append(path)
+        cls.search_paths.append((path, None))
         if cls.case_sensitive_filesystem:
             cls.append_lowercase_paths(path, '*')
             if root:
@@ -286,6 +393,11 @@ class FileSystem:
 
     @classmethod
     def locate(cls, filename):
+        with instrumentation.span("file_resolution"):
+            return cls.__locate(filename)
+
+    @classmethod
+    def __locate(cls, filename):
         part_path = filename.replace("\\", os.path.sep).replace("/", os.path.sep)
         part_path = os.path.expanduser(part_path)
 
@@ -293,7 +405,16 @@ class FileSystem:
         if os.path.isfile(part_path):
             return part_path
 
-        for dir in cls.search_dirs:
+        member_path = filename.replace("\\", "/").lower()
+        for dir, archive in cls.search_paths:
+            if archive is not None:
+                member = archive.members.get(dir + member_path)
+                if member is not None:
+                    full_path = os.path.join(archive.path, member)
+                    cls.__archive_paths[full_path] = (archive, member)
+                    return full_path
+                continue
+
             full_path = os.path.join(dir, part_path)
             if os.path.isfile(full_path):
                 return full_path
@@ -307,5 +428,46 @@ class FileSystem:
 
         # TODO: requests retrieve missing items from ldraw.org
 
+        instrumentation.count("missing_files")
         print(f"missing {filename}")
         return None
+
+    @classmethod
+    def is_archive_path(cls, filepath):
+        return filepath in cls.__archive_paths
+
+    # open a located file for reading lines, archive members are served from the text cache
+    @classmethod
+    def open_text(cls, filepath):
+        entry = cls.__archive_paths.get(filepath)
+        if entry is None:
+            return open(filepath, 'r', encoding='utf-8')
+        return io.StringIO(cls.__read_archive_text(*entry), newline=None)
+
+    @classmethod
+    def read_bytes(cls, filepath):
+        entry = cls.__archive_paths.get(filepath)
+        if entry is None:
+            with open(filepath, 'rb') as file:
+                return file.read()
+        archive, member = entry
+        with instrumentation.span("archive_decompress"):
+            return archive.library.read(member)
+
+    @classmethod
+    def __read_archive_text(cls, archive, member):
+        key = (archive.path, member)
+        text = instrumentation.cache_lookup("archive_text", cls.__archive_texts.get(key))
+        if text is not None:
+            return text
+
+        with instrumentation.span("archive_decompress"):
+            data = archive.library.read(member)
+
+        if data.startswith((codecs.BOM_UTF16_BE, codecs.BOM_UTF16_LE)):
+            text = data.decode('utf-16')
+        else:
+            text = data.decode('utf-8')
+
+        cls.__archive_texts[key] = text
+        return text
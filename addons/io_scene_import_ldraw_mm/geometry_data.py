@@ -1,3 +1,6 @@
+from io_scene_render_ldraw.modelglobals import caches
+
+
 class FaceData:
     """
     Raw vertex information
@@ -74,6 +77,21 @@ class GeometryData:
         self.edge_data = []
         self.face_data = []
         self.line_data = []
+        self.weld_data = None
+        self.released = False
+
+    # only the vertex and weld data this geometry_data owns, the file and texmaps are shared
+    def nbytes(self):
+        return caches.estimate_size(self.edge_data, self.face_data, self.line_data, self.weld_data,
+                                    exclude=("texmap", "pe_texmap"))
+
+    # drop the vertex data once its meshes are built, the key, file and bfc state are still used to place objects
+    def release(self):
+        self.edge_data = []
+        self.face_data = []
+        self.line_data = []
+        self.weld_data = None
+        self.released = True
 
     def add_edge_data(self, vertices, color_code):
         self.edge_data.append(FaceData(
@@ -94,3 +112,19 @@ class GeometryData:
             vertices=vertices,
             color_code=color_code,
         ))
+
+
+class WeldData:
+    """
+    Vertices of a geometry_data quantized to merge_distance cells, shared by every mesh built from it.
+    """
+
+    def __init__(self):
+        self.cell_count = 0
+        self.cell_keys = None
+        self.cell_labels = None
+        self.cell_vertices = None
+        self.corner_cells = None
+        self.face_indices = []
+        self.sharp_edges = set()
+        self.sharp_codes = None
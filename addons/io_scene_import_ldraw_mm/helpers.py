@@ -18,6 +18,14 @@ except ImportError as e:
     from definitions import APP_ROOT
 
 
+# Blender ID names are limited to 63 bytes, longer names are cut by Blender and can collide
+def clamp_name(name, max_bytes=63):
+    encoded = name.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return name
+    return encoded[:max_bytes].decode("utf-8", errors="ignore")
+
+
 # remove multiple spaces
 def clean_line(line):
     return " ".join(line.split())
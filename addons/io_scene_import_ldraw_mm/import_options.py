@@ -71,6 +71,11 @@ class ImportOptions:
     defaults['no_studs'] = False
     no_studs = defaults['no_studs']
 
+    # parts imported before their working geometry is freed, also the lines of a model parsed at a time
+    # finished submodels are flushed too, 0 imports in one pass
+    defaults['chunk_size'] = 0
+    chunk_size = defaults['chunk_size']
+
     defaults['set_end_frame'] = True
     set_end_frame = defaults['set_end_frame']
 
@@ -87,6 +92,7 @@ class ImportOptions:
         ("edge_split", "Edge split", "Use an edge split modifier"),
         ("auto_smooth", "Auto smooth", "Use auto smooth"),
         ("bmesh_split", "bmesh smooth", "Split while processing bmesh"),
+        ("custom_normals", "Custom normals", "Store split normals from edge lines and the smooth angle on the part mesh, no modifier"),
     )
 
     defaults['smooth_type'] = 0
@@ -111,6 +117,9 @@ class ImportOptions:
     defaults['bevel_segments'] = 4
     bevel_segments = defaults['bevel_segments']
 
+    defaults['bake_bevel'] = False
+    bake_bevel = defaults['bake_bevel']
+
     defaults['import_cameras'] = True
     import_cameras = defaults['import_cameras']
 
@@ -141,6 +150,7 @@ class ImportOptions:
     color_strategy_choices = (
         ("material", "Material", "Object color is set through the material. Easier to work with but slightly slower to import"),
         ("vertex_colors", "Vertex Colors", "Mesh color is set through vertex colors. More difficult to work with but slightly quicker to import"),
+        ("object_color", "Object Color", "One material per finish, colored by the object color. Fewest materials and shader compiles, color is changed on the object"),
     )
 
     defaults['color_strategy'] = 0
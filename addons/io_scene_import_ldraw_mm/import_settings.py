@@ -53,7 +53,7 @@ class ImportSettings:
         if type(setting) == type(default):
             return setting
         else:
-            return default
+            return cls.get_default_settings().get(key)
 
     @classmethod
     def __setattr__(cls, key, value):
@@ -63,14 +63,21 @@ class ImportSettings:
     def set_setting(cls, k, v):
         cls.settings[k] = v
 
+    @classmethod
+    def get_default_settings(cls):
+        cls.default_settings.update(FileSystem.locate_defaults())
+        return cls.default_settings
+
     @classmethod
     def load_settings(cls):
-        cls.settings = helpers.read_json(cls.settings_path, cls.default_settings)
+        cls.settings = helpers.read_json(cls.settings_path)
+        if cls.settings is None:
+            cls.settings = cls.get_default_settings()
 
     @classmethod
     def save_settings(cls, has_settings):
         cls.settings = {}
-        for k, v in cls.default_settings.items():
+        for k, v in cls.get_default_settings().items():
             _lst = None
             _v = has_settings.get(k,v)
             if k == 'chosen_logo':
@@ -118,10 +125,15 @@ class ImportSettings:
     @classmethod
     def get_ini_settings(cls, ini_settings_file):
         section_name = 'ImportLDrawMM'
-        ini_settings = helpers.read_ini(ini_settings_file, cls.default_settings)
+        default_settings = cls.get_default_settings()
+        ini_settings = helpers.read_ini(ini_settings_file, default_settings)
         assert ini_settings is not None, "INI Settings is not defined."
-        for k, v in cls.default_settings.items():
-            value = ini_settings[section_name][k.replace("_", "").lower()]
+        for k, v in default_settings.items():
+            # settings added after the ini was written keep their default
+            value = ini_settings[section_name].get(k.replace("_", "").lower())
+            if value is None:
+                cls.settings[k] = v
+                continue
             cls.settings[k] = helpers.evaluate_value(value)
         return cls.settings
 
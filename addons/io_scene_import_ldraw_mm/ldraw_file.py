@@ -3,6 +3,9 @@ import mathutils
 import os
 import re
 
+from io_scene_render_ldraw.modelglobals import caches
+from io_scene_render_ldraw.modelglobals import instrumentation
+
 from .import_options import ImportOptions
 from .filesystem import FileSystem
 from .ldraw_node import LDrawNode
@@ -18,8 +21,8 @@ class LDrawFile:
     A file that has been loaded and its lines converted to header data and ldraw_nodes.
     """
 
-    __raw_files = {}
-    __file_cache = {}
+    __raw_files = caches.BoundedCache("mm_raw_files")
+    __file_cache = caches.BoundedCache("mm_files")
 
     @classmethod
     def reset_caches(cls):
@@ -50,6 +53,10 @@ class LDrawFile:
         self.child_nodes = []
         self.geometry_commands = {}
 
+        # a streamed file keeps only its lines, child_nodes are parsed while it is loaded
+        self.streamed = False
+        self.body_start = 0
+
     def __str__(self):
         return "\n".join([
             f"filename: {self.filename}",
@@ -109,30 +116,55 @@ class LDrawFile:
 
         return ldraw_file
 
+    # with stream, models without geometry of their own are streamed when ImportOptions.chunk_size is set
     @classmethod
-    def get_file(cls, filename):
-        ldraw_file = LDrawFile.__file_cache.get(filename)
+    def get_file(cls, filename, stream=False):
+        ldraw_file = instrumentation.cache_lookup("ldraw_file", LDrawFile.__file_cache.get(filename))
         if ldraw_file is not None:
             return ldraw_file
 
         ldraw_file = cls.__raw_files.get(filename)
         if ldraw_file is None:
-            ldraw_file = LDrawFile.read_file(filename)
+            with instrumentation.span("read_file", file=filename):
+                ldraw_file = LDrawFile.read_file(filename)
 
         if ldraw_file is None:
             return ldraw_file
 
-        ldraw_file.__parse_file()
+        with instrumentation.span("parse", file=filename):
+            if stream and ImportOptions.chunk_size > 0:
+                ldraw_file.__parse_header()
+                ldraw_file.streamed = not ldraw_file.__body_has_geometry() and ldraw_file.is_like_model()
+            if not ldraw_file.streamed:
+                ldraw_file.__parse_lines(ldraw_file.lines[ldraw_file.body_start:])
         LDrawFile.__file_cache[filename] = ldraw_file
         return ldraw_file
 
+    def iter_child_nodes(self):
+        """The child nodes of this file, a streamed file is parsed ImportOptions.chunk_size lines at a time.
+
+        Streamed nodes are not kept, so only the nodes of the current chunk are in memory.
+        """
+
+        if not self.streamed:
+            yield from self.child_nodes
+            return
+
+        chunk_size = max(1, ImportOptions.chunk_size)
+        for start in range(self.body_start, len(self.lines), chunk_size):
+            with instrumentation.span("parse", file=self.filename):
+                self.__parse_lines(self.lines[start:start + chunk_size])
+            child_nodes = self.child_nodes
+            self.child_nodes = []
+            yield from child_nodes
+
     @classmethod
     def read_file(cls, filename):
         filepath = FileSystem.locate(filename)
         if filepath is None:
             return None
 
-        with open(filepath, 'r', encoding='utf-8') as file:
+        with FileSystem.open_text(filepath) as file:
             hit_not_blank_line = False
             is_mpd = None
             no_file = False
@@ -237,10 +269,60 @@ class LDrawFile:
 
             return cls.__raw_files.get(filename)
 
+    # the header lines before the first line that is a command or geometry
+    # the first line is always the description
+    def __parse_header(self):
+        self.body_start = len(self.lines)
+        first_line = True
+        for index, line in enumerate(self.lines):
+            clean_line = helpers.clean_line(line)
+            strip_line = line.strip()
+            if clean_line == "":
+                continue
+
+            self.__line_description(strip_line)
+            if self.__line_name(clean_line, strip_line): continue
+            if self.__line_author(clean_line, strip_line): continue
+            if self.__line_part_type(clean_line, strip_line): continue
+            if self.__line_license(strip_line): continue
+            if self.__line_help(strip_line): continue
+            if self.__line_category(strip_line): continue
+            if self.__line_keywords(strip_line): continue
+            if self.__line_cmdline(strip_line): continue
+            if self.__line_history(strip_line): continue
+            if self.__line_comment(clean_line): continue
+            if first_line and clean_line.startswith("0 "):
+                first_line = False
+                continue
+            self.body_start = index
+            break
+
+    # same test as has_geometry after a full parse, without creating nodes
+    # subfiles are looked up, streamed submodels only have their header parsed
+    def __body_has_geometry(self):
+        subfile_names = set()
+        for line in self.lines[self.body_start:]:
+            clean_line = helpers.clean_line(line)
+            strip_line = line.strip()
+            if clean_line[:2] in ("2 ", "3 ", "4 ", "5 "):
+                return True
+            if clean_line.startswith("1 "):
+                _sparams = strip_line.split(maxsplit=14)
+                if len(_sparams) > 14:
+                    subfile_names.add(LDrawFile.__subfile_name(_sparams[14]))
+                continue
+            self.__line_part_type(clean_line, strip_line)
+
+        for filename in subfile_names:
+            ldraw_file = LDrawFile.get_file(filename, stream=True)
+            if ldraw_file is not None and ldraw_file.is_geometry():
+                return True
+        return False
+
     # create meta nodes when those commands affect the scene
     # process meta command in place if it only affects the file
-    def __parse_file(self):
-        for line in self.lines:
+    def __parse_lines(self, lines):
+        for line in lines:
             try:
                 clean_line = helpers.clean_line(line)
                 strip_line = line.strip()
@@ -561,26 +643,9 @@ class LDrawFile:
             ))
 
             # allows for extra spaces in the filename
-            filename = _sparams[14].lower()
-
-            # filename = "stud-logo.dat"
-            # parts = filename.split(".") => ["stud-logo", "dat"]
-            # name = parts[0] => "stud-logo"
-            # name_parts = name.split('-') => ["stud", "logo"]
-            # stud_name = name_parts[0] => "stud"
-            # chosen_logo = special_bricks.chosen_logo => "logo5"
-            # ext = parts[1] => "dat"
-            # filename = f"{stud_name}-{chosen_logo}.{ext}" => "stud-logo5.dat"
-            if ImportOptions.display_logo and filename in ldraw_part_types.stud_names:
-                parts = filename.split('.')
-                name = parts[0]
-                name_parts = name.split('-')
-                stud_name = name_parts[0]
-                chosen_logo = ImportOptions.chosen_logo_value()
-                ext = parts[1]
-                filename = f"{stud_name}-{chosen_logo}.{ext}"
-
-            ldraw_file = LDrawFile.get_file(filename)
+            filename = LDrawFile.__subfile_name(_sparams[14])
+
+            ldraw_file = LDrawFile.get_file(filename, stream=True)
             if ldraw_file is None:
                 return True
 
@@ -599,6 +664,28 @@ class LDrawFile:
             return True
         return False
 
+    @staticmethod
+    def __subfile_name(name):
+        filename = name.lower()
+
+        # filename = "stud-logo.dat"
+        # parts = filename.split(".") => ["stud-logo", "dat"]
+        # name = parts[0] => "stud-logo"
+        # name_parts = name.split('-') => ["stud", "logo"]
+        # stud_name = name_parts[0] => "stud"
+        # chosen_logo = special_bricks.chosen_logo => "logo5"
+        # ext = parts[1] => "dat"
+        # filename = f"{stud_name}-{chosen_logo}.{ext}" => "stud-logo5.dat"
+        if ImportOptions.display_logo and filename in ldraw_part_types.stud_names:
+            parts = filename.split('.')
+            name = parts[0]
+            name_parts = name.split('-')
+            stud_name = name_parts[0]
+            chosen_logo = ImportOptions.chosen_logo_value()
+            ext = parts[1]
+            filename = f"{stud_name}-{chosen_logo}.{ext}"
+        return filename
+
     def __line_geometry(self, clean_line):
         if (clean_line.startswith("2 ") or
                 clean_line.startswith("3 ") or
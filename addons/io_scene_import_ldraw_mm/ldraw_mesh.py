@@ -1,8 +1,9 @@
 import bpy
 import bmesh
-import mathutils
+import numpy as np
 
 from .blender_materials import BlenderMaterials
+from .geometry_data import WeldData
 from .import_options import ImportOptions
 from .ldraw_color import LDrawColor
 from . import special_bricks
@@ -10,93 +11,296 @@ from . import strings
 from . import helpers
 from . import matrices
 
+from io_scene_render_ldraw.modelglobals import instrumentation
+
 
 def get_mesh(key):
     return bpy.data.meshes.get(key)
 
 
 def create_mesh(key, geometry_data, color_code):
-    mesh = get_mesh(key)
+    mesh = instrumentation.cache_lookup("mesh", get_mesh(key))
     if mesh is None:
-        mesh = bpy.data.meshes.new(key)
-        mesh.name = key
-        mesh[strings.ldraw_filename_key] = geometry_data.file.name
+        with instrumentation.span("mesh_build", part=geometry_data.file.name):
+            mesh = bpy.data.meshes.new(key)
+            mesh.name = key
+            mesh[strings.ldraw_filename_key] = geometry_data.file.name
+
+            weld_data, vertex_cells = __process_bmesh(mesh, geometry_data, color_code)
+            __process_mesh_sharp_edges(mesh, weld_data, vertex_cells)
+            __process_mesh(mesh)
+            __add_edge_lines(mesh, geometry_data)
 
-        __process_bmesh(mesh, geometry_data, color_code)
-        __process_mesh_sharp_edges(mesh, geometry_data)
-        __process_mesh(mesh)
-        __create_edge_mesh(key, geometry_data)
+    if ImportOptions.bevel_edges and ImportOptions.bake_bevel:
+        mesh = __get_bevel_mesh(key, mesh)
 
     return mesh
 
 
+# the beveled mesh is cached next to the unbeveled one, so every instance of the part shares one bevel
+def __get_bevel_mesh(key, mesh):
+    bevel_key = f"b_{key}"
+    bevel_mesh = instrumentation.cache_lookup("bevel_mesh", get_mesh(bevel_key))
+    if bevel_mesh is None:
+        with instrumentation.span("bevel_bake"):
+            bevel_mesh = mesh.copy()
+            bevel_mesh.name = bevel_key
+            __bake_bevel(bevel_mesh)
+    return bevel_mesh
+
+
+# same result as the Bevel modifier with limit_method WEIGHT
+def __bake_bevel(mesh):
+    bevel_weights = np.empty(len(mesh.edges), dtype=np.float32)
+    mesh.edges.foreach_get("bevel_weight", bevel_weights)
+    edge_indices = np.flatnonzero(bevel_weights > 0.0).tolist()
+    if len(edge_indices) < 1:
+        return
+
+    # custom normals are recomputed for the beveled faces in __process_mesh
+    if mesh.has_custom_normals:
+        mesh.customdata_custom_splitnormals_clear()
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    helpers.ensure_bmesh(bm)
+    edges = [bm.edges[i] for i in edge_indices]
+
+    kwargs = {}
+    if bpy.app.version < (2, 90):
+        kwargs["vertex_only"] = False
+    else:
+        kwargs["affect"] = 'EDGES'
+
+    # edge lines all share ImportOptions.bevel_weight, which scales the width like the modifier does
+    bmesh.ops.bevel(
+        bm,
+        geom=edges,
+        offset=ImportOptions.bevel_width * ImportOptions.bevel_weight,
+        offset_type='OFFSET',
+        segments=ImportOptions.bevel_segments,
+        profile=0.5,
+        clamp_overlap=True,
+        **kwargs,
+    )
+    helpers.finish_bmesh(bm, mesh)
+    helpers.finish_mesh(mesh)
+    __process_mesh(mesh)
+
+
 # https://b3d.interplanety.org/en/how-to-get-global-vertex-coordinates/
 # https://blender.stackexchange.com/questions/50160/scripting-low-level-join-meshes-elements-hopefully-with-bmesh
 # https://blender.stackexchange.com/questions/188039/how-to-join-only-two-objects-to-create-a-new-object-using-python
 # https://blender.stackexchange.com/questions/23905/select-faces-depending-on-material
 def __process_bmesh(mesh, geometry_data, color_code):
-    bm = __process_bmesh_faces(mesh, geometry_data, color_code)
+    weld_data = __get_weld_data(geometry_data)
+    bm = __process_bmesh_faces(mesh, geometry_data, color_code, weld_data)
     helpers.ensure_bmesh(bm)
     __clean_bmesh(bm)
-    __process_bmesh_edges(bm, geometry_data)
+    vertex_cells = __process_bmesh_edges(bm, weld_data)
     helpers.finish_bmesh(bm, mesh)
     helpers.finish_mesh(mesh)
+    return weld_data, vertex_cells
 
 
-# bpy.context.object.data.edges[6].use_edge_sharp = True
-# Create kd tree for fast "find nearest points" calculation
-# https://docs.blender.org/api/blender_python_api_current/mathutils.kdtree.html
-# https://docs.scipy.org/doc/scipy/reference/generated/scipy.spatial.KDTree.html
-def __get_edge_indices(verts, geometry_data):
-    kd = mathutils.kdtree.KDTree(len(verts))
-    for i, v in enumerate(verts):
-        kd.insert(v.co, i)
-    kd.balance()
+# the weld is built once per geometry_data and reused by every color of the part
+def __get_weld_data(geometry_data):
+    weld_data = geometry_data.weld_data
+    if weld_data is None:
+        with instrumentation.span("weld"):
+            weld_data = __weld(geometry_data)
+        geometry_data.weld_data = weld_data
+    return weld_data
+
+
+# quantize every face vertex to a merge_distance grid
+# vertices in the same cell, or in a neighboring cell merged into it, are welded, which replaces bmesh.ops.remove_doubles
+# type 2 edge endpoints are mapped to the same cells, so sharp edges are found by cell pair
+# instead of a KDTree range query per endpoint
+def __weld(geometry_data):
+    distance = ImportOptions.merge_distance
+    weld_data = WeldData()
+
+    face_sizes = [len(face_data.vertices) for face_data in geometry_data.face_data]
+    co = np.array([vertex[:] for face_data in geometry_data.face_data for vertex in face_data.vertices], dtype=np.float64).reshape(-1, 3)
+    cell_keys, first, inverse = np.unique(__cell_keys(co, distance), axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    weld_data.cell_keys = __packed_keys(cell_keys)
+    root_cells, weld_data.cell_labels = __merge_neighbor_cells(weld_data.cell_keys, cell_keys, co[first], distance)
+    weld_data.cell_vertices = co[first][root_cells]
+    weld_data.cell_count = len(root_cells)
+    weld_data.corner_cells = weld_data.cell_labels[inverse]
+
+    face_indices = []
+    corner_cells = weld_data.corner_cells.tolist()
+    i = 0
+    for size in face_sizes:
+        face_indices.append(corner_cells[i:i + size])
+        i += size
+    weld_data.face_indices = face_indices
 
-    # increase the distance to look for edges to merge
     # merge line type 2 edges at a greater distance than mesh edges
     # the rounded part in the seat of 4079.dat has a gap just wide
     # enough that 2x isn't enough
-    distance = ImportOptions.merge_distance
-    distance = ImportOptions.merge_distance * 2.1
-
-    edge_indices = set()
-
-    for edge_data in geometry_data.edge_data:
-        edge_verts = []
-        # for vertex in edge_data.vertices[0:2]:  # in case line_data is being used since it has 4 verts
-        for vertex in edge_data.vertices:
-            edge_verts.append(vertex)
-
-        edges0 = [index for (co, index, dist) in kd.find_range(edge_verts[0], distance)]
-        edges1 = [index for (co, index, dist) in kd.find_range(edge_verts[1], distance)]
-        for e0 in edges0:
-            for e1 in edges1:
-                edge_indices.add((e0, e1))
-                edge_indices.add((e1, e0))
-
-    return edge_indices
-
+    edge_distance = distance * 2.1
+    edge_cells = np.empty((0, 2), dtype=np.int64)
+    if len(geometry_data.edge_data) > 0:
+        edge_co = np.array([vertex[:] for edge_data in geometry_data.edge_data for vertex in edge_data.vertices[0:2]], dtype=np.float64).reshape(-1, 3)
+        edge_cells = __find_cells(weld_data, edge_co, distance, edge_distance).reshape(-1, 2)
+        edge_cells = edge_cells[(edge_cells >= 0).all(axis=1) & (edge_cells[:, 0] != edge_cells[:, 1])]
+        edge_cells.sort(axis=1)
+        edge_cells = np.unique(edge_cells, axis=0)
+    weld_data.sharp_edges = set(map(tuple, edge_cells.tolist()))
+    weld_data.sharp_codes = edge_cells[:, 0] * weld_data.cell_count + edge_cells[:, 1]
+
+    return weld_data
+
+
+# the integer cell of every coordinate
+# a merge_distance of 0 only welds identical coordinates, so their bits are the key
+def __cell_keys(co, distance):
+    if distance <= 0:
+        return np.ascontiguousarray(co + 0.0).view(np.int64)
+    return np.floor(co / distance + 0.5).astype(np.int64)
+
+
+__key_dtype = np.dtype([("x", np.int64), ("y", np.int64), ("z", np.int64)])
+
+
+# each row of cell keys as one value that sorts like np.unique(keys, axis=0)
+def __packed_keys(keys):
+    return np.ascontiguousarray(keys, dtype=np.int64).view(__key_dtype).reshape(-1)
+
+
+# the index of every key in the sorted packed_keys, -1 where it is missing
+def __search_keys(packed_keys, keys):
+    if len(packed_keys) == 0:
+        return np.full(len(keys), -1, dtype=np.int64)
+    keys = __packed_keys(keys)
+    index = np.minimum(np.searchsorted(packed_keys, keys), len(packed_keys) - 1)
+    return np.where(packed_keys[index] == keys, index, -1)
+
+
+# the merged cell of every key, -1 where no face vertex was quantized to it
+def __lookup_cells(weld_data, keys):
+    found = __search_keys(weld_data.cell_keys, keys)
+    if len(weld_data.cell_labels) == 0:
+        return found
+    return np.where(found >= 0, weld_data.cell_labels[found], -1)
+
+
+__merge_offsets = np.array([
+    (dx, dy, dz) for dx in range(-1, 2) for dy in range(-1, 2) for dz in range(-1, 2)
+    if (dx, dy, dz) != (0, 0, 0)
+], dtype=np.int64)
+
+
+# vertices on either side of a cell boundary round to different cells
+# root cells have no lower numbered neighbor within distance, every other cell joins its nearest root within distance
+# cells only join a root and roots never join, so merges don't chain across the grid like remove_doubles wouldn't
+# returns the root of every merged cell and the merged cell of every cell
+def __merge_neighbor_cells(packed_keys, keys, vertices, distance):
+    cells = np.arange(len(keys))
+    if distance <= 0 or len(keys) == 0:
+        return cells, cells
+
+    pair_cells = []
+    pair_others = []
+    pair_distances = []
+    for offset in __merge_offsets:
+        others = __search_keys(packed_keys, keys + offset)
+        found = np.nonzero(others >= 0)[0]
+        d = np.linalg.norm(vertices[found] - vertices[others[found]], axis=1)
+        close = d <= distance
+        pair_cells.append(found[close])
+        pair_others.append(others[found][close])
+        pair_distances.append(d[close])
+    pair_cells = np.concatenate(pair_cells)
+    pair_others = np.concatenate(pair_others)
+    pair_distances = np.concatenate(pair_distances)
+
+    is_root = np.ones(len(keys), dtype=bool)
+    is_root[pair_cells[pair_others < pair_cells]] = False
+
+    to_root = ~is_root[pair_cells] & is_root[pair_others]
+    pair_cells = pair_cells[to_root]
+    pair_others = pair_others[to_root]
+    order = np.lexsort((pair_distances[to_root], pair_cells))
+    pair_cells = pair_cells[order]
+    pair_others = pair_others[order]
+    nearest = np.unique(pair_cells, return_index=True)[1]
+
+    # a cell with no root nearby is a root of its own
+    roots = cells.copy()
+    roots[pair_cells[nearest]] = pair_others[nearest]
+    root_cells, cell_labels = np.unique(roots, return_inverse=True)
+    return root_cells, cell_labels.reshape(-1)
+
+
+__find_offsets = np.array(sorted(
+    ((dx, dy, dz) for dx in range(-2, 3) for dy in range(-2, 3) for dz in range(-2, 3)),
+    key=lambda o: o[0] * o[0] + o[1] * o[1] + o[2] * o[2],
+), dtype=np.int64)
+
+
+# the merged cell of the nearest welded vertex within max_distance of every co, -1 if there is none
+# a co that quantizes to an occupied cell always gets that cell
+def __find_cells(weld_data, co, distance, max_distance):
+    keys = __cell_keys(co, distance)
+    cells = __lookup_cells(weld_data, keys)
+    missing = np.nonzero(cells < 0)[0]
+    if distance <= 0 or len(missing) == 0:
+        return cells
+
+    keys = keys[missing]
+    co = co[missing]
+    best_distances = np.full(len(missing), max_distance)
+    for offset in __find_offsets:
+        found_cells = __lookup_cells(weld_data, keys + offset)
+        found = np.nonzero(found_cells >= 0)[0]
+        found_cells = found_cells[found]
+        d = np.linalg.norm(weld_data.cell_vertices[found_cells] - co[found], axis=1)
+        closer = d <= best_distances[found]
+        cells[missing[found[closer]]] = found_cells[closer]
+        best_distances[found[closer]] = d[closer]
+    return cells
+
+
+def __process_bmesh_edges(bm, weld_data):
+    # bmesh vertex index -> weld cell
+    if ImportOptions.remove_doubles:
+        vertex_cells = np.arange(weld_data.cell_count)
+    else:
+        vertex_cells = weld_data.corner_cells
 
-def __process_bmesh_edges(bm, geometry_data):
     if ImportOptions.smooth_type_value() == "bmesh_split":
-        edge_indices = __get_edge_indices(bm.verts, geometry_data)
+        bm.verts.index_update()
 
         # Find the appropriate mesh edges and make them sharp (i.e. not smooth)
-        edges = set()
-        # merge = set()
+        edges = []
         for edge in bm.edges:
-            v0 = edge.verts[0]
-            v1 = edge.verts[1]
-            i0 = v0.index
-            i1 = v1.index
-            if (i0, i1) in edge_indices:
-                edges.add(edge)
+            c0 = vertex_cells[edge.verts[0].index]
+            c1 = vertex_cells[edge.verts[1].index]
+            if ((c0, c1) if c0 < c1 else (c1, c0)) in weld_data.sharp_edges:
+                edges.append(edge)
+
+        vertex_count = len(bm.verts)
+        bmesh.ops.split_edges(bm, edges=edges)
+
+        # split verts are appended and share the coordinates of the vert they were split from
+        bm.verts.index_update()
+        if len(bm.verts) > vertex_count:
+            bm.verts.ensure_lookup_table()
+            split_co = np.array([vert.co[:] for vert in bm.verts[vertex_count:]], dtype=np.float64).reshape(-1, 3)
+            split_keys = __cell_keys(split_co, ImportOptions.merge_distance)
+            split_cells = __lookup_cells(weld_data, split_keys)
+            vertex_cells = np.concatenate((vertex_cells, split_cells.astype(vertex_cells.dtype)))
 
-        bmesh.ops.split_edges(bm, edges=list(edges))
+    return vertex_cells
 
 
-def __process_bmesh_faces(mesh, geometry_data, color_code):
+def __process_bmesh_faces(mesh, geometry_data, color_code, weld_data):
     bm = bmesh.new()
 
     vertex_colors = None
@@ -117,9 +321,23 @@ def __process_bmesh_faces(mesh, geometry_data, color_code):
         else:
             mesh.attributes.active_color_name = vertex_colors.name
 
-    for face_data in geometry_data.face_data:
-        verts = [bm.verts.new(vertex) for vertex in face_data.vertices]
-        face = bm.faces.new(verts)
+    cell_verts = None
+    if ImportOptions.remove_doubles:
+        cell_verts = [bm.verts.new(vertex) for vertex in weld_data.cell_vertices.tolist()]
+
+    for face_data, face_indices in zip(geometry_data.face_data, weld_data.face_indices):
+        if cell_verts is not None:
+            # welded corners collapse degenerate faces, and faces that end up with the same verts are dropped
+            verts = [cell_verts[i] for i in dict.fromkeys(face_indices)]
+            if len(verts) < 3:
+                continue
+            try:
+                face = bm.faces.new(verts)
+            except ValueError:
+                continue
+        else:
+            verts = [bm.verts.new(vertex) for vertex in face_data.vertices]
+            face = bm.faces.new(verts)
 
         c = color_code if face_data.color_code == "16" else face_data.color_code
 
@@ -130,6 +348,8 @@ def __process_bmesh_faces(mesh, geometry_data, color_code):
 
         part_slopes = special_bricks.get_part_slopes(geometry_data.file.name)
         parts_cloth = special_bricks.get_parts_cloth(geometry_data.file.name)
+        # faces that have their own color can't take it from the object
+        use_object_color = ImportOptions.color_strategy_value() == "object_color" and c == color_code
         material = BlenderMaterials.get_material(
             color_code=c,
             vertex_colors=vertex_colors,
@@ -138,6 +358,7 @@ def __process_bmesh_faces(mesh, geometry_data, color_code):
             parts_cloth=parts_cloth,
             texmap=face_data.texmap,
             pe_texmap=face_data.pe_texmap,
+            use_object_color=use_object_color,
         )
 
         material_index = mesh.materials.find(material.name)
@@ -158,10 +379,8 @@ def __process_bmesh_faces(mesh, geometry_data, color_code):
     return bm
 
 
+# remove_doubles is handled by __weld
 def __clean_bmesh(bm):
-    if ImportOptions.remove_doubles:
-        bmesh.ops.remove_doubles(bm, verts=bm.verts[:], dist=ImportOptions.merge_distance)
-
     # recalculate_normals completely overwrites any bfc processing
     if ImportOptions.recalculate_normals:
         bmesh.ops.recalc_face_normals(bm, faces=bm.faces[:])
@@ -169,48 +388,97 @@ def __clean_bmesh(bm):
 
 # for edge_data in geometry_data.line_data:
 # for vertex in edge_data.vertices[0:2]:  # in case line_data is being used since it has 4 verts
-def __create_edge_mesh(key, geometry_data):
-    if ImportOptions.import_edges:
-        e_verts = []
-        e_edges = []
-        e_faces = []
-
-        i = 0
-        for edge_data in geometry_data.edge_data:
-            face_indices = []
-            for vertex in edge_data.vertices:
-                e_verts.append(vertex)
-                face_indices.append(i)
-                i += 1
-            e_faces.append(face_indices)
-
-        edge_key = f"e_{key}"
-        edge_mesh = bpy.data.meshes.new(edge_key)
-        edge_mesh.name = edge_key
-        edge_mesh[strings.ldraw_filename_key] = geometry_data.file.name
-
-        edge_mesh.from_pydata(e_verts, e_edges, e_faces)
-        helpers.finish_mesh(edge_mesh)
-
-
-def __process_mesh_sharp_edges(mesh, geometry_data):
+# edge lines are added to the part mesh as loose edges flagged with the ldraw_edge attribute,
+# instead of a separate edge object per part instance
+# they are marked sharp (exported as line type 2) and freestyle (Freestyle and Line Art edge marks)
+def __add_edge_lines(mesh, geometry_data):
+    if ImportOptions.import_edges and len(geometry_data.edge_data) > 0:
+        edge_co = np.array([vertex[:] for edge_data in geometry_data.edge_data for vertex in edge_data.vertices[0:2]], dtype=np.float32).reshape(-1)
+        edge_vertex_count = len(edge_co) // 3
+
+        vertex_count = len(mesh.vertices)
+        co = np.empty(vertex_count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", co)
+
+        edge_count = len(mesh.edges)
+        edge_vertices = np.empty(edge_count * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edge_vertices)
+        use_edge_sharp = np.empty(edge_count, dtype=bool)
+        mesh.edges.foreach_get("use_edge_sharp", use_edge_sharp)
+        use_freestyle_mark = np.empty(edge_count, dtype=bool)
+        mesh.edges.foreach_get("use_freestyle_mark", use_freestyle_mark)
+
+        mesh.vertices.add(edge_vertex_count)
+        mesh.vertices.foreach_set("co", np.concatenate((co, edge_co)))
+
+        mesh.edges.add(edge_vertex_count // 2)
+        line_vertices = np.arange(vertex_count, vertex_count + edge_vertex_count, dtype=np.int32)
+        mesh.edges.foreach_set("vertices", np.concatenate((edge_vertices, line_vertices)))
+
+        # each line is marked once, on the face edges or on the loose lines, so Freestyle, Line Art and export
+        # don't see it twice. face edges keep sharp for the normals, the loose lines carry the freestyle mark
+        is_line = np.zeros(edge_count + edge_vertex_count // 2, dtype=bool)
+        is_line[edge_count:] = True
+        mark_sharp = ImportOptions.smooth_type_value() not in ["edge_split", "custom_normals"]
+        mesh.edges.foreach_set("use_edge_sharp", np.concatenate((use_edge_sharp, is_line[edge_count:] & mark_sharp)))
+        mark_freestyle = ImportOptions.use_freestyle_edges
+        mesh.edges.foreach_set("use_freestyle_mark", np.concatenate((use_freestyle_mark, is_line[edge_count:] & mark_freestyle)))
+
+        attribute = mesh.attributes.get(strings.ldraw_edge_key)
+        if attribute is None:
+            attribute = mesh.attributes.new(strings.ldraw_edge_key, 'BOOLEAN', 'EDGE')
+        attribute.data.foreach_set("value", is_line)
+
+        mesh.update()
+
+
+def __process_mesh_sharp_edges(mesh, weld_data, vertex_cells):
     # TODO: ImportOptions.mark_edges_as_sharp
-    if ImportOptions.smooth_type_value() == "edge_split" or ImportOptions.use_freestyle_edges or ImportOptions.bevel_edges:
-        edge_indices = __get_edge_indices(mesh.vertices, geometry_data)
+    if ImportOptions.smooth_type_value() in ["edge_split", "custom_normals"] or ImportOptions.use_freestyle_edges or ImportOptions.bevel_edges:
+        edge_count = len(mesh.edges)
+        edge_vertices = np.empty(edge_count * 2, dtype=np.int32)
+        mesh.edges.foreach_get("vertices", edge_vertices)
 
-        for edge in mesh.edges:
-            v0 = edge.vertices[0]
-            v1 = edge.vertices[1]
-            if (v0, v1) in edge_indices:
-                if ImportOptions.smooth_type_value() == "edge_split":
-                    edge.use_edge_sharp = True
-                if ImportOptions.use_freestyle_edges:
-                    edge.use_freestyle_mark = True
-                if ImportOptions.bevel_edges:
-                    edge.bevel_weight = ImportOptions.bevel_weight
+        cells = vertex_cells[edge_vertices].reshape(-1, 2)
+        cells.sort(axis=1)
+        codes = cells[:, 0] * weld_data.cell_count + cells[:, 1]
+        sharp = np.isin(codes, weld_data.sharp_codes) & (cells[:, 0] >= 0)
+
+        if ImportOptions.smooth_type_value() in ["edge_split", "custom_normals"]:
+            mesh.edges.foreach_set("use_edge_sharp", sharp)
+        if ImportOptions.use_freestyle_edges and not ImportOptions.import_edges:
+            mesh.edges.foreach_set("use_freestyle_mark", sharp)
+        if ImportOptions.bevel_edges:
+            mesh.edges.foreach_set("bevel_weight", np.where(sharp, ImportOptions.bevel_weight, 0.0).astype(np.float32))
 
 
 def __process_mesh(mesh):
     if ImportOptions.smooth_type_value() == "auto_smooth" or ImportOptions.smooth_type_value() == "bmesh_split":
         mesh.use_auto_smooth = ImportOptions.shade_smooth
         mesh.auto_smooth_angle = matrices.auto_smooth_angle
+    elif ImportOptions.smooth_type_value() == "custom_normals" and ImportOptions.shade_smooth:
+        __process_mesh_custom_normals(mesh)
+
+
+# split normals are computed once from the edge lines marked sharp in __process_mesh_sharp_edges
+# and the smooth angle, then stored on the mesh, so objects sharing the mesh need no Edge Split modifier
+def __process_mesh_custom_normals(mesh):
+    normals = np.empty(len(mesh.loops) * 3, dtype=np.float32)
+    if bpy.app.version < (4, 1):
+        mesh.use_auto_smooth = True
+        mesh.auto_smooth_angle = matrices.auto_smooth_angle
+        mesh.calc_normals_split()
+        mesh.loops.foreach_get("normal", normals)
+    else:
+        # set_sharp_from_angle replaces sharp_edge, keep the edge lines marked sharp
+        use_edge_sharp = np.empty(len(mesh.edges), dtype=bool)
+        mesh.edges.foreach_get("use_edge_sharp", use_edge_sharp)
+        mesh.set_sharp_from_angle(angle=matrices.auto_smooth_angle)
+        angle_sharp = np.empty(len(mesh.edges), dtype=bool)
+        mesh.edges.foreach_get("use_edge_sharp", angle_sharp)
+        mesh.edges.foreach_set("use_edge_sharp", use_edge_sharp | angle_sharp)
+        mesh.update()
+        mesh.corner_normals.foreach_get("vector", normals)
+    mesh.normals_split_custom_set(normals.reshape(-1, 3))
+    if bpy.app.version < (4, 1):
+        mesh.free_normals_split()
@@ -8,6 +8,9 @@ from . import ldraw_object
 from . import ldraw_meta
 from . import matrices
 
+from io_scene_render_ldraw.modelglobals import caches
+from io_scene_render_ldraw.modelglobals import instrumentation
+
 
 class LDrawNode:
     """
@@ -15,12 +18,15 @@ class LDrawNode:
     """
 
     part_count = 0
-    key_map = {}
-    geometry_datas = {}
+    chunk_part_count = 0
+    key_map = caches.BoundedCache("mm_mesh_keys")
+    # geometry_data is rebuilt if it has been evicted
+    geometry_datas = caches.BoundedCache("mm_geometry_data", max_bytes=caches.default_budget, sizeof=GeometryData.nbytes)
 
     @classmethod
     def reset_caches(cls):
         cls.part_count = 0
+        cls.chunk_part_count = 0
         cls.key_map.clear()
         cls.geometry_datas.clear()
 
@@ -102,8 +108,15 @@ class LDrawNode:
             if top_part:
                 # top-level part
                 LDrawNode.part_count += 1
+                instrumentation.count("parts")
                 vertex_matrix = matrices.identity_matrix
-                cached_geometry_data = LDrawNode.geometry_datas.get(geometry_data_key)
+                cached_geometry_data = instrumentation.cache_lookup("geometry_data", LDrawNode.geometry_datas.get(geometry_data_key))
+                # a released geometry_data only places objects whose mesh is already built
+                # a new color of a vertex_colors part needs the geometry again
+                if cached_geometry_data is not None and cached_geometry_data.released:
+                    if ldraw_mesh.get_mesh(f"{geometry_data_key}_{obj_color_code}") is None:
+                        instrumentation.count("geometry_rebuilds")
+                        cached_geometry_data = None
                 # set top level parts to 16 so that geometry_data is only created once per filename
                 # then change their 16 faces to obj_color_code
                 # TODO: replace material of 16 faces with geometry nodes
@@ -130,7 +143,7 @@ class LDrawNode:
             invert_next = False
 
             subfile_line_index = 0
-            for child_node in self.file.child_nodes:
+            for child_node in self.file.iter_child_nodes():
                 # self.texmap_fallback will only be true if ImportOptions.meta_texmap == True and you're on a fallback line
                 # if ImportOptions.meta_texmap == False, it will always be False
                 if child_node.meta_command in ["1", "2", "3", "4", "5"] and not self.texmap_fallback:
@@ -236,6 +249,10 @@ class LDrawNode:
                 elif child_node.meta_command == "bfc" and child_node.meta_args["command"] != "INVERTNEXT":
                     invert_next = False
 
+        # a finished submodel is a chunk boundary
+        if top_model and ImportOptions.chunk_size > 0:
+            LDrawNode.flush_chunk()
+
         if top_part:
             # geometry_data will not be None if this is a new mesh
             # geometry_data will be None if the mesh already exists
@@ -248,12 +265,33 @@ class LDrawNode:
 
             obj = LDrawNode.__create_obj(geometry_data, obj_color_code, obj_matrix, collection)
 
+            LDrawNode.chunk_part_count += 1
+            if ImportOptions.chunk_size > 0 and LDrawNode.chunk_part_count >= ImportOptions.chunk_size:
+                LDrawNode.flush_chunk()
+
             # if LDrawNode.part_count == 1:
             #     raise BaseException("done")
 
             # yield obj
             return obj
 
+    # every part so far has its mesh and object in bpy.data
+    # free the vertex data behind them so memory does not grow with the part count
+    # the nodes of streamed submodels are already gone, see LDrawFile.iter_child_nodes
+    @classmethod
+    def flush_chunk(cls):
+        if cls.chunk_part_count < 1:
+            return
+        with instrumentation.span("chunk_flush"):
+            for geometry_data_key, geometry_data in list(cls.geometry_datas.items()):
+                if not geometry_data.released:
+                    geometry_data.release()
+                    # set again so the cache accounts the released size
+                    cls.geometry_datas[geometry_data_key] = geometry_data
+        cls.chunk_part_count = 0
+        instrumentation.count("chunks")
+        instrumentation.set_value("peak_rss", caches.peak_rss())
+
     @staticmethod
     def __create_obj(geometry_data, color_code, matrix, collection):
         # blender mesh data is unique also based on color
@@ -1,29 +1,54 @@
 import bpy
+import os
+import re
 
 from .import_options import ImportOptions
 from .ldraw_color import LDrawColor
 from . import group
 from . import strings
 from . import ldraw_props
+from . import helpers
 from . import ldraw_meta
-from . import ldraw_mesh
 from . import matrices
 
+from io_scene_render_ldraw.modelglobals import instrumentation
+
 top_empty = None
 gap_scale_empty = None
+object_index = 0
 
 
 def reset_caches():
     global top_empty
     global gap_scale_empty
+    global object_index
 
     top_empty = None
     gap_scale_empty = None
+    object_index = __last_object_index()
+
+
+# continue after the numbered objects of earlier imports into this blend file
+# only parts this importer created count, a user's "2024_scene" does not
+def __last_object_index():
+    last_index = 0
+    for obj in bpy.data.objects:
+        if strings.ldraw_filename_key not in obj:
+            continue
+        match = re.match(r"(\d{5,})_", obj.name)
+        if match is not None:
+            last_index = max(last_index, int(match.group(1)))
+    return last_index
 
 
 # TODO: to add rigid body - must apply scale and cannot be parented to empty
 def create_object(key, mesh, geometry_data, color_code, matrix, collection):
-    obj = bpy.data.objects.new(mesh.name, mesh)
+    with instrumentation.span("object_link"):
+        return __create_object(key, mesh, geometry_data, color_code, matrix, collection)
+
+
+def __create_object(key, mesh, geometry_data, color_code, matrix, collection):
+    obj = bpy.data.objects.new(__object_name(geometry_data), mesh)
     obj[strings.ldraw_filename_key] = geometry_data.file.name
     obj[strings.ldraw_color_code_key] = color_code
     color = LDrawColor.get_color(color_code)
@@ -34,11 +59,21 @@ def create_object(key, mesh, geometry_data, color_code, matrix, collection):
     __process_top_object_edges(obj)
     ldraw_meta.do_meta_step(obj)
     __link_obj_to_collection(obj, collection)
-    __create_edge_obj(key, obj, geometry_data, color_code, collection)
 
     return obj
 
 
+# numbered part names (00001_3001) are unique up front
+# naming every instance after its mesh made Blender search for a free .001 suffix on each repeat
+def __object_name(geometry_data):
+    global object_index
+
+    object_index += 1
+    prefix = f"{object_index:05d}_"
+    label = os.path.splitext(os.path.basename(geometry_data.file.name))[0]
+    return prefix + helpers.clamp_name(label, 63 - len(prefix))
+
+
 def __process_top_object_matrix(obj, obj_matrix):
     global top_empty
 
@@ -73,7 +108,8 @@ def __process_gap_scale_matrix(obj, matrix_world):
 
 
 def __process_top_object_edges(obj):
-    if ImportOptions.bevel_edges:
+    # a baked bevel is already part of the mesh
+    if ImportOptions.bevel_edges and not ImportOptions.bake_bevel:
         bevel_modifier = obj.modifiers.new("Bevel", type='BEVEL')
         bevel_modifier.limit_method = 'WEIGHT'
         bevel_modifier.width = ImportOptions.bevel_width
@@ -88,24 +124,6 @@ def __process_top_object_edges(obj):
         edge_modifier.split_angle = matrices.auto_smooth_angle
 
 
-def __create_edge_obj(key, obj, geometry_data, color_code, collection):
-    if ImportOptions.import_edges:
-        edge_key = f"e_{key}"
-        edge_mesh = ldraw_mesh.get_mesh(edge_key)
-        edge_obj = bpy.data.objects.new(edge_mesh.name, edge_mesh)
-        edge_obj[strings.ldraw_filename_key] = f"{geometry_data.file.name}_edges"
-        edge_obj[strings.ldraw_color_code_key] = color_code
-        color = LDrawColor.get_color(color_code)
-        edge_obj.color = color.edge_color_d
-
-        ldraw_meta.do_meta_step(edge_obj)
-
-        __link_obj_to_collection(edge_obj, collection)
-
-        edge_obj.parent = obj
-        edge_obj.matrix_world = obj.matrix_world
-
-
 def __link_obj_to_collection(obj, _collection):
     group.link_obj(_collection, obj)
 
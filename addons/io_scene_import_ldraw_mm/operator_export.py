@@ -7,7 +7,6 @@ from .export_options import ExportOptions
 from .import_settings import ImportSettings
 from .filesystem import FileSystem
 from .ldraw_color import LDrawColor
-from . import ldraw_export
 
 
 class EXPORT_OT_do_ldraw_export(bpy.types.Operator, ExportHelper):
@@ -131,6 +130,7 @@ class EXPORT_OT_do_ldraw_export(bpy.types.Operator, ExportHelper):
         ExportOptions.triangulate = self.triangulate
         ExportOptions.ngon_handling = self.ngon_handling
 
+        from . import ldraw_export
         ldraw_export.do_export(bpy.path.abspath(self.filepath))
 
         print("")
@@ -5,13 +5,13 @@ import os
 
 
 from io_scene_render_ldraw.modelglobals import model_globals
+from io_scene_render_ldraw.modelglobals import caches
+from io_scene_render_ldraw.modelglobals import instrumentation
 from bpy_extras.io_utils import ImportHelper
 from .import_settings import ImportSettings
 from .import_options import ImportOptions
 from .ldraw_color import LDrawColor
 from .filesystem import FileSystem
-from .ldraw_node import LDrawNode
-from . import blender_import
 
 class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
     """Import an LDraw model File"""
@@ -369,6 +369,19 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
         **ImportSettings.settings_dict('bevel_segments'),
     )
 
+    bake_bevel: bpy.props.BoolProperty(
+        name="Bake bevel",
+        description="Apply the bevel once to each part mesh instead of adding a Bevel modifier to every part",
+        **ImportSettings.settings_dict('bake_bevel'),
+    )
+
+    chunk_size: bpy.props.IntProperty(
+        name="Chunk size",
+        description="Free the working geometry of finished parts after this many parts or a finished submodel, and parse models this many lines at a time. The model text and one mesh per distinct part stay in memory, 0 imports in one pass",
+        **ImportSettings.settings_dict('chunk_size'),
+        min=0,
+    )
+
     search_additional_paths: bpy.props.BoolProperty(
         name="Search Additional Paths",
         description="Search additional LDraw paths (automatically set for fade previous steps and highlight step)",
@@ -420,6 +433,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
 
     def execute(self, context):
         start = time.perf_counter()
+        instrumentation.begin_import()
 
         # bpy.ops.object.mode_set(mode='OBJECT')
 
@@ -450,6 +464,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
             self.camera_border_percent   = IMPORT_OT_do_ldraw_import.prefs.get("camera_border_percent", self.camera_border_percent)
             self.import_lights           = IMPORT_OT_do_ldraw_import.prefs.get("import_lights", self.import_lights)
             self.search_additional_paths = IMPORT_OT_do_ldraw_import.prefs.get("search_additional_paths", self.search_additional_paths)
+            self.use_archive_library     = IMPORT_OT_do_ldraw_import.prefs.get("use_archive_library", self.use_archive_library)
             self.case_sensitive_filesystem = IMPORT_OT_do_ldraw_import.prefs.get("case_sensitive_filesystem", self.case_sensitive_filesystem)            
 
             self.custom_ldconfig_file    = IMPORT_OT_do_ldraw_import.prefs.get("custom_ldconfig_file",   self.custom_ldconfig_file)
@@ -472,6 +487,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
             self.bevel_weight            = IMPORT_OT_do_ldraw_import.prefs.get("bevel_weight", self.bevel_weight)
             self.bevel_width             = IMPORT_OT_do_ldraw_import.prefs.get("bevel_width", self.bevel_width)
             self.bevel_segments          = IMPORT_OT_do_ldraw_import.prefs.get("bevel_segments", self.bevel_segments)
+            self.bake_bevel              = IMPORT_OT_do_ldraw_import.prefs.get("bake_bevel", self.bake_bevel)
 
             self.remove_doubles          = IMPORT_OT_do_ldraw_import.prefs.get("remove_doubles", self.remove_doubles)
             self.merge_distance          = IMPORT_OT_do_ldraw_import.prefs.get("merge_distance", self.merge_distance)
@@ -498,6 +514,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
             self.import_edges            = IMPORT_OT_do_ldraw_import.prefs.get("import_edges", self.import_edges)
             self.treat_shortcut_as_model = IMPORT_OT_do_ldraw_import.prefs.get("treat_shortcut_as_model", self.treat_shortcut_as_model)
             self.no_studs                = IMPORT_OT_do_ldraw_import.prefs.get("no_studs", self.no_studs)
+            self.chunk_size              = IMPORT_OT_do_ldraw_import.prefs.get("chunk_size", self.chunk_size)
 
             self.profile                 = IMPORT_OT_do_ldraw_import.prefs.get("profile", self.profile)
             self.verbose                 = IMPORT_OT_do_ldraw_import.prefs.get("verbose", self.verbose)
@@ -514,6 +531,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
             IMPORT_OT_do_ldraw_import.prefs['camera_border_percent']   = self.camera_border_percent
             IMPORT_OT_do_ldraw_import.prefs['import_lights']           = self.import_lights
             IMPORT_OT_do_ldraw_import.prefs['search_additional_paths'] = self.search_additional_paths
+            IMPORT_OT_do_ldraw_import.prefs['use_archive_library']     = self.use_archive_library
             IMPORT_OT_do_ldraw_import.prefs['case_sensitive_filesystem'] = self.case_sensitive_filesystem            
 
             IMPORT_OT_do_ldraw_import.prefs['custom_ldconfig_file']    = self.custom_ldconfig_file
@@ -536,6 +554,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
             IMPORT_OT_do_ldraw_import.prefs["bevel_weight"]            = self.bevel_weight
             IMPORT_OT_do_ldraw_import.prefs["bevel_width"]             = self.bevel_width
             IMPORT_OT_do_ldraw_import.prefs["bevel_segments"]          = self.bevel_segments
+            IMPORT_OT_do_ldraw_import.prefs["bake_bevel"]              = self.bake_bevel
 
             IMPORT_OT_do_ldraw_import.prefs["remove_doubles"]          = self.remove_doubles
             IMPORT_OT_do_ldraw_import.prefs["merge_distance"]          = self.merge_distance
@@ -562,6 +581,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
             IMPORT_OT_do_ldraw_import.prefs["import_edges"]            = self.import_edges
             IMPORT_OT_do_ldraw_import.prefs["treat_shortcut_as_model"] = self.treat_shortcut_as_model
             IMPORT_OT_do_ldraw_import.prefs["no_studs"]                = self.no_studs
+            IMPORT_OT_do_ldraw_import.prefs["chunk_size"]              = self.chunk_size
 
             IMPORT_OT_do_ldraw_import.prefs["profile"]                 = self.profile
             IMPORT_OT_do_ldraw_import.prefs["verbose"]                 = self.verbose
@@ -578,6 +598,10 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
 
         model_globals.LDRAW_MODEL_FILE = self.filepath
 
+        # the importer modules are loaded on first use, not when the addon is registered
+        from .ldraw_node import LDrawNode
+        from . import blender_import
+
         # wm = context.window_manager
         # self._timer = wm.event_timer_add(0.01, window=context.window)
         # wm.modal_handler_add(self)
@@ -593,14 +617,15 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
             from pathlib import Path
             prof_output = os.path.join(Path.home(), 'ldraw_import_mm.prof')
 
-            with cProfile.Profile() as profiler:
+            with cProfile.Profile() as profiler, instrumentation.span("import"):
                 load_result = blender_import.do_import(bpy.path.abspath(self.filepath))
             stats = pstats.Stats(profiler)
             stats.sort_stats(pstats.SortKey.TIME)
             stats.print_stats()
             stats.dump_stats(filename=prof_output)
         else:
-            load_result = blender_import.do_import(bpy.path.abspath(self.filepath))
+            with instrumentation.span("import"):
+                load_result = blender_import.do_import(bpy.path.abspath(self.filepath))
 
         model_globals.LDRAW_MODEL_LOADED = True
 
@@ -610,9 +635,14 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
             ImportSettings.debugPrint("Import MM result: None")
         ImportSettings.debugPrint(f"Model file: {model_globals.LDRAW_MODEL_FILE}")
         ImportSettings.debugPrint(f"Part count: {LDrawNode.part_count}")
+        if self.chunk_size > 0:
+            ImportSettings.debugPrint(f"Peak memory: {caches.peak_rss() / (1024 * 1024):.1f} MB ({self.chunk_size} part chunks)")
         end = time.perf_counter()
         elapsed = end - start
         ImportSettings.debugPrint(f"Elapsed time: {elapsed}")
+        if self.profile:
+            for line in instrumentation.report_lines():
+                ImportSettings.debugPrint(line)
         ImportSettings.debugPrint("===========================")
 
         return {'FINISHED'}
@@ -631,6 +661,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
         box.prop(self, "custom_ldconfig_file")
         box.prop(self, "studio_ldraw_path")
         box.prop(self, "search_additional_paths")
+        box.prop(self, "use_archive_library")
         box.prop(self, "case_sensitive_filesystem")
         if not self.ldraw_model_file_loaded:
             box.prop(self, "environment_file")
@@ -663,6 +694,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
         box.prop(self, "bevel_weight")
         box.prop(self, "bevel_width")
         box.prop(self, "bevel_segments")
+        box.prop(self, "bake_bevel")
 
         layout.separator(factor=space_factor)
         box.label(text="Cleanup Options")
@@ -693,6 +725,7 @@ class IMPORT_OT_do_ldraw_import(bpy.types.Operator, ImportHelper):
         box.prop(self, "import_edges")
         box.prop(self, "treat_shortcut_as_model")
         box.prop(self, "no_studs")
+        box.prop(self, "chunk_size")
         box.prop(self, "verbose")
         box.prop(self, "profile")
 
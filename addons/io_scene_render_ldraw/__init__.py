@@ -26,10 +26,12 @@ Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 # support reloading sub-modules
 if "bpy" in locals():
     from importlib import reload
+    reload(renderfarm)
     reload(renderldraw)
     reload(model_globals)
     del reload
 else:
+    from . import renderfarm
     from . import renderldraw
     from .modelglobals import model_globals
 # support reloading sub-modules
@@ -0,0 +1,215 @@
+""" LDraw importer caches
+
+Caches the importers keep between lookups (parsed files, part geometry,
+mesh and material keys, library archives) are created here so they can be
+measured and released together. The render addon releases them once the
+model is imported, before rendering starts.
+
+A cache may be bounded by an entry count and an estimated byte budget,
+least recently used entries are evicted first. Only caches whose entries
+can be rebuilt on demand should be bounded. Sizes are estimates of the
+Python objects held, shared objects are counted once per measurement.
+
+Usage:
+    geometry = caches.BoundedCache("geometry", max_bytes=caches.default_budget)
+    geometry.get(key) / geometry[key] = value
+    caches.sizes()      # {name: estimated bytes}
+    caches.release()    # clear every cache, returns the estimated bytes freed
+    caches.peak_rss()   # peak resident set size of the process in bytes
+"""
+
+import gc
+import sys
+from collections import OrderedDict
+
+from . import instrumentation
+
+default_budget = 1024 * 1024 * 1024
+
+_registry = {}
+
+_atomic_types = (str, bytes, bytearray, int, float, complex, bool, type(None))
+
+
+def estimate_size(*values, seen=None, exclude=()):
+    """Estimated bytes held by values and the objects they reference.
+
+    Containers and instance attributes are followed, Blender data is not.
+    Attributes named in exclude are not followed, for references the
+    measured objects share with others, such as parsed files.
+    """
+
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = list(values)
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+
+        value_type = type(value)
+        if value_type.__module__.startswith("bpy"):
+            continue
+        size += sys.getsizeof(value)
+        if isinstance(value, _atomic_types):
+            continue
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(value)
+        elif hasattr(value, "__dict__") and not isinstance(value, type):
+            size += sys.getsizeof(value.__dict__)
+            stack.extend(attribute for name, attribute in value.__dict__.items() if name not in exclude)
+    return size
+
+
+class BoundedCache:
+    """Dictionary with least recently used eviction and a release hook.
+
+    max_entries and max_bytes of 0 leave the cache unbounded. sizeof estimates
+    the bytes of a value when it is added, it is only used when max_bytes is set.
+    Byte bounded caches should pass a sizeof that counts only the data a value
+    owns, the default follows every reference.
+    on_release is called after the cache is released, for state that depends on it.
+    """
+
+    def __init__(self, name, max_entries=0, max_bytes=0, sizeof=None, on_release=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or estimate_size
+        self.on_release = on_release
+        self.evictions = 0
+        self.__entries = OrderedDict()
+        self.__sizes = {}
+        self.__bytes = 0
+        _registry[name] = self
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __contains__(self, key):
+        return key in self.__entries
+
+    def __iter__(self):
+        return iter(self.__entries)
+
+    def __getitem__(self, key):
+        value = self.__entries[key]
+        if self.max_entries or self.max_bytes:
+            self.__entries.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self.__entries:
+            self.__forget(key)
+        self.__entries[key] = value
+        if self.max_bytes:
+            size = self.sizeof(value)
+            self.__sizes[key] = size
+            self.__bytes += size
+        self.__evict()
+
+    def __delitem__(self, key):
+        self.__forget(key)
+        del self.__entries[key]
+
+    def get(self, key, default=None):
+        if key not in self.__entries:
+            return default
+        return self[key]
+
+    def setdefault(self, key, default=None):
+        if key not in self.__entries:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key, *default):
+        if key in self.__entries:
+            self.__forget(key)
+        return self.__entries.pop(key, *default)
+
+    def keys(self):
+        return self.__entries.keys()
+
+    def values(self):
+        return self.__entries.values()
+
+    def items(self):
+        return self.__entries.items()
+
+    def update(self, *args, **kwargs):
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def clear(self):
+        self.__entries.clear()
+        self.__sizes.clear()
+        self.__bytes = 0
+
+    def nbytes(self, seen=None):
+        """Estimated bytes held by the keys and values."""
+
+        return estimate_size(self.__entries, seen=seen) if self.__entries else 0
+
+    def release(self, seen=None):
+        """Clear the cache, returning the estimated bytes it held."""
+
+        freed = self.nbytes(seen=seen)
+        self.clear()
+        if self.on_release is not None:
+            self.on_release()
+        return freed
+
+    def __forget(self, key):
+        self.__bytes -= self.__sizes.pop(key, 0)
+
+    # the newest entry is always kept, even if it alone is over budget
+    def __evict(self):
+        while len(self.__entries) > 1 and (
+                (self.max_entries and len(self.__entries) > self.max_entries) or
+                (self.max_bytes and self.__bytes > self.max_bytes)):
+            key, value = self.__entries.popitem(last=False)
+            self.__forget(key)
+            self.evictions += 1
+            instrumentation.count(f"{self.name}_evictions")
+
+
+def sizes():
+    """Estimated bytes held by each cache."""
+
+    seen = set()
+    return {name: cache.nbytes(seen=seen) for name, cache in _registry.items()}
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, 0 if unavailable."""
+
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    except (ImportError, AttributeError):
+        return 0
+
+
+def release():
+    """Release every cache, returning the estimated bytes freed."""
+
+    seen = set()
+    freed = 0
+    for cache in _registry.values():
+        freed += cache.release(seen=seen)
+    # parsed files and nodes reference each other, collect them now rather than during the render
+    gc.collect()
+    instrumentation.set_value("cache_bytes_freed", freed)
+    return freed
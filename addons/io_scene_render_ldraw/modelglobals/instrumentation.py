@@ -0,0 +1,244 @@
+""" LDraw import and render instrumentation
+
+Named spans, counters and cache hit/miss tallies shared by both importers
+and the render addon. Recording is a perf_counter call and a list append,
+so it is left enabled in production. Span totals are always aggregated;
+individual span events are kept up to max_events for Chrome tracing.
+
+Usage:
+    with instrumentation.span("parse", file=filename):
+        ...
+    instrumentation.count("parts")
+    instrumentation.cache_hit("geometry") / instrumentation.cache_miss("geometry")
+    instrumentation.write_json(path) / instrumentation.write_chrome_trace(path)
+"""
+
+import os
+import json
+import time
+
+enabled = True
+max_events = 200000
+
+_session = False
+_origin = time.perf_counter()
+_stack = []
+_events = []
+_spans = {}
+_counters = {}
+_caches = {}
+
+
+def reset():
+    global _origin
+
+    _origin = time.perf_counter()
+    _stack.clear()
+    _events.clear()
+    _spans.clear()
+    _counters.clear()
+    _caches.clear()
+
+
+def begin_session():
+    """Start a recording session that spans several operators (e.g. import and render)."""
+
+    global _session
+
+    reset()
+    _session = True
+
+
+def end_session():
+    global _session
+
+    _session = False
+
+
+def begin_import():
+    """Importers start fresh unless they run inside a session."""
+
+    if not _session:
+        reset()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start", "child")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.start = 0.0
+        self.child = 0.0
+
+    def __enter__(self):
+        if enabled:
+            _stack.append(self)
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.start == 0.0:
+            return False
+        duration = time.perf_counter() - self.start
+        if _stack and _stack[-1] is self:
+            _stack.pop()
+            if _stack:
+                _stack[-1].child += duration
+        # self time excludes nested spans, so recursive spans (file parsing) are not counted twice
+        self_time = duration - self.child
+        stat = _spans.get(self.name)
+        if stat is None:
+            _spans[self.name] = [1, duration, self_time, duration]
+        else:
+            stat[0] += 1
+            stat[1] += duration
+            stat[2] += self_time
+            if duration > stat[3]:
+                stat[3] = duration
+        if len(_events) < max_events:
+            _events.append((self.name, self.start - _origin, duration, self.args))
+        return False
+
+
+def span(name, **args):
+    """Context manager timing the enclosed block under name."""
+
+    return _Span(name, args or None)
+
+
+def timed(name):
+    """Decorator form of span."""
+
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            with _Span(name, None):
+                return func(*args, **kwargs)
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    if enabled:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def set_value(name, value):
+    if enabled:
+        _counters[name] = value
+
+
+def cache_hit(cache_name):
+    if enabled:
+        stat = _caches.get(cache_name)
+        if stat is None:
+            _caches[cache_name] = [1, 0]
+        else:
+            stat[0] += 1
+
+
+def cache_miss(cache_name):
+    if enabled:
+        stat = _caches.get(cache_name)
+        if stat is None:
+            _caches[cache_name] = [0, 1]
+        else:
+            stat[1] += 1
+
+
+def cache_lookup(cache_name, value):
+    """Record a hit if value is not None, otherwise a miss. Returns value."""
+
+    if value is None:
+        cache_miss(cache_name)
+    else:
+        cache_hit(cache_name)
+    return value
+
+
+def summary():
+    spans = {}
+    for name, (calls, total, self_time, longest) in _spans.items():
+        spans[name] = {
+            "count": calls,
+            "total": round(total, 6),
+            "self": round(self_time, 6),
+            "mean": round(total / calls, 6),
+            "max": round(longest, 6),
+        }
+
+    caches = {}
+    for name, (hits, misses) in _caches.items():
+        lookups = hits + misses
+        caches[name] = {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    return {
+        "elapsed": round(time.perf_counter() - _origin, 6),
+        "spans": spans,
+        "counters": dict(_counters),
+        "caches": caches,
+        "events_recorded": len(_events),
+        "events_dropped": max(sum(s[0] for s in _spans.values()) - len(_events), 0),
+    }
+
+
+def chrome_trace():
+    """Events in Chrome trace event format (chrome://tracing, Perfetto)."""
+
+    pid = os.getpid()
+    trace_events = []
+    for name, start, duration, args in _events:
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": round(start * 1e6, 3),
+            "dur": round(duration * 1e6, 3),
+            "pid": pid,
+            "tid": 0,
+        }
+        if args:
+            event["args"] = {k: str(v) for k, v in args.items()}
+        trace_events.append(event)
+    for name, value in _counters.items():
+        trace_events.append({"name": name, "ph": "C", "ts": 0, "pid": pid, "args": {"value": value}})
+    return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+
+def write_json(filepath):
+    with open(filepath, mode='w', encoding='utf-8') as file:
+        json.dump(summary(), file, indent=4)
+    return filepath
+
+
+def write_chrome_trace(filepath):
+    with open(filepath, mode='w', encoding='utf-8') as file:
+        json.dump(chrome_trace(), file)
+    return filepath
+
+
+def write(filepath):
+    """Write the JSON summary to filepath and the Chrome trace next to it."""
+
+    write_json(filepath)
+    trace_file = f"{os.path.splitext(filepath)[0]}.trace.json"
+    write_chrome_trace(trace_file)
+    return filepath, trace_file
+
+
+def report_lines():
+    """Short, sorted per-stage report for log output."""
+
+    lines = []
+    for name, (calls, total, self_time, longest) in sorted(_spans.items(), key=lambda i: i[1][2], reverse=True):
+        lines.append(f"{name:<20} {self_time:10.4f}s self {total:10.4f}s total  x{calls}")
+    for name, (hits, misses) in sorted(_caches.items()):
+        lines.append(f"cache {name:<14} {hits} hits / {misses} misses")
+    for name, value in sorted(_counters.items()):
+        lines.append(f"{name:<20} {value}")
+    return lines
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Render LDraw GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+
+LPub3D Render LDraw Farm
+
+This file defines a local, multi-process render coordinator.
+
+A batch of render jobs is distributed over N background Blender worker
+processes, each limited to a fixed number of render threads. Jobs are
+dispatched most expensive first (estimated from part count and output
+resolution), failed jobs are retried and a JSON summary with per-job
+timings is returned. Everything runs locally - no queue service is used.
+
+Batch file format (JSON):
+    {
+        "workers": 4,               # optional, 0 = automatic
+        "threads": 2,               # optional, render threads per worker, 0 = automatic
+        "retries": 1,               # optional, additional attempts per failed job
+        "timeout": 0,               # optional, seconds per attempt, 0 = no limit
+        "summary_file": "",         # optional, defaults to <batch file>_summary.json
+        "jobs": [
+            {
+                "model_file": "<path>/model.ldr",
+                "image_file": "<path>/model.png",
+                "preferences_file": "<path>/ImportOptions.json",
+                "use_ldraw_import_mm": true,
+                "resolution_width": 800,
+                "resolution_height": 600,
+                "render_percentage": 100,
+                "trace_file": "<path>/model_trace.json"    # optional, stage timings
+            }
+        ]
+    }
+
+To Run (standalone):
+    python renderfarm.py <batch file> [<blender executable>]
+"""
+
+import os
+import sys
+import json
+import time
+import datetime
+import tempfile
+import subprocess
+
+# Operator properties forwarded from a job to the worker render operator
+job_properties = (
+    "model_file",
+    "image_file",
+    "preferences_file",
+    "blend_file",
+    "use_ldraw_import_mm",
+    "resolution_width",
+    "resolution_height",
+    "render_percentage",
+    "render_draft",
+    "draft_engine",
+    "draft_percentage",
+    "draft_samples",
+    "trace_file",
+    "verbose",
+)
+
+
+def farm_print(message, is_error=False):
+    """Print output with identification timestamp."""
+
+    timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-4]
+
+    message = f"{timestamp} [renderfarm] {message}"
+
+    if is_error:
+        sys.stderr.write(f"{message}\n")
+        sys.stderr.flush()
+    else:
+        sys.stdout.write(f"{message}\n")
+        sys.stdout.flush()
+
+
+def blender_binary_path():
+    """Return the running Blender executable, if any."""
+
+    try:
+        import bpy
+        return bpy.app.binary_path
+    except ImportError:
+        return None
+
+
+def count_parts(model_file):
+    """Cheap part count estimate - the number of type 1 lines in the model file."""
+
+    count = 0
+    try:
+        with open(model_file, mode='r', encoding='utf-8', errors='ignore') as file:
+            for line in file:
+                if line.lstrip().startswith("1 "):
+                    count += 1
+    except OSError:
+        pass
+    return count
+
+
+class RenderJob:
+    """A single model render request and its outcome."""
+
+    def __init__(self, index, settings):
+        self.index = index
+        self.settings = settings
+        self.model_file = settings.get("model_file", "")
+        self.image_file = settings.get("image_file", "")
+        if self.image_file == "" and self.model_file != "":
+            self.image_file = self.model_file + ".png"
+            self.settings["image_file"] = self.image_file
+
+        self.part_count = count_parts(self.model_file)
+        width = settings.get("resolution_width", 800)
+        height = settings.get("resolution_height", 600)
+        percentage = settings.get("render_percentage", 100)
+        pixels = width * height * (percentage / 100.0) ** 2
+        # render time grows with both scene size and sample count (pixels)
+        self.cost = max(self.part_count, 1) * max(pixels, 1.0)
+
+        self.attempts = 0
+        self.status = "pending"
+        self.elapsed = []
+        self.worker = None
+        self.log_file = None
+        self.return_code = None
+
+    def python_expr(self):
+        """Python expression executed by the background worker."""
+
+        kwargs = {k: self.settings[k] for k in job_properties if k in self.settings}
+        kwargs["cli_render"] = True
+        kwargs["load_ldraw_model"] = True
+        args = ", ".join(f"{k}={v!r}" for k, v in kwargs.items())
+        return f"import bpy; bpy.ops.render_scene.lpub3d_render_ldraw('EXEC_DEFAULT', {args})"
+
+    def summary(self):
+        return {
+            "index": self.index,
+            "model_file": self.model_file,
+            "image_file": self.image_file,
+            "part_count": self.part_count,
+            "cost": self.cost,
+            "status": self.status,
+            "attempts": self.attempts,
+            "worker": self.worker,
+            "return_code": self.return_code,
+            "elapsed": round(sum(self.elapsed), 3),
+            "attempt_elapsed": [round(e, 3) for e in self.elapsed],
+            "log_file": self.log_file,
+        }
+
+
+class RenderFarm:
+    """Dispatch render jobs to a pool of background Blender processes."""
+
+    poll_interval = 0.1
+
+    def __init__(self, jobs, workers=0, threads=0, retries=1, timeout=0, blender=None, log_directory=None):
+        self.jobs = [RenderJob(i, dict(job)) for i, job in enumerate(jobs)]
+        self.blender = blender or blender_binary_path()
+        self.retries = max(retries, 0)
+        self.timeout = timeout
+        self.log_directory = log_directory or tempfile.mkdtemp(prefix="renderfarm_")
+
+        cpu_count = os.cpu_count() or 1
+        if workers <= 0:
+            if threads > 0:
+                workers = cpu_count // threads
+            else:
+                workers = cpu_count // 2
+        workers = max(1, min(workers, len(self.jobs)))
+        if threads <= 0:
+            threads = max(1, cpu_count // workers)
+        self.workers = workers
+        self.threads = threads
+
+    def command(self, job):
+        return [
+            self.blender,
+            "--background",
+            "--threads", str(self.threads),
+            "--python-exit-code", "1",
+            "--python-expr", job.python_expr(),
+        ]
+
+    def __start(self, job, worker):
+        job.attempts += 1
+        job.status = "running"
+        job.worker = worker
+        job.log_file = os.path.join(self.log_directory, f"job_{job.index:04d}_{job.attempts}.log")
+        if os.path.exists(job.image_file):
+            os.remove(job.image_file)
+        log = open(job.log_file, mode='w', encoding='utf-8')
+        try:
+            process = subprocess.Popen(self.command(job), stdout=log, stderr=subprocess.STDOUT)
+        except Exception:
+            log.close()
+            raise
+        return process, log, time.perf_counter()
+
+    def __finish(self, job, process, log, start_time, timed_out=False):
+        log.close()
+        job.elapsed.append(time.perf_counter() - start_time)
+        job.return_code = process.returncode
+        if not timed_out and process.returncode == 0 and os.path.exists(job.image_file):
+            job.status = "success"
+        elif job.attempts <= self.retries:
+            job.status = "retry"
+        else:
+            job.status = "timeout" if timed_out else "failed"
+        farm_print(f"Job {job.index} {job.status} on worker {job.worker} "
+                   f"(attempt {job.attempts}, {job.elapsed[-1]:.3f}s): {os.path.basename(job.model_file)}",
+                   is_error=job.status in ("failed", "timeout"))
+
+    def run(self):
+        """Render all jobs, returning the summary dict."""
+
+        if not self.blender:
+            raise ValueError("Blender executable not specified.")
+
+        start_time = time.perf_counter()
+        farm_print(f"Rendering {len(self.jobs)} jobs on {self.workers} workers x {self.threads} threads")
+
+        # longest processing time first - expensive jobs start early so
+        # cheap ones fill the gaps at the end of the batch
+        pending = sorted(self.jobs, key=lambda j: j.cost, reverse=True)
+        running = {}
+        free_workers = list(range(self.workers))
+
+        while pending or running:
+            while pending and free_workers:
+                worker = free_workers.pop(0)
+                job = pending.pop(0)
+                running[worker] = (job,) + self.__start(job, worker)
+
+            time.sleep(self.poll_interval)
+
+            for worker, (job, process, log, job_start) in list(running.items()):
+                timed_out = False
+                if process.poll() is None:
+                    if self.timeout <= 0 or time.perf_counter() - job_start < self.timeout:
+                        continue
+                    process.kill()
+                    process.wait()
+                    timed_out = True
+                self.__finish(job, process, log, job_start, timed_out)
+                del running[worker]
+                free_workers.append(worker)
+                if job.status == "retry":
+                    pending.append(job)
+
+        elapsed = time.perf_counter() - start_time
+        succeeded = sum(1 for job in self.jobs if job.status == "success")
+        farm_print(f"Rendered {succeeded} of {len(self.jobs)} jobs. Elapsed Time: {elapsed:.3f}s")
+
+        return {
+            "workers": self.workers,
+            "threads": self.threads,
+            "retries": self.retries,
+            "job_count": len(self.jobs),
+            "succeeded": succeeded,
+            "failed": len(self.jobs) - succeeded,
+            "elapsed": round(elapsed, 3),
+            "busy_time": round(sum(sum(job.elapsed) for job in self.jobs), 3),
+            "log_directory": self.log_directory,
+            "jobs": [job.summary() for job in self.jobs],
+        }
+
+
+def render_batch(batch_file, blender=None, workers=None, threads=None):
+    """Render the jobs in batch_file and write the JSON summary next to it."""
+
+    with open(batch_file, mode='r', encoding='utf-8') as file:
+        batch = json.load(file)
+
+    if isinstance(batch, list):
+        batch = {"jobs": batch}
+
+    farm = RenderFarm(
+        batch.get("jobs", []),
+        workers=workers or batch.get("workers", 0),
+        threads=threads or batch.get("threads", 0),
+        retries=batch.get("retries", 1),
+        timeout=batch.get("timeout", 0),
+        blender=blender,
+    )
+    summary = farm.run()
+
+    summary_file = batch.get("summary_file") or f"{os.path.splitext(batch_file)[0]}_summary.json"
+    with open(summary_file, mode='w', encoding='utf-8') as file:
+        json.dump(summary, file, indent=4)
+    summary["summary_file"] = summary_file
+    farm_print(f"Summary written to {summary_file}")
+
+    return summary
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        farm_print("Usage: python renderfarm.py <batch file> [<blender executable>]", is_error=True)
+        sys.exit(2)
+    try:
+        result = render_batch(sys.argv[1], blender=sys.argv[2] if len(sys.argv) > 2 else None)
+    except ValueError as e:
+        farm_print(str(e), is_error=True)
+        sys.exit(2)
+    sys.exit(0 if result["failed"] == 0 else 1)
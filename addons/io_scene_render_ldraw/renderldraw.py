@@ -36,6 +36,9 @@ from io_scene_import_ldraw import importldraw
 from io_scene_import_ldraw_mm import operator_import
 from io_scene_import_ldraw_mm import filesystem
 from .modelglobals import model_globals
+from .modelglobals import instrumentation
+from .modelglobals import caches
+from . import renderfarm
 from bpy.props import (StringProperty,
                        IntProperty,
                        EnumProperty,
@@ -131,6 +134,8 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
 
     temp_image_file = None
     task_status     = None
+    draft_state     = None
+    draft_material  = "LDrawDraftMaterial"
 
     # Define variables to register
     _start_time = None
@@ -248,6 +253,37 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
         default=prefs.get('verbose', True)
     )
 
+    render_draft: BoolProperty(
+        name="Draft Preview",
+        description="Render a quick, reduced resolution preview using simplified shading",
+        default=prefs.get('renderdraft', False) if use_ldraw_import else prefs.get('render_draft', False)
+    )
+
+    draft_engine: EnumProperty(
+        name="Draft Engine",
+        description="Render engine used for draft preview renders",
+        default=prefs.get('draftengine', 'workbench') if use_ldraw_import else prefs.get('draft_engine', 'workbench'),
+        items=(
+            ("workbench", "Workbench", "Solid shading using object colours - fastest."),
+            ("eevee", "EEVEE", "Low sample EEVEE render with a single simplified material."),
+        )
+    )
+
+    draft_percentage: IntProperty(
+        name="Draft Percentage",
+        description="Specify the percentage of the render size used for draft preview renders",
+        default=prefs.get('draftpercentage', 50) if use_ldraw_import else prefs.get('draft_percentage', 50),
+        min=1,
+        max=100
+    )
+
+    draft_samples: IntProperty(
+        name="Draft Samples",
+        description="Specify the number of EEVEE render samples used for draft preview renders",
+        default=prefs.get('draftsamples', 16) if use_ldraw_import else prefs.get('draft_samples', 16),
+        min=1
+    )
+
     load_ldraw_model: BoolProperty(
         name="Load LDraw Model",
         description="Specify whether to load the specified LDraw model before rendering - default is True).",
@@ -286,6 +322,26 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
         options={'HIDDEN'}
     )
 
+    batch_file: StringProperty(
+        default=r"",
+        options={'HIDDEN'}
+    )
+
+    batch_workers: IntProperty(
+        default=0,
+        options={'HIDDEN'}
+    )
+
+    batch_threads: IntProperty(
+        default=0,
+        options={'HIDDEN'}
+    )
+
+    trace_file: StringProperty(
+        default=r"",
+        options={'HIDDEN'}
+    )
+
     # File type filter in file browser
     filename_ext = ".png"
     filter_glob: StringProperty(
@@ -316,6 +372,7 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
         bpy.app.handlers.render_complete.remove(self.completed)
         bpy.app.handlers.render_complete.remove(self.autocropImage)
         context.window_manager.event_timer_remove(self._timer)
+        self.restoreDraftRender()
 
     # Print function
     def debugPrint(self, message):
@@ -354,10 +411,116 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
 
         now = time.time()
 
+        render_type = "draft" if self.draft_state is not None else "image"
         if self.task_status is not None:
             self.report({'ERROR'}, f"{self.task_status}. Elapsed Time: {format_elapsed(now - self._start_time)}")
         else:
-            render_print(f"SUCCESS: {os.path.basename(self.image_file)} rendered. Elapsed Time: {format_elapsed(now - self._start_time)}")
+            render_print(f"SUCCESS: {os.path.basename(self.image_file)} {render_type} rendered. Elapsed Time: {format_elapsed(now - self._start_time)}")
+
+    def getDraftMaterial(self):
+        """Single material coloured by the object colour attribute"""
+
+        material = bpy.data.materials.get(self.draft_material)
+        if material is None:
+            material = bpy.data.materials.new(self.draft_material)
+            material.use_nodes = True
+            nodes = material.node_tree.nodes
+            links = material.node_tree.links
+            shader = nodes.get("Principled BSDF")
+            attribute = nodes.new('ShaderNodeAttribute')
+            attribute.location = (-300, 300)
+            attribute.attribute_type = 'OBJECT'
+            attribute.attribute_name = 'color'
+            links.new(attribute.outputs['Color'], shader.inputs['Base Color'])
+            links.new(attribute.outputs['Alpha'], shader.inputs['Alpha'])
+        return material
+
+    def setupDraftRender(self, scene):
+        """Switch the scene to a fast preview setup, keeping what is needed to restore it."""
+
+        render = scene.render
+        state = {
+            'engine': render.engine,
+            'resolution_percentage': render.resolution_percentage,
+            'use_simplify': render.use_simplify,
+            'hide_render': [],
+            'show_render': [],
+        }
+
+        render.resolution_percentage = max(1, (render.resolution_percentage * self.draft_percentage) // 100)
+
+        # Skip environment and modifier evaluation - the scene is left intact for the final render
+        for obj in scene.objects:
+            if obj.name.startswith("LegoGroundPlane") and not obj.hide_render:
+                obj.hide_render = True
+                state['hide_render'].append(obj.name)
+            for modifier in getattr(obj, "modifiers", []):
+                if modifier.type in {'BEVEL', 'EDGE_SPLIT'} and modifier.show_render:
+                    modifier.show_render = False
+                    state['show_render'].append((obj.name, modifier.name))
+
+        if self.draft_engine == 'eevee':
+            engines = [item.identifier for item in bpy.types.RenderSettings.bl_rna.properties['engine'].enum_items]
+            render.engine = 'BLENDER_EEVEE_NEXT' if 'BLENDER_EEVEE_NEXT' in engines else 'BLENDER_EEVEE'
+            state['taa_render_samples'] = scene.eevee.taa_render_samples
+            scene.eevee.taa_render_samples = self.draft_samples
+            render.use_simplify = True
+            if self.use_ldraw_import_mm:
+                # mm import sets obj.color so one material can colour every part
+                state['material_override'] = bpy.context.view_layer.material_override
+                bpy.context.view_layer.material_override = self.getDraftMaterial()
+        else:
+            render.engine = 'BLENDER_WORKBENCH'
+            shading = scene.display.shading
+            state['light'] = shading.light
+            state['color_type'] = shading.color_type
+            state['render_aa'] = scene.display.render_aa
+            shading.light = 'STUDIO'
+            shading.color_type = 'OBJECT' if self.use_ldraw_import_mm else 'MATERIAL'
+            scene.display.render_aa = 'FXAA'
+
+        self.draft_state = state
+        self.debugPrint(f"Draft render: {render.engine} at {render.resolution_percentage}%")
+
+    def restoreDraftRender(self):
+        """Restore the scene settings changed for a draft render."""
+
+        state = self.draft_state
+        if state is None:
+            return
+
+        scene = bpy.context.scene
+        render = scene.render
+        render.engine = state['engine']
+        render.resolution_percentage = state['resolution_percentage']
+        render.use_simplify = state['use_simplify']
+        if 'taa_render_samples' in state:
+            scene.eevee.taa_render_samples = state['taa_render_samples']
+        if 'material_override' in state:
+            bpy.context.view_layer.material_override = state['material_override']
+        if 'light' in state:
+            scene.display.shading.light = state['light']
+            scene.display.shading.color_type = state['color_type']
+            scene.display.render_aa = state['render_aa']
+        for name in state['hide_render']:
+            obj = bpy.data.objects.get(name)
+            if obj is not None:
+                obj.hide_render = False
+        for name, modifier_name in state['show_render']:
+            obj = bpy.data.objects.get(name)
+            if obj is not None and modifier_name in obj.modifiers:
+                obj.modifiers[modifier_name].show_render = True
+
+        self.draft_state = None
+
+    def modelLoaded(self):
+        """Is the requested model already imported in this session?"""
+
+        if not model_globals.LDRAW_MODEL_LOADED:
+            return False
+        if not self.cli_render or self.model_file == "":
+            return True
+        return os.path.abspath(self.model_file) == os.path.abspath(model_globals.LDRAW_MODEL_FILE)
 
     # Render function
     def performRenderTask(self):
@@ -410,9 +573,22 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
             active_scene.render.image_settings.file_format = "PNG"
             active_scene.render.filepath = self.image_file
 
+            if self.render_draft:
+                self.setupDraftRender(active_scene)
+            # end if
+
+            # the importer caches are not used by the render
+            freed = caches.release()
+            self.debugPrint(f"Released import caches: {freed / (1024 * 1024):.1f} MB")
+
             # Set display mode
+            # first render includes shader compilation, which scales with the material count
+            instrumentation.set_value("scene_materials", len(bpy.data.materials))
+
             if self.cli_render or not self.render_window:
-                bpy.ops.render.render('EXEC_DEFAULT', write_still=True)
+                with instrumentation.span("render", draft=self.render_draft):
+                    bpy.ops.render.render('EXEC_DEFAULT', write_still=True)
+                self.restoreDraftRender()
             else:
                 bpy.ops.render.render('INVOKE_DEFAULT', write_still=True)
             # end if
@@ -431,6 +607,10 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
         self.debugPrint(f"Overwrite_Image:     {self.overwrite_image}")
         self.debugPrint(f"Trans_Background:    {self.transparent_background}")
         self.debugPrint(f"Crop_Image:          {self.crop_image}")
+        self.debugPrint(f"Render_Draft:        {self.render_draft}")
+        if self.render_draft:
+            self.debugPrint(f"Draft_Engine:        {self.draft_engine}")
+            self.debugPrint(f"Draft_Percentage:    {self.draft_percentage}")
         if not self.cli_render:
             self.debugPrint(f"Render_Window:       {self.render_window}")
         if not self.blend_file == "":
@@ -510,6 +690,12 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
         box.prop(self, "add_environment")
         box.prop(self, "transparent_background")
         box.prop(self, "crop_image")
+        box.prop(self, "render_draft")
+        if self.render_draft:
+            box.prop(self, "draft_engine", expand=True)
+            box.prop(self, "draft_percentage")
+            if self.draft_engine == 'eevee':
+                box.prop(self, "draft_samples")
         box.prop(self, "verbose")
 
     def invoke(self, context, event):
@@ -596,32 +782,49 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
             self.report({'ERROR'}, 'The RenderLDraw addon requires Blender 2.82 or greater.')
             return {'FINISHED'}
 
+        # Render a batch of jobs on local background worker processes
+        if self.batch_file:
+            self.debugPrint("-------------------------")
+            self.debugPrint(f"Performing Batch Render Task: {self.batch_file}")
+            self.debugPrint("-------------------------")
+            summary = renderfarm.render_batch(self.batch_file, workers=self.batch_workers, threads=self.batch_threads)
+            if summary["failed"] > 0:
+                self.report({'ERROR'}, f"ERROR - {summary['failed']} of {summary['job_count']} batch jobs failed. See {summary['summary_file']}")
+            return {'FINISHED'}
+
         self.use_ldraw_import = not bool(self.use_ldraw_import_mm)
 
         self.debugPrint("-------------------------")
         if self.cli_render:
             self.debugPrint("Performing Headless Render Task...")
             self.debugPrint("-------------------------")
+            if self.trace_file:
+                # Record import and render stages in one trace
+                instrumentation.begin_session()
 
         preferences_file = ""
         if self.use_ldraw_import_mm:
             preferences_folder = os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)),
                                                  '..', 'io_scene_import_ldraw_mm', 'config'))
             preferences_file = os.path.join(preferences_folder, 'ImportOptions.json')
-            if model_globals.LDRAW_MODEL_LOADED:
+            if self.modelLoaded():
                 self.load_ldraw_model = False
                 RenderLDrawOps.prefs  = operator_import.ImportSettings.get_settings()
         elif self.use_ldraw_import:
             preferences_folder = os.path.abspath(os.path.join(os.path.dirname(os.path.realpath(__file__)),
                                                  '..', 'io_scene_import_ldraw', 'config'))
             preferences_file = os.path.join(preferences_folder, 'ImportLDrawPreferences.ini')
-            if model_globals.LDRAW_MODEL_LOADED:
+            if self.modelLoaded():
                 self.load_ldraw_model = False
                 RenderLDrawOps.prefs  = importldraw.Preferences("")
 
         if not self.load_ldraw_model:
+            if self.cli_render:
+                # Model already imported in this session (e.g. draft then final render) - reuse it
+                self.debugPrint(f"Reusing loaded model {os.path.basename(model_globals.LDRAW_MODEL_FILE)} - import skipped")
+            else:
+                self.image_file   = model_globals.LDRAW_IMAGE_FILE
             self.model_file       = model_globals.LDRAW_MODEL_FILE
-            self.image_file       = model_globals.LDRAW_IMAGE_FILE
             self.preferences_file = preferences_file
 
         self.debugPrint(f"Preferences_File:    {self.preferences_file}")
@@ -745,6 +948,11 @@ class RenderLDrawOps(bpy.types.Operator, ImportHelper):
                 # Cleanup handler
                 bpy.app.handlers.render_complete.remove(self.autocropImage)
 
+            if self.trace_file:
+                summary_file, trace_file = instrumentation.write(self.trace_file)
+                instrumentation.end_session()
+                self.debugPrint(f"Trace written to {summary_file} and {trace_file}")
+
             return {'FINISHED'}
 
         self.setImportLDrawPreferences()
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Addon Startup Benchmark
+
+Starts a fresh background Blender for each measurement and enables the LDraw
+addons, reporting the process wall time, the time spent enabling each addon,
+which addon submodules were imported and whether registration created any
+temporary files. Registration should only register operators and properties,
+library discovery and the importer modules load when an import first runs.
+Run it before and after a change to compare startup cost.
+
+To Run:
+    <Blender Path>/blender --background --python benchmarks/benchmark_addon_startup.py -- <arguments>
+- Arguments
+    -r, --repeat         Blender launches per measurement, default 5
+    -o, --output         JSON results file, printed if not specified
+"""
+
+import sys
+import json
+import time
+import statistics
+import subprocess
+
+from pathlib import Path
+
+import bpy
+
+sys.path.append(str(Path(__file__).parent))
+
+import benchmark_utils as utils
+
+ADDONS = ("io_scene_render_ldraw", "io_scene_import_ldraw", "io_scene_import_ldraw_mm")
+
+RESULT_PREFIX = "[startup] "
+
+# runs in the child Blender, enables the addons in turn and prints one result line
+ENABLE_SCRIPT = """
+import os, sys, json, time, tempfile, addon_utils
+addons = {addons!r}
+packages = ("io_scene_render_ldraw", "io_scene_import_ldraw", "io_scene_import_ldraw_mm")
+temp_dir = tempfile.gettempdir()
+temp_before = set(os.listdir(temp_dir))
+enable = {{}}
+for addon in addons:
+    start = time.perf_counter()
+    addon_utils.enable(addon, default_set=False)
+    enable[addon] = time.perf_counter() - start
+legacy_loader = sys.modules.get("io_scene_import_ldraw.loadldraw.loadldraw")
+print({prefix!r} + json.dumps({{
+    "enable": enable,
+    "modules": sorted(name for name in sys.modules if name.split(".")[0] in packages),
+    "loadldraw_executed": legacy_loader is not None and type(legacy_loader).__name__ != "_LazyModule",
+    "temp_files": len(set(os.listdir(temp_dir)) - temp_before),
+}}), flush=True)
+"""
+
+
+def launch(addons):
+    command = [bpy.app.binary_path, "--background", "--factory-startup", "--python-expr",
+               ENABLE_SCRIPT.format(addons=tuple(addons), prefix=RESULT_PREFIX)]
+    start = time.perf_counter()
+    process = subprocess.run(command, capture_output=True, text=True)
+    wall_time = time.perf_counter() - start
+
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+            result["wall_time"] = wall_time
+            return result
+
+    utils.benchmark_print(f"No result from Blender for {addons or 'no addons'}:\n{process.stderr}")
+    return None
+
+
+def measure(addons, repeat):
+    runs = [result for result in (launch(addons) for _ in range(repeat)) if result is not None]
+    if not runs:
+        return {}
+    return {
+        "wall_time": round(statistics.median(run["wall_time"] for run in runs), 4),
+        "enable": {addon: round(statistics.median(run["enable"][addon] for run in runs), 4) for addon in addons},
+        "modules": len(runs[-1]["modules"]),
+        "module_names": runs[-1]["modules"],
+        "loadldraw_executed": runs[-1]["loadldraw_executed"],
+        "temp_files": max(run["temp_files"] for run in runs),
+    }
+
+
+def main():
+    arg_parser = utils.argument_parser("Measure Blender startup with the LDraw addons enabled.")
+    arg_parser.add_argument("-r", "--repeat", type=int, default=5,
+                            help="Blender launches per measurement")
+    arg_parser.add_argument("-o", "--output", default="",
+                            help="JSON results file")
+    options = arg_parser.parse_args()
+
+    results = {"repeat": options.repeat}
+
+    utils.benchmark_print("Starting Blender without the LDraw addons")
+    results["baseline"] = measure((), options.repeat)
+    for addon in ADDONS:
+        utils.benchmark_print(f"Starting Blender with {addon}")
+        results[addon] = measure((addon,), options.repeat)
+    utils.benchmark_print("Starting Blender with all LDraw addons")
+    results["all"] = measure(ADDONS, options.repeat)
+
+    utils.write_results(options.output, results)
+
+
+if __name__ == '__main__':
+    main()
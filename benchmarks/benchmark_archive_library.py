@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Archive Library Benchmark
+
+Imports the same grid model with LDraw MM from an unpacked LDraw library and
+from a folder holding the zipped library (complete.zip and any unofficial
+archive), reporting import and file resolution times. The archive is indexed
+from its central directory and members are decompressed when first read, so
+repeated imports from the archive are served from the decoded text cache.
+
+To Run:
+    <Blender Path>/blender --background --python benchmarks/benchmark_archive_library.py -- <arguments>
+- Arguments
+    -l, --ldraw_path     Unpacked LDraw library path
+    -a, --archive_path   Folder containing complete.zip
+    -n, --parts          Part count, default 1000
+    -r, --repeat         Imports per library, default 2
+    -o, --output         JSON results file, printed if not specified
+"""
+
+import os
+import sys
+
+from pathlib import Path
+
+import bpy
+
+sys.path.append(str(Path(__file__).parent))
+
+import benchmark_utils as utils
+
+GRID_PARTS = ("3001.dat", "3003.dat", "3020.dat", "3062b.dat", "3069b.dat", "4073.dat")
+
+
+def import_grid(model_file, ldraw_path, use_archive_library):
+    from io_scene_render_ldraw.modelglobals import instrumentation
+
+    utils.reset_scene()
+    import_time, result = utils.timed(
+        bpy.ops.import_scene.lpub3d_import_ldraw_mm,
+        'EXEC_DEFAULT',
+        filepath=model_file,
+        ldraw_path=ldraw_path,
+        studio_ldraw_path="",
+        use_archive_library=use_archive_library,
+        add_environment=False,
+        position_camera=False,
+    )
+    summary = instrumentation.summary()
+    spans = summary["spans"]
+    return {
+        "import_time": round(import_time, 4),
+        "objects": len(bpy.data.objects),
+        "missing_files": summary["counters"].get("missing_files", 0),
+        "file_resolution": spans.get("file_resolution", {}).get("total", 0.0),
+        "archive_index": spans.get("archive_index", {}).get("total", 0.0),
+        "archive_decompress": spans.get("archive_decompress", {}).get("total", 0.0),
+        "archive_text": summary["caches"].get("archive_text", {}),
+    }
+
+
+def main():
+    arg_parser = utils.argument_parser("Compare importing from an unpacked and a zipped LDraw library.")
+    arg_parser.add_argument("-l", "--ldraw_path", default=os.environ.get('LDRAW_DIRECTORY', ""),
+                            help="Unpacked LDraw library path")
+    arg_parser.add_argument("-a", "--archive_path", required=True,
+                            help="Folder containing complete.zip")
+    arg_parser.add_argument("-n", "--parts", type=int, default=1000,
+                            help="Part count")
+    arg_parser.add_argument("-r", "--repeat", type=int, default=2,
+                            help="Imports per library")
+    arg_parser.add_argument("-o", "--output", default="",
+                            help="JSON results file")
+    options = arg_parser.parse_args()
+
+    utils.enable_addon("io_scene_render_ldraw")
+    utils.enable_addon("io_scene_import_ldraw_mm")
+    from io_scene_import_ldraw_mm.definitions import APP_ROOT
+    from io_scene_import_ldraw_mm.import_settings import ImportSettings
+
+    model_file = utils.write_grid_model(utils.temp_model_file(f"benchmark_archive_{options.parts}.ldr"),
+                                        options.parts, parts=GRID_PARTS)
+
+    results = {"parts": options.parts, "unpacked": [], "archive": []}
+    with utils.PreservedFile(os.path.join(APP_ROOT, ImportSettings.settings_path)):
+        for run in range(options.repeat):
+            if options.ldraw_path:
+                utils.benchmark_print(f"Import {run + 1} from unpacked library {options.ldraw_path}")
+                results["unpacked"].append(import_grid(model_file, options.ldraw_path, False))
+            utils.benchmark_print(f"Import {run + 1} from archive library {options.archive_path}")
+            results["archive"].append(import_grid(model_file, options.archive_path, True))
+
+    utils.write_results(options.output, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Cache Release Benchmark
+
+Imports a grid model with each importer, then reports the estimated size of
+every importer cache, the bytes released by the release hook the render
+addon calls before rendering, and the resident set size before and after.
+
+To Run:
+    <Blender Path>/blender --background --python benchmarks/benchmark_cache_release.py -- <arguments>
+- Arguments
+    -l, --ldraw_path     LDraw library path
+    -n, --parts          Part count, default 2000
+    -o, --output         JSON results file, printed if not specified
+"""
+
+import os
+import sys
+
+from pathlib import Path
+
+import bpy
+
+sys.path.append(str(Path(__file__).parent))
+
+import benchmark_utils as utils
+
+GRID_PARTS = ("3001.dat", "3003.dat", "3020.dat", "3062b.dat", "3069b.dat", "4073.dat")
+
+
+def import_and_release(importer, model_file, ldraw_path):
+    from io_scene_render_ldraw.modelglobals import caches
+
+    utils.reset_scene()
+    if importer == "mm":
+        import_time, result = utils.timed(bpy.ops.import_scene.lpub3d_import_ldraw_mm, 'EXEC_DEFAULT',
+                                          filepath=model_file, ldraw_path=ldraw_path,
+                                          add_environment=False, position_camera=False)
+    else:
+        import_time, result = utils.timed(bpy.ops.import_scene.lpub3d_import_ldraw, 'EXEC_DEFAULT',
+                                          filepath=model_file, ldrawPath=ldraw_path,
+                                          addEnvironment=False, positionCamera=False)
+
+    cache_sizes = {name: size for name, size in caches.sizes().items() if size}
+    rss_before = utils.current_rss()
+    release_time, freed = utils.timed(caches.release)
+    return {
+        "import_time": round(import_time, 4),
+        "cache_sizes": cache_sizes,
+        "bytes_freed": freed,
+        "release_time": round(release_time, 4),
+        "rss_before_release": rss_before,
+        "rss_after_release": utils.current_rss(),
+    }
+
+
+def main():
+    arg_parser = utils.argument_parser("Measure importer cache sizes and the memory released before rendering.")
+    arg_parser.add_argument("-l", "--ldraw_path", default=os.environ.get('LDRAW_DIRECTORY', ""),
+                            help="LDraw library path")
+    arg_parser.add_argument("-n", "--parts", type=int, default=2000,
+                            help="Part count")
+    arg_parser.add_argument("-o", "--output", default="",
+                            help="JSON results file")
+    options = arg_parser.parse_args()
+
+    utils.enable_addon("io_scene_render_ldraw")
+    utils.enable_addon("io_scene_import_ldraw")
+    utils.enable_addon("io_scene_import_ldraw_mm")
+    from io_scene_import_ldraw_mm.definitions import APP_ROOT
+    from io_scene_import_ldraw_mm.import_settings import ImportSettings
+    import io_scene_import_ldraw
+
+    model_file = utils.write_grid_model(utils.temp_model_file(f"benchmark_release_{options.parts}.ldr"),
+                                        options.parts, parts=GRID_PARTS)
+    legacy_preferences = os.path.join(os.path.dirname(io_scene_import_ldraw.__file__),
+                                      "config", "ImportLDrawPreferences.ini")
+
+    results = {"parts": options.parts}
+    with utils.PreservedFile(os.path.join(APP_ROOT, ImportSettings.settings_path)), \
+         utils.PreservedFile(legacy_preferences):
+        utils.benchmark_print(f"Importing {options.parts} parts with LDraw MM")
+        results["mm"] = import_and_release("mm", model_file, options.ldraw_path)
+        utils.benchmark_print(f"Importing {options.parts} parts with Import LDraw")
+        results["legacy"] = import_and_release("legacy", model_file, options.ldraw_path)
+
+    utils.write_results(options.output, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Chunked Import Benchmark
+
+Imports a large grid model with the LDraw MM importer at each chunk size and
+reports the import time, the peak resident set size and how often part
+geometry had to be rebuilt. Peak memory only grows within a process, so each
+chunk size is imported by its own background Blender. A chunk size of 0
+imports in one pass.
+
+To Run:
+    <Blender Path>/blender --background --python benchmarks/benchmark_chunked_import.py -- <arguments>
+- Arguments
+    -l, --ldraw_path     LDraw library path
+    -n, --parts          Part count, default 50000
+    -c, --chunk_sizes    Parts per chunk, default 0 1000 5000
+    -o, --output         JSON results file, printed if not specified
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+from pathlib import Path
+
+import bpy
+
+sys.path.append(str(Path(__file__).parent))
+
+import benchmark_utils as utils
+
+GRID_PARTS = ("3001.dat", "3003.dat", "3020.dat", "3062b.dat", "3069b.dat", "4073.dat",
+              "3004.dat", "3010.dat", "3022.dat", "3023.dat", "3024.dat", "3039.dat")
+
+RESULT_PREFIX = "[chunked] "
+
+
+# runs in the child Blender started by launch
+def import_chunked(model_file, ldraw_path, chunk_size):
+    utils.enable_addon("io_scene_render_ldraw")
+    utils.enable_addon("io_scene_import_ldraw_mm")
+    from io_scene_render_ldraw.modelglobals import caches
+    from io_scene_render_ldraw.modelglobals import instrumentation
+    from io_scene_import_ldraw_mm.definitions import APP_ROOT
+    from io_scene_import_ldraw_mm.import_settings import ImportSettings
+
+    utils.reset_scene()
+    rss_before = utils.current_rss()
+    with utils.PreservedFile(os.path.join(APP_ROOT, ImportSettings.settings_path)):
+        import_time, result = utils.timed(bpy.ops.import_scene.lpub3d_import_ldraw_mm, 'EXEC_DEFAULT',
+                                          filepath=model_file, ldraw_path=ldraw_path,
+                                          add_environment=False, position_camera=False,
+                                          chunk_size=chunk_size)
+    counters = instrumentation.summary()["counters"]
+    return {
+        "chunk_size": chunk_size,
+        "objects": len(bpy.data.objects),
+        "import_time": round(import_time, 4),
+        "chunks": counters.get("chunks", 0),
+        "geometry_rebuilds": counters.get("geometry_rebuilds", 0),
+        "rss_before": rss_before,
+        "peak_rss": caches.peak_rss(),
+    }
+
+
+def launch(model_file, ldraw_path, chunk_size):
+    command = [bpy.app.binary_path, "--background", "--factory-startup", "--python", __file__, "--",
+               "--child", "--model_file", model_file, "--ldraw_path", ldraw_path,
+               "--chunk_sizes", str(chunk_size)]
+    process = subprocess.run(command, capture_output=True, text=True)
+
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+
+    utils.benchmark_print(f"No result from Blender for chunk size {chunk_size}:\n{process.stderr}")
+    return None
+
+
+def main():
+    arg_parser = utils.argument_parser("Measure peak memory of chunked LDraw MM imports.")
+    arg_parser.add_argument("-l", "--ldraw_path", default=os.environ.get('LDRAW_DIRECTORY', ""),
+                            help="LDraw library path")
+    arg_parser.add_argument("-n", "--parts", type=int, default=50000,
+                            help="Part count")
+    arg_parser.add_argument("-c", "--chunk_sizes", type=int, nargs="+", default=[0, 1000, 5000],
+                            help="Parts per chunk")
+    arg_parser.add_argument("-o", "--output", default="",
+                            help="JSON results file")
+    arg_parser.add_argument("--model_file", default="",
+                            help="Model to import, used by the child Blender")
+    arg_parser.add_argument("--child", action="store_true",
+                            help="Import once and print the result, used by the child Blender")
+    options = arg_parser.parse_args()
+
+    if options.child:
+        result = import_chunked(options.model_file, options.ldraw_path, options.chunk_sizes[0])
+        print(RESULT_PREFIX + json.dumps(result), flush=True)
+        return
+
+    model_file = utils.write_grid_model(utils.temp_model_file(f"benchmark_chunked_{options.parts}.ldr"),
+                                        options.parts, parts=GRID_PARTS)
+
+    results = []
+    for chunk_size in options.chunk_sizes:
+        utils.benchmark_print(f"Importing {options.parts} parts in chunks of {chunk_size or 'all'}")
+        result = launch(model_file, options.ldraw_path, chunk_size)
+        if result is not None:
+            results.append(result)
+
+    utils.write_results(options.output, {"parts": options.parts, "results": results})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+
+LPub3D Blender LDraw Group Lookup Benchmark
+
+Imports grid models whose parts sit in nested LeoCAD groups with the
+Import LDraw addon and reports the object creation time for each part count.
+Group nodes are found through a per-import index, so the time should grow
+linearly with the part count.
+
+To Run:
+    <Blender Path>/blender --background --python benchmarks/benchmark_group_lookup.py -- <arguments>
+- Arguments
+    -l, --ldraw_path     LDraw library path
+    -n, --parts          Part counts to import, default 1000 2000 4000
+    -g, --group_size     Parts per group, default 4
+    -d, --group_depth    Group nesting depth, default 2
+    -o, --output         JSON results file, printed if not specified
+"""
+
+import os
+import sys
+
+from pathlib import Path
+
+import bpy
+
+sys.path.append(str(Path(__file__).parent))
+
+import benchmark_utils as utils
+
+
+def benchmark_group_lookup(part_count, options):
+    from io_scene_render_ldraw.modelglobals import instrumentation
+
+    utils.reset_scene()
+    model_file = utils.write_grid_model(utils.temp_model_file(f"benchmark_groups_{part_count}.ldr"),
+                                        part_count, group_size=options.group_size,
+                                        group_depth=options.group_depth)
+    import_time, result = utils.timed(
+        bpy.ops.import_scene.lpub3d_import_ldraw,
+        'EXEC_DEFAULT',
+        filepath=model_file,
+        ldrawPath=options.ldraw_path,
+        addEnvironment=False,
+        positionCamera=False,
+    )
+    spans = instrumentation.summary()["spans"]
+    return {
+        "parts": part_count,
+        "objects": len(bpy.data.objects),
+        "group_objects": sum(1 for obj in bpy.data.objects if obj.type == 'EMPTY' and obj.name.startswith("Group ")),
+        "import_time": round(import_time, 4),
+        "create_objects_time": spans.get("create_objects", {}).get("total", 0.0),
+        "object_link_time": spans.get("object_link", {}).get("total", 0.0),
+    }
+
+
+def main():
+    arg_parser = utils.argument_parser("Time Import LDraw on models with nested groups.")
+    arg_parser.add_argument("-l", "--ldraw_path", default=os.environ.get('LDRAW_DIRECTORY', ""),
+                            help="LDraw library path")
+    arg_parser.add_argument("-n", "--parts", type=int, nargs="+", default=[1000, 2000, 4000],
+                            help="Part counts to import")
+    arg_parser.add_argument("-g", "--group_size", type=int, default=4,
+                            help="Parts per group")
+    arg_parser.add_argument("-d", "--group_depth", type=int, default=2,
+                            help="Group nesting depth")
+    arg_parser.add_argument("-o", "--output", default="",
+                            help="JSON results file")
+    options = arg_parser.parse_args()
+
+    utils.enable_addon("io_scene_render_ldraw")
+    utils.enable_addon("io_scene_import_ldraw")
+    import io_scene_import_ldraw
+
+    results = []
+    preferences_file = os.path.join(os.path.dirname(io_scene_import_ldraw.__file__), "config", "ImportLDrawPreferences.ini")
+    with utils.PreservedFile(preferences_file):
+        for part_count in options.parts:
+            utils.benchmark_print(f"Importing {part_count} parts in groups of {options.group_size}")
+            results.append(benchmark_group_lookup(part_count, options))
+
+    utils.write_results(options.output, {"group_size": options.group_size,
+                                         "group_depth": options.group_depth,
+                                         "results": results})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Object Naming Benchmark
+
+Creates instances of one mesh named after the mesh (every repeat collides
+and Blender resolves a .001 suffix) and with numbered unique names, reporting
+the time per batch of objects so growth with the instance count is visible.
+With an LDraw library path, the same instance count is also imported with
+LDraw MM and the per-object link time is read from the instrumentation.
+
+To Run:
+    <Blender Path>/blender --background --python benchmarks/benchmark_object_naming.py -- <arguments>
+- Arguments
+    -n, --instances      Instance count, default 20000
+    -b, --batch          Objects per timing batch, default 1000
+    -l, --ldraw_path     LDraw library path, import is skipped if not specified
+    -o, --output         JSON results file, printed if not specified
+"""
+
+import os
+import sys
+import time
+
+from pathlib import Path
+
+import bpy
+
+sys.path.append(str(Path(__file__).parent))
+
+import benchmark_utils as utils
+
+
+def create_objects(instances, batch, unique_names):
+    utils.reset_scene()
+    mesh = bpy.data.meshes.new("3001.dat_4")
+    mesh.from_pydata([(0, 0, 0), (1, 0, 0), (0, 1, 0)], [], [(0, 1, 2)])
+
+    batches = []
+    start = time.perf_counter()
+    batch_start = start
+    for i in range(instances):
+        if unique_names:
+            name = f"{i + 1:05d}_3001"
+        else:
+            name = mesh.name
+        bpy.data.objects.new(name, mesh)
+        if (i + 1) % batch == 0:
+            now = time.perf_counter()
+            batches.append(round(now - batch_start, 4))
+            batch_start = now
+
+    return {
+        "unique_names": unique_names,
+        "elapsed": round(time.perf_counter() - start, 4),
+        "batch_elapsed": batches,
+        "first_batch": batches[0] if batches else 0.0,
+        "last_batch": batches[-1] if batches else 0.0,
+    }
+
+
+def import_grid(instances, ldraw_path):
+    from io_scene_render_ldraw.modelglobals import instrumentation
+
+    utils.reset_scene()
+    model_file = utils.write_grid_model(utils.temp_model_file(f"benchmark_grid_{instances}.ldr"),
+                                        instances, parts=("3001.dat",))
+    import_time, result = utils.timed(
+        bpy.ops.import_scene.lpub3d_import_ldraw_mm,
+        'EXEC_DEFAULT',
+        filepath=model_file,
+        ldraw_path=ldraw_path,
+        add_environment=False,
+        position_camera=False,
+    )
+    summary = instrumentation.summary()
+    object_link = summary["spans"].get("object_link", {})
+    return {
+        "import_time": round(import_time, 4),
+        "objects": len(bpy.data.objects),
+        "object_link_total": object_link.get("total", 0.0),
+        "object_link_mean": object_link.get("mean", 0.0),
+        "object_link_max": object_link.get("max", 0.0),
+    }
+
+
+def main():
+    arg_parser = utils.argument_parser("Compare colliding and unique object names.")
+    arg_parser.add_argument("-n", "--instances", type=int, default=20000,
+                            help="Instance count")
+    arg_parser.add_argument("-b", "--batch", type=int, default=1000,
+                            help="Objects per timing batch")
+    arg_parser.add_argument("-l", "--ldraw_path", default=os.environ.get('LDRAW_DIRECTORY', ""),
+                            help="LDraw library path")
+    arg_parser.add_argument("-o", "--output", default="",
+                            help="JSON results file")
+    options = arg_parser.parse_args()
+
+    results = {"instances": options.instances, "batch": options.batch}
+
+    utils.benchmark_print(f"Creating {options.instances} objects with colliding names")
+    results["colliding"] = create_objects(options.instances, options.batch, False)
+    utils.benchmark_print(f"Creating {options.instances} objects with unique names")
+    results["unique"] = create_objects(options.instances, options.batch, True)
+
+    if options.ldraw_path:
+        utils.enable_addon("io_scene_render_ldraw")
+        utils.enable_addon("io_scene_import_ldraw_mm")
+        from io_scene_import_ldraw_mm.definitions import APP_ROOT
+        from io_scene_import_ldraw_mm.import_settings import ImportSettings
+
+        utils.benchmark_print(f"Importing {options.instances} part grid with LDraw MM")
+        with utils.PreservedFile(os.path.join(APP_ROOT, ImportSettings.settings_path)):
+            results["import"] = import_grid(options.instances, options.ldraw_path)
+
+    utils.write_results(options.output, results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Performance Regression Harness
+
+Runs a fixed matrix of synthetic models (see synthetic_model.py) and option
+sets through LDraw MM, Import LDraw and the Render LDraw addon. Every case
+runs in its own background Blender, so peak memory is measured per case.
+Records the wall time, per stage span totals, object, mesh and material
+counts and the peak resident set size to JSON.
+
+With a baseline, each case is compared against it:
+- times and spans may not grow by more than the time tolerance, spans below the time floor are skipped
+- peak memory may not grow by more than the memory tolerance
+- counts must match
+- a baseline case with no result is a regression
+
+A case whose Blender crashes or whose operator does not finish is always a
+regression.
+
+Pairs of models that differ only in part count are also checked for
+scaling, so an accidental O(n^2) is caught even without a baseline. Blender
+exits with code 1 when a regression is found.
+
+To Run:
+    <Blender Path>/blender --background --python benchmarks/benchmark_regression.py -- <arguments>
+- Arguments
+    -b, --baseline           Baseline JSON results file to compare against
+    -u, --update_baseline    Write the results to the baseline file
+    -c, --cases              Case names to run, default all
+    -r, --repeat             Runs per case, the median is kept, default 3
+    -t, --time_tolerance     Allowed time growth, default 0.25 (25%)
+    -f, --time_floor         Times below this many seconds are not compared, default 0.05
+    -m, --rss_tolerance      Allowed peak memory growth, default 0.15 (15%)
+    -s, --scaling_tolerance  Allowed growth over linear scaling, default 0.5 (50%)
+    -o, --output             JSON results file, printed if not specified
+"""
+
+import os
+import sys
+import json
+import tempfile
+import statistics
+import subprocess
+
+from pathlib import Path
+
+import bpy
+
+sys.path.append(str(Path(__file__).parent))
+
+import benchmark_utils as utils
+
+RESULT_PREFIX = "[regression] "
+
+# synthetic model parameters, grid_1k and grid_4k differ only in the part count
+MODELS = {
+    "grid_1k": {"instances": 1000, "distinct_parts": 8},
+    "grid_4k": {"instances": 4000, "distinct_parts": 8},
+    "nested": {"instances": 2000, "distinct_parts": 16, "depth": 2, "fan_out": 4, "steps": 8, "group_size": 4},
+    "varied": {"instances": 2000, "distinct_parts": 64, "colours": 4, "bfc_mix": 0.3, "texmaps": 4},
+}
+
+# operator properties on top of the defaults of each importer
+OPTION_SETS = {
+    "mm": {
+        "default": {},
+        "vertex_colors": {"color_strategy": "vertex_colors"},
+        "chunked": {"chunk_size": 500},
+        "bevel": {"bevel_edges": True, "bake_bevel": True},
+    },
+    "legacy": {
+        "default": {},
+        "instructions": {"look": "instructions"},
+        "bevel": {"bevelEdges": True, "bakeBevel": True},
+    },
+    "render": {
+        "draft": {"render_draft": True, "draft_engine": "workbench", "draft_percentage": 25,
+                  "resolution_width": 640, "resolution_height": 480},
+    },
+}
+
+# (importer, option set, model)
+CASES = (
+    ("mm", "default", "grid_1k"),
+    ("mm", "default", "grid_4k"),
+    ("mm", "default", "nested"),
+    ("mm", "default", "varied"),
+    ("mm", "vertex_colors", "varied"),
+    ("mm", "chunked", "grid_4k"),
+    ("mm", "bevel", "varied"),
+    ("legacy", "default", "grid_1k"),
+    ("legacy", "default", "grid_4k"),
+    ("legacy", "default", "nested"),
+    ("legacy", "default", "varied"),
+    ("legacy", "instructions", "varied"),
+    ("legacy", "bevel", "varied"),
+    ("render", "draft", "nested"),
+)
+
+# (case, case with scale times the parts, scale)
+SCALING = (
+    ("mm/default/grid_1k", "mm/default/grid_4k", 4),
+    ("legacy/default/grid_1k", "legacy/default/grid_4k", 4),
+)
+
+
+def case_name(importer, option_set, model):
+    return f"{importer}/{option_set}/{model}"
+
+
+def scene_counts():
+    return {
+        "objects": len(bpy.data.objects),
+        "meshes": len(bpy.data.meshes),
+        "materials": len(bpy.data.materials),
+    }
+
+
+def import_mm(model_file, library, options):
+    return bpy.ops.import_scene.lpub3d_import_ldraw_mm('EXEC_DEFAULT', filepath=model_file, ldraw_path=library,
+                                                        add_environment=False, position_camera=False, **options)
+
+
+def import_legacy(model_file, library, options):
+    return bpy.ops.import_scene.lpub3d_import_ldraw('EXEC_DEFAULT', filepath=model_file, ldrawPath=library,
+                                                     addEnvironment=False, positionCamera=False, **options)
+
+
+# the render addon reuses the model LDraw MM imported in this session
+def import_and_render(model_file, library, options):
+    import_mm(model_file, library, {})
+    image_file = os.path.join(tempfile.gettempdir(), "benchmark_regression.png")
+    return bpy.ops.render_scene.lpub3d_render_ldraw('EXEC_DEFAULT', cli_render=True, load_ldraw_model=False,
+                                                     use_ldraw_import_mm=True, model_file=model_file,
+                                                     image_file=image_file, overwrite_image=True, **options)
+
+
+RUNNERS = {
+    "mm": import_mm,
+    "legacy": import_legacy,
+    "render": import_and_render,
+}
+
+
+# runs in the child Blender started by launch
+def run_case(name, model_file, library):
+    importer, option_set, model = name.split("/")
+    for addon in ("io_scene_render_ldraw", "io_scene_import_ldraw", "io_scene_import_ldraw_mm"):
+        utils.enable_addon(addon)
+    from io_scene_render_ldraw.modelglobals import caches
+    from io_scene_render_ldraw.modelglobals import instrumentation
+    from io_scene_import_ldraw_mm.definitions import APP_ROOT
+    from io_scene_import_ldraw_mm.import_settings import ImportSettings
+    import io_scene_import_ldraw
+
+    legacy_preferences = os.path.join(os.path.dirname(io_scene_import_ldraw.__file__),
+                                      "config", "ImportLDrawPreferences.ini")
+
+    utils.reset_scene()
+    with utils.PreservedFile(os.path.join(APP_ROOT, ImportSettings.settings_path)), \
+         utils.PreservedFile(legacy_preferences):
+        wall_time, result = utils.timed(RUNNERS[importer], model_file, library, OPTION_SETS[importer][option_set])
+
+    spans = {span_name: span["total"] for span_name, span in instrumentation.summary()["spans"].items()}
+    return {
+        "result": sorted(result),
+        "wall_time": wall_time,
+        "spans": spans,
+        "counts": scene_counts(),
+        "peak_rss": caches.peak_rss(),
+    }
+
+
+def launch(name, model_file, library):
+    command = [bpy.app.binary_path, "--background", "--factory-startup", "--python", __file__, "--",
+               "--child", name, "--model_file", model_file, "--library", library]
+    process = subprocess.run(command, capture_output=True, text=True)
+
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+
+    utils.benchmark_print(f"No result from Blender for {name}:\n{process.stderr}")
+    return None
+
+
+# None if any run crashed or the operator did not finish
+def measure(name, model_file, library, repeat):
+    runs = [launch(name, model_file, library) for _ in range(repeat)]
+    if any(run is None or run["result"] != ["FINISHED"] for run in runs):
+        return None
+    span_names = set().union(*(run["spans"] for run in runs))
+    return {
+        "result": runs[-1]["result"],
+        "wall_time": round(statistics.median(run["wall_time"] for run in runs), 4),
+        "spans": {span_name: round(statistics.median(run["spans"].get(span_name, 0.0) for run in runs), 4)
+                  for span_name in sorted(span_names)},
+        "counts": runs[-1]["counts"],
+        "peak_rss": int(statistics.median(run["peak_rss"] for run in runs)),
+    }
+
+
+def compare(cases, baseline_cases, options):
+    """Regressions of cases against baseline_cases, one message per regression.
+
+    A baseline case missing from cases is a regression, it failed or is no longer run.
+    """
+
+    regressions = []
+
+    def check_time(name, metric, value, base_value):
+        if base_value < options.time_floor:
+            return
+        if value > base_value * (1 + options.time_tolerance):
+            regressions.append(f"{name} {metric}: {value:.4f}s, baseline {base_value:.4f}s "
+                               f"(+{(value / base_value - 1) * 100:.0f}%)")
+
+    for name in baseline_cases:
+        if name not in cases:
+            regressions.append(f"{name}: in the baseline but has no result")
+
+    for name, case in cases.items():
+        base = baseline_cases.get(name)
+        if base is None:
+            continue
+        check_time(name, "wall_time", case["wall_time"], base["wall_time"])
+        for span_name, base_value in base["spans"].items():
+            check_time(name, f"span {span_name}", case["spans"].get(span_name, 0.0), base_value)
+        if base["peak_rss"] and case["peak_rss"] > base["peak_rss"] * (1 + options.rss_tolerance):
+            regressions.append(f"{name} peak_rss: {case['peak_rss'] / (1024 * 1024):.1f} MB, "
+                               f"baseline {base['peak_rss'] / (1024 * 1024):.1f} MB")
+        for count_name, base_value in base["counts"].items():
+            if case["counts"].get(count_name) != base_value:
+                regressions.append(f"{name} {count_name}: {case['counts'].get(count_name)}, baseline {base_value}")
+    return regressions
+
+
+def check_scaling(cases, options):
+    """Regressions where a case grows faster than its part count."""
+
+    regressions = []
+    for small, large, scale in SCALING:
+        if small not in cases or large not in cases:
+            continue
+        small_time = cases[small]["wall_time"]
+        large_time = cases[large]["wall_time"]
+        if small_time < options.time_floor:
+            continue
+        ratio = large_time / small_time
+        if ratio > scale * (1 + options.scaling_tolerance):
+            regressions.append(f"{large} scaling: {ratio:.1f}x the time of {small} for {scale}x the parts")
+    return regressions
+
+
+def main():
+    arg_parser = utils.argument_parser("Run the LDraw performance regression matrix and compare it to a baseline.")
+    arg_parser.add_argument("-b", "--baseline", default="",
+                            help="Baseline JSON results file to compare against")
+    arg_parser.add_argument("-u", "--update_baseline", action="store_true",
+                            help="Write the results to the baseline file")
+    arg_parser.add_argument("-c", "--cases", nargs="+", default=[],
+                            help="Case names to run, default all")
+    arg_parser.add_argument("-r", "--repeat", type=int, default=3,
+                            help="Runs per case, the median is kept")
+    arg_parser.add_argument("-t", "--time_tolerance", type=float, default=0.25,
+                            help="Allowed time growth")
+    arg_parser.add_argument("-f", "--time_floor", type=float, default=0.05,
+                            help="Times below this many seconds are not compared")
+    arg_parser.add_argument("-m", "--rss_tolerance", type=float, default=0.15,
+                            help="Allowed peak memory growth")
+    arg_parser.add_argument("-s", "--scaling_tolerance", type=float, default=0.5,
+                            help="Allowed growth over linear scaling")
+    arg_parser.add_argument("-o", "--output", default="",
+                            help="JSON results file")
+    arg_parser.add_argument("--child", default="",
+                            help="Case to run once and print, used by the child Blender")
+    arg_parser.add_argument("--model_file", default="",
+                            help="Model of the child case")
+    arg_parser.add_argument("--library", default="",
+                            help="Library of the child case")
+    options = arg_parser.parse_args()
+
+    if options.child:
+        result = run_case(options.child, options.model_file, options.library)
+        print(RESULT_PREFIX + json.dumps(result), flush=True)
+        return
+
+    case_names = [case_name(*case) for case in CASES]
+    if options.cases:
+        case_names = [name for name in case_names if name in options.cases]
+
+    models = {}
+    for model in sorted({name.split("/")[2] for name in case_names}):
+        models[model] = utils.write_synthetic_model(f"benchmark_regression_{model}", **MODELS[model])
+
+    cases = {}
+    failed = []
+    for name in case_names:
+        utils.benchmark_print(f"Running {name}")
+        case = measure(name, *models[name.split("/")[2]], options.repeat)
+        if case is None:
+            failed.append(name)
+        else:
+            cases[name] = case
+
+    results = {
+        "blender": bpy.app.version_string,
+        "repeat": options.repeat,
+        "models": {model: MODELS[model] for model in models},
+        "cases": cases,
+    }
+
+    regressions = [f"{name}: failed, no result from Blender" for name in failed]
+    regressions += check_scaling(cases, options)
+    if options.baseline and os.path.isfile(options.baseline) and not options.update_baseline:
+        with open(options.baseline, mode='r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        # cases left out with --cases are not missing, failed cases are already reported
+        baseline_cases = {name: case for name, case in baseline.get("cases", {}).items()
+                          if name not in failed and (not options.cases or name in case_names)}
+        regressions += compare(cases, baseline_cases, options)
+    results["regressions"] = regressions
+
+    utils.write_results(options.output, results)
+    if options.baseline and options.update_baseline:
+        utils.write_results(options.baseline, results)
+
+    for regression in regressions:
+        utils.benchmark_print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+    utils.benchmark_print(f"{len(cases)} cases, no regressions")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Smooth Type Benchmark
+
+Imports the same grid model once per LDraw MM smooth type and reports
+import time, depsgraph evaluation time, evaluated vertex count and memory.
+Edge Split modifiers duplicate geometry on every evaluation, stored custom
+normals do not.
+
+To Run:
+    <Blender Path>/blender --background --python benchmarks/benchmark_smooth_type.py -- <arguments>
+- Arguments
+    -l, --ldraw_path     LDraw library path
+    -n, --parts          Part count, default 5000
+    -p, --part           Part file(s) used on the grid, default 3001.dat 3003.dat 3040b.dat
+    -s, --smooth_types   Smooth types to compare, default edge_split custom_normals
+    -r, --repeats        Depsgraph evaluations to average, default 5
+    -o, --output         JSON results file, printed if not specified
+"""
+
+import os
+import sys
+
+from pathlib import Path
+
+import bpy
+
+sys.path.append(str(Path(__file__).parent))
+
+import benchmark_utils as utils
+
+
+def evaluate_depsgraph(repeats):
+    """Force every object to re-evaluate, returning the mean evaluation time."""
+
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    elapsed = 0.0
+    for i in range(repeats):
+        for obj in bpy.data.objects:
+            obj.update_tag(refresh={'DATA'})
+        seconds, result = utils.timed(depsgraph.update)
+        elapsed += seconds
+    return elapsed / max(repeats, 1)
+
+
+def evaluated_vertex_count():
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    count = 0
+    for obj in bpy.data.objects:
+        if obj.type == 'MESH':
+            count += len(obj.evaluated_get(depsgraph).data.vertices)
+    return count
+
+
+def benchmark_smooth_type(smooth_type, model_file, options):
+    from io_scene_render_ldraw.modelglobals import caches
+
+    utils.reset_scene()
+    rss_start = utils.current_rss()
+
+    import_time, result = utils.timed(
+        bpy.ops.import_scene.lpub3d_import_ldraw_mm,
+        'EXEC_DEFAULT',
+        filepath=model_file,
+        ldraw_path=options.ldraw_path,
+        smooth_type=smooth_type,
+        shade_smooth=True,
+        add_environment=False,
+        position_camera=False,
+        import_edges=False,
+    )
+    rss_import = utils.current_rss()
+
+    first_evaluation, result = utils.timed(bpy.context.evaluated_depsgraph_get)
+    evaluation_time = evaluate_depsgraph(options.repeats)
+    rss_evaluated = utils.current_rss()
+
+    return {
+        "smooth_type": smooth_type,
+        "objects": len(bpy.data.objects),
+        "meshes": len(bpy.data.meshes),
+        "modifiers": sum(len(obj.modifiers) for obj in bpy.data.objects),
+        "evaluated_vertices": evaluated_vertex_count(),
+        "import_time": round(import_time, 4),
+        "first_evaluation_time": round(first_evaluation, 4),
+        "evaluation_time": round(evaluation_time, 4),
+        "import_rss_delta": rss_import - rss_start,
+        "evaluated_rss_delta": rss_evaluated - rss_start,
+        "peak_rss": caches.peak_rss(),
+    }
+
+
+def main():
+    arg_parser = utils.argument_parser("Compare LDraw MM smooth types on a grid model.")
+    arg_parser.add_argument("-l", "--ldraw_path", default=os.environ.get('LDRAW_DIRECTORY', ""),
+                            help="LDraw library path")
+    arg_parser.add_argument("-n", "--parts", type=int, default=5000,
+                            help="Part count")
+    arg_parser.add_argument("-p", "--part", nargs="+", default=["3001.dat", "3003.dat", "3040b.dat"],
+                            help="Part file(s) used on the grid")
+    arg_parser.add_argument("-s", "--smooth_types", nargs="+", default=["edge_split", "custom_normals"],
+                            help="Smooth types to compare")
+    arg_parser.add_argument("-r", "--repeats", type=int, default=5,
+                            help="Depsgraph evaluations to average")
+    arg_parser.add_argument("-o", "--output", default="",
+                            help="JSON results file")
+    options = arg_parser.parse_args()
+
+    utils.enable_addon("io_scene_render_ldraw")
+    utils.enable_addon("io_scene_import_ldraw_mm")
+    from io_scene_import_ldraw_mm.definitions import APP_ROOT
+    from io_scene_import_ldraw_mm.import_settings import ImportSettings
+
+    model_file = utils.write_grid_model(utils.temp_model_file(f"benchmark_grid_{options.parts}.ldr"),
+                                        options.parts, parts=options.part)
+    utils.benchmark_print(f"Model: {model_file} ({options.parts} parts)")
+
+    results = []
+    with utils.PreservedFile(os.path.join(APP_ROOT, ImportSettings.settings_path)):
+        for smooth_type in options.smooth_types:
+            utils.benchmark_print(f"Smooth type: {smooth_type}")
+            results.append(benchmark_smooth_type(smooth_type, model_file, options))
+
+    utils.write_results(options.output, {"parts": options.parts, "results": results})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Synthetic Scaling Benchmark
+
+Sweeps one synthetic model parameter (see synthetic_model.py) and for each
+value imports the model with LDraw MM and Import LDraw, and exports it again
+with the LDraw MM exporter. The models use the stand-in parts library written
+next to them, so no LDraw install is needed. Reports the time, per stage
+spans and object, mesh and material counts for each value, so import time can
+be compared against the growth of a single parameter.
+
+To Run:
+    <Blender Path>/blender --background --python benchmarks/benchmark_synthetic_scaling.py -- <arguments>
+- Arguments
+    -s, --sweep          Parameter to sweep, default instances
+    -v, --values         Parameter values, default 1000 2000 4000 8000
+    -p, --parameters     Other parameters as name=value, e.g. depth=2 texmaps=4
+    -i, --importers      Importers to run, any of mm legacy export, default all
+    -o, --output         JSON results file, printed if not specified
+"""
+
+import os
+import sys
+
+from pathlib import Path
+
+import bpy
+
+sys.path.append(str(Path(__file__).parent))
+
+import benchmark_utils as utils
+import synthetic_model
+
+IMPORTERS = ("mm", "legacy", "export")
+
+
+def scene_counts():
+    return {
+        "objects": len(bpy.data.objects),
+        "meshes": len(bpy.data.meshes),
+        "materials": len(bpy.data.materials),
+    }
+
+
+def span_totals():
+    from io_scene_render_ldraw.modelglobals import instrumentation
+
+    return {name: span["total"] for name, span in instrumentation.summary()["spans"].items()}
+
+
+def import_mm(model_file, library):
+    utils.reset_scene()
+    import_time, result = utils.timed(bpy.ops.import_scene.lpub3d_import_ldraw_mm, 'EXEC_DEFAULT',
+                                      filepath=model_file, ldraw_path=library,
+                                      add_environment=False, position_camera=False)
+    return dict(import_time=round(import_time, 4), spans=span_totals(), **scene_counts())
+
+
+def import_legacy(model_file, library):
+    utils.reset_scene()
+    import_time, result = utils.timed(bpy.ops.import_scene.lpub3d_import_ldraw, 'EXEC_DEFAULT',
+                                      filepath=model_file, ldrawPath=library,
+                                      addEnvironment=False, positionCamera=False)
+    return dict(import_time=round(import_time, 4), spans=span_totals(), **scene_counts())
+
+
+# exports the model imported by LDraw MM, the model empty carries the file header
+def export_mm(model_file, library):
+    import_mm(model_file, library)
+    model_name = os.path.basename(model_file)
+    model_obj = next((obj for obj in bpy.data.objects if obj.ldraw_props.name == model_name), None)
+    if model_obj is None:
+        utils.benchmark_print(f"No imported object for {model_name}, export skipped")
+        return {}
+    bpy.context.view_layer.objects.active = model_obj
+
+    export_file = os.path.splitext(model_file)[0] + "_export.ldr"
+    export_time, result = utils.timed(bpy.ops.export_scene.lpub3d_export_ldraw_mm, 'EXEC_DEFAULT',
+                                      filepath=export_file, ldraw_path=library)
+    with open(export_file, mode='r', encoding='utf-8') as file:
+        lines = sum(1 for line in file if line.startswith("1 "))
+    return {"export_time": round(export_time, 4), "subfile_lines": lines}
+
+
+def main():
+    arg_parser = utils.argument_parser("Time the LDraw importers and exporter over one synthetic model parameter.")
+    arg_parser.add_argument("-s", "--sweep", default="instances",
+                            choices=sorted(synthetic_model.defaults),
+                            help="Parameter to sweep")
+    arg_parser.add_argument("-v", "--values", nargs="+", default=["1000", "2000", "4000", "8000"],
+                            help="Parameter values")
+    arg_parser.add_argument("-p", "--parameters", nargs="*", default=[],
+                            help="Other parameters as name=value")
+    arg_parser.add_argument("-i", "--importers", nargs="+", default=list(IMPORTERS), choices=IMPORTERS,
+                            help="Importers to run")
+    arg_parser.add_argument("-o", "--output", default="",
+                            help="JSON results file")
+    options = arg_parser.parse_args()
+
+    # parameter values take the type of their default
+    def parameter_value(name, value):
+        return type(synthetic_model.defaults[name])(value)
+
+    parameters = {}
+    for item in options.parameters:
+        name, value = item.split("=", 1)
+        parameters[name] = parameter_value(name, value)
+
+    utils.enable_addon("io_scene_render_ldraw")
+    utils.enable_addon("io_scene_import_ldraw")
+    utils.enable_addon("io_scene_import_ldraw_mm")
+    from io_scene_import_ldraw_mm.definitions import APP_ROOT
+    from io_scene_import_ldraw_mm.import_settings import ImportSettings
+    import io_scene_import_ldraw
+
+    legacy_preferences = os.path.join(os.path.dirname(io_scene_import_ldraw.__file__),
+                                      "config", "ImportLDrawPreferences.ini")
+
+    results = []
+    with utils.PreservedFile(os.path.join(APP_ROOT, ImportSettings.settings_path)), \
+         utils.PreservedFile(legacy_preferences):
+        for value in options.values:
+            model_parameters = dict(parameters, **{options.sweep: parameter_value(options.sweep, value)})
+            model_file, library = utils.write_synthetic_model(f"benchmark_synthetic_{options.sweep}_{value}",
+                                                              **model_parameters)
+            result = {options.sweep: model_parameters[options.sweep]}
+            if "mm" in options.importers:
+                utils.benchmark_print(f"Importing {options.sweep}={value} with LDraw MM")
+                result["mm"] = import_mm(model_file, library)
+            if "legacy" in options.importers:
+                utils.benchmark_print(f"Importing {options.sweep}={value} with Import LDraw")
+                result["legacy"] = import_legacy(model_file, library)
+            if "export" in options.importers:
+                utils.benchmark_print(f"Exporting {options.sweep}={value} with LDraw MM")
+                result["export"] = export_mm(model_file, library)
+            results.append(result)
+
+    utils.write_results(options.output, {"sweep": options.sweep,
+                                         "parameters": dict(synthetic_model.defaults, **parameters),
+                                         "results": results})
+
+
+if __name__ == '__main__':
+    main()
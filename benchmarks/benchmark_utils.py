@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Benchmark Utilities
+
+Routines shared by the benchmark scripts in this folder. The scripts run
+inside Blender (blender --background --python <script> -- <arguments>)
+with the LDraw addons installed (see install_blender_ldraw_addons.py).
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+
+from pathlib import Path
+
+import bpy
+import addon_utils
+
+setup_dir = Path(__file__).parent.parent / "setup"
+sys.path.append(str(setup_dir))
+
+from addon_setup.arguments import BlenderArgumentParser
+
+import synthetic_model
+
+# A spread of common LDraw colour codes
+colour_codes = (1, 2, 4, 14, 15, 0, 71, 72, 19, 25, 27, 70)
+
+
+def benchmark_print(message):
+    print(f"[benchmark] {message}", flush=True)
+
+
+def argument_parser(description):
+    return BlenderArgumentParser(description=description)
+
+
+def enable_addon(module_name):
+    """Enable an installed LDraw addon if it is not already enabled."""
+
+    is_enabled, is_loaded = addon_utils.check(module_name)
+    if not is_loaded:
+        addon_utils.enable(module_name, default_set=False)
+
+
+def current_rss():
+    """Resident set size of this process in bytes, 0 if unavailable."""
+
+    try:
+        with open("/proc/self/statm", mode='r') as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        return 0
+
+
+def write_grid_model(filepath, part_count, parts=("3001.dat",), spacing=100, group_size=0, group_depth=1):
+    """Write an LDraw model with part_count parts laid out on a square grid.
+
+    With a group_size, every group_size parts are wrapped in group_depth
+    nested LeoCAD groups.
+    """
+
+    side = max(1, int(part_count ** 0.5 + 0.999))
+    lines = ["0 Benchmark grid model", "0 Name: " + os.path.basename(filepath), ""]
+    for i in range(part_count):
+        if group_size and i % group_size == 0:
+            if i > 0:
+                lines.extend(["0 !LEOCAD GROUP END"] * group_depth)
+            group = i // group_size
+            lines.extend(f"0 !LEOCAD GROUP BEGIN Group {group} Level {level}" for level in range(group_depth))
+        x = (i % side) * spacing
+        z = (i // side) * spacing
+        colour = colour_codes[i % len(colour_codes)]
+        part = parts[i % len(parts)]
+        lines.append(f"1 {colour} {x} 0 {z} 1 0 0 0 1 0 0 0 1 {part}")
+    if group_size and part_count > 0:
+        lines.extend(["0 !LEOCAD GROUP END"] * group_depth)
+    with open(filepath, mode='w', encoding='utf-8') as file:
+        file.write("\n".join(lines) + "\n")
+    return filepath
+
+
+def write_synthetic_model(name, **parameters):
+    """Write a synthetic model and its stand-in parts library to a temporary folder.
+
+    parameters are those of synthetic_model.defaults. Returns (model filepath, library path).
+    """
+
+    return synthetic_model.write_synthetic(os.path.join(tempfile.gettempdir(), name), **parameters)
+
+
+def temp_model_file(name):
+    return os.path.join(tempfile.gettempdir(), name)
+
+
+class PreservedFile:
+    """Restore a file (e.g. addon settings overwritten by an import) on exit."""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.content = None
+
+    def __enter__(self):
+        if self.filepath and os.path.isfile(self.filepath):
+            with open(self.filepath, mode='rb') as file:
+                self.content = file.read()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.content is not None:
+            with open(self.filepath, mode='wb') as file:
+                file.write(self.content)
+        return False
+
+
+def reset_scene():
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+
+def timed(func, *args, **kwargs):
+    """Call func, returning (elapsed seconds, result)."""
+
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def write_results(filepath, results):
+    if filepath:
+        with open(filepath, mode='w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4)
+        benchmark_print(f"Results written to {filepath}")
+    else:
+        print(json.dumps(results, indent=4))
@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+"""
+Trevor SANDY
+Last Update October 18, 2026
+Copyright (c) 2020 - 2026 by Trevor SANDY
+
+LPub3D Blender LDraw Addon GPLv2 license.
+
+This program is free software; you can redistribute it and/or
+modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation; either version 2
+of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program; if not, write to the Free Software Foundation,
+Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+
+LPub3D Blender LDraw Synthetic Model Generator
+
+Writes LDraw models with controlled parameters together with a tiny stand-in
+parts library, so import scaling can be measured one parameter at a time and
+without an LDraw install. The library holds an LDConfig.ldr, two primitives
+and one part per distinct part. The model varies the part instance count,
+distinct parts, colours per part, submodel nesting depth and fan-out, step
+count, BFC certified share, texmapped parts with !DATA images and LeoCAD
+group metas. It does not need Blender, so it can be used on its own, from
+tests or from the benchmark scripts.
+
+To Run:
+    python benchmarks/synthetic_model.py <arguments>
+- Arguments
+    -o, --output         Output folder, the library is written to <output>/ldraw
+    -n, --instances      Part instances, default 1000
+    -p, --distinct_parts Distinct parts, default 8
+    -c, --colours        Colours per part, default 2
+    -d, --depth          Submodel nesting depth, default 0
+    -f, --fan_out        Submodels per model, default 4
+    -s, --steps          Steps per model, default 1
+    -b, --bfc_mix        Share of BFC certified parts, default 0.5
+    -t, --texmaps        Texmapped parts with !DATA images, default 0
+    -g, --group_size     Parts per LeoCAD group, default 0 (no groups)
+    -r, --group_depth    Group nesting depth, default 1
+"""
+
+import os
+import sys
+import math
+import zlib
+import base64
+import struct
+import argparse
+
+defaults = {
+    'instances': 1000,
+    'distinct_parts': 8,
+    'colours': 2,
+    'depth': 0,
+    'fan_out': 4,
+    'steps': 1,
+    'bfc_mix': 0.5,
+    'texmaps': 0,
+    'group_size': 0,
+    'group_depth': 1,
+    'spacing': 100,
+}
+
+# (code, name, value, edge, extra attributes)
+colour_table = (
+    (0, "Black", "#1B2A34", "#2B4354", ""),
+    (1, "Blue", "#1E5AA8", "#333333", ""),
+    (2, "Green", "#00852B", "#333333", ""),
+    (4, "Red", "#B40000", "#333333", ""),
+    (14, "Yellow", "#FAC80A", "#333333", ""),
+    (15, "White", "#F4F4F4", "#333333", ""),
+    (19, "Tan", "#D7BA8C", "#333333", ""),
+    (25, "Orange", "#D67923", "#333333", ""),
+    (27, "Lime", "#A5CA18", "#333333", ""),
+    (70, "Reddish_Brown", "#5F3109", "#333333", ""),
+    (71, "Light_Bluish_Grey", "#969696", "#333333", ""),
+    (72, "Dark_Bluish_Grey", "#646464", "#333333", ""),
+    (47, "Trans_Clear", "#FCFCFC", "#C3C3C3", "ALPHA 128"),
+    (80, "Metallic_Silver", "#767676", "#333333", "METAL"),
+)
+
+box_primitive = "synth_box.dat"
+stud_primitive = "synth_stud.dat"
+
+rotations = (
+    "1 0 0 0 1 0 0 0 1",
+    "0 0 1 0 1 0 -1 0 0",
+)
+
+
+def part_name(index):
+    return f"synth_{index:04d}.dat"
+
+
+def texmap_part_name(index):
+    return f"synth_tex_{index:03d}.dat"
+
+
+def texture_name(index):
+    return f"synth_tex_{index:03d}.png"
+
+
+def is_certified(index, bfc_mix):
+    """Parts are certified in a repeating pattern so any prefix keeps close to the bfc_mix share."""
+
+    return int((index + 1) * bfc_mix) > int(index * bfc_mix)
+
+
+def part_size(index):
+    """Part footprint in studs and body height in LDU."""
+
+    width = 1 + index % 4
+    depth = 1 + (index // 4) % 2
+    height = 24 if (index // 8) % 2 == 0 else 8
+    return width, depth, height
+
+
+def write_lines(filepath, lines):
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    with open(filepath, mode='w', encoding='utf-8', newline="\n") as file:
+        file.write("\n".join(lines) + "\n")
+    return filepath
+
+
+def format_vertex(vertex):
+    return " ".join(f"{value:g}" for value in vertex)
+
+
+def cross(a, b):
+    return (a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0])
+
+
+# counter-clockwise from outside, the normal from the first three vertices points away from centre
+def outward(vertices, centre):
+    a = [vertices[1][i] - vertices[0][i] for i in range(3)]
+    b = [vertices[2][i] - vertices[0][i] for i in range(3)]
+    normal = cross(a, b)
+    direction = [sum(vertex[i] for vertex in vertices) / len(vertices) - centre[i] for i in range(3)]
+    if sum(normal[i] * direction[i] for i in range(3)) < 0:
+        return list(reversed(vertices))
+    return vertices
+
+
+def polygon_line(vertices, centre):
+    return f"{len(vertices)} 16 " + " ".join(format_vertex(vertex) for vertex in outward(vertices, centre))
+
+
+# a unit box from -1 to 1 on x and z and 0 to 1 on y
+def box_lines():
+    centre = (0, 0.5, 0)
+    lines = []
+    for axis in range(3):
+        for side in (0, 1):
+            u, v = [a for a in range(3) if a != axis]
+            vertices = []
+            for a, b in ((0, 0), (1, 0), (1, 1), (0, 1)):
+                corner = [0, 0, 0]
+                corner[axis] = side
+                corner[u] = a
+                corner[v] = b
+                vertices.append((2 * corner[0] - 1, corner[1], 2 * corner[2] - 1))
+            lines.append(polygon_line(vertices, centre))
+    for y in (0, 1):
+        ring = [(-1, y, -1), (1, y, -1), (1, y, 1), (-1, y, 1)]
+        for i in range(4):
+            lines.append(f"2 24 {format_vertex(ring[i])} {format_vertex(ring[(i + 1) % 4])}")
+    for x, z in ((-1, -1), (1, -1), (1, 1), (-1, 1)):
+        lines.append(f"2 24 {x} 0 {z} {x} 1 {z}")
+    return lines
+
+
+# a stud of radius 6 and height 4 standing on y = 0, -y is up
+def stud_lines(segments=8):
+    centre = (0, -2, 0)
+    # adding 0.0 turns -0.0 into 0.0
+    angles = [2 * math.pi * i / segments for i in range(segments)]
+    ring = [(round(6 * math.cos(angle), 4) + 0.0, round(6 * math.sin(angle), 4) + 0.0) for angle in angles]
+    lines = []
+    for i in range(segments):
+        x0, z0 = ring[i - 1]
+        x1, z1 = ring[i]
+        x2, z2 = ring[(i + 1) % segments]
+        lines.append(polygon_line([(0, -4, 0), (x1, -4, z1), (x2, -4, z2)], (0, 0, 0)))
+        lines.append(polygon_line([(x1, 0, z1), (x1, -4, z1), (x2, -4, z2), (x2, 0, z2)], centre))
+        lines.append(f"2 24 {x1:g} -4 {z1:g} {x2:g} -4 {z2:g}")
+        lines.append(f"5 24 {x1:g} 0 {z1:g} {x1:g} -4 {z1:g} {x0:g} 0 {z0:g} {x2:g} 0 {z2:g}")
+    return lines
+
+
+def part_lines(index, bfc_mix):
+    width, depth, height = part_size(index)
+    lines = [
+        f"0 Synthetic Brick {width} x {depth} x {height}",
+        f"0 Name: {part_name(index)}",
+        "0 Author: synthetic_model",
+        "0 !LDRAW_ORG Part UPDATE 2026-01",
+        "",
+        "0 BFC CERTIFY CCW" if is_certified(index, bfc_mix) else "0 BFC NOCERTIFY",
+        "",
+        f"1 16 0 0 0 {width * 10} 0 0 0 {height} 0 0 0 {depth * 10} {box_primitive}",
+    ]
+    # certified parts are hollow, the inner box is turned inside out
+    if is_certified(index, bfc_mix) and height > 8:
+        lines.append("0 BFC INVERTNEXT")
+        lines.append(f"1 16 0 4 0 {width * 10 - 4} 0 0 0 {height - 4} 0 0 0 {depth * 10 - 4} {box_primitive}")
+    for x in range(width):
+        for z in range(depth):
+            lines.append(f"1 16 {(x - (width - 1) / 2) * 20:g} 0 {(z - (depth - 1) / 2) * 20:g} 1 0 0 0 1 0 0 0 1 {stud_primitive}")
+    return lines
+
+
+def write_library(root, distinct_parts=defaults['distinct_parts'], bfc_mix=defaults['bfc_mix']):
+    """Write the stand-in parts library to root, returning root."""
+
+    ldconfig = ["0 Synthetic LDraw colour definitions", "0 Name: LDConfig.ldr", ""]
+    ldconfig.append("0 !COLOUR Main_Colour CODE 16 VALUE #7F7F7F EDGE #333333")
+    ldconfig.append("0 !COLOUR Edge_Colour CODE 24 VALUE #7F7F7F EDGE #333333")
+    for code, name, value, edge, extra in colour_table:
+        ldconfig.append(f"0 !COLOUR {name} CODE {code} VALUE {value} EDGE {edge} {extra}".rstrip())
+    write_lines(os.path.join(root, "LDConfig.ldr"), ldconfig)
+
+    write_lines(os.path.join(root, "p", box_primitive),
+                ["0 Synthetic Box", f"0 Name: {box_primitive}", "0 !LDRAW_ORG Primitive UPDATE 2026-01", "",
+                 "0 BFC CERTIFY CCW", ""] + box_lines())
+    write_lines(os.path.join(root, "p", stud_primitive),
+                ["0 Synthetic Stud", f"0 Name: {stud_primitive}", "0 !LDRAW_ORG Primitive UPDATE 2026-01", "",
+                 "0 BFC CERTIFY CCW", ""] + stud_lines())
+
+    for index in range(distinct_parts):
+        write_lines(os.path.join(root, "parts", part_name(index)), part_lines(index, bfc_mix))
+    return root
+
+
+# a small RGBA checker image, stored in the model as a !DATA block
+def png_bytes(index, size=4):
+    colour = colour_table[index % len(colour_table)][2]
+    red, green, blue = (int(colour[i:i + 2], 16) for i in (1, 3, 5))
+    rows = b""
+    for y in range(size):
+        row = b"\x00"
+        for x in range(size):
+            row += bytes((red, green, blue, 255)) if (x + y) % 2 == 0 else b"\xff\xff\xff\xff"
+        rows += row
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+    return (b"\x89PNG\r\n\x1a\n" +
+            chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0)) +
+            chunk(b"IDAT", zlib.compress(rows)) +
+            chunk(b"IEND", b""))
+
+
+def texmap_part_lines(index):
+    return [
+        f"0 FILE {texmap_part_name(index)}",
+        f"0 Synthetic Texmapped Tile {index}",
+        f"0 Name: {texmap_part_name(index)}",
+        "0 Author: synthetic_model",
+        "0 !LDRAW_ORG Unofficial_Part",
+        "",
+        "0 BFC CERTIFY CCW",
+        "",
+        f"1 16 0 0 0 20 0 0 0 8 0 0 0 20 {box_primitive}",
+        f"0 !TEXMAP START PLANAR -20 0 20 20 0 20 -20 0 -20 {texture_name(index)}",
+        "4 16 -20 -0.1 -20 20 -0.1 -20 20 -0.1 20 -20 -0.1 20",
+        "0 !TEXMAP END",
+        "",
+    ]
+
+
+def data_lines(index):
+    encoded = base64.b64encode(png_bytes(index)).decode("ascii")
+    lines = [f"0 !DATA {texture_name(index)}"]
+    lines.extend(f"0 !: {encoded[i:i + 76]}" for i in range(0, len(encoded), 76))
+    lines.append("")
+    return lines
+
+
+def instance_line(instance, parameters):
+    distinct_parts = max(1, parameters['distinct_parts'])
+    colours = max(1, min(parameters['colours'], len(colour_table)))
+    side = max(1, int(parameters['instances'] ** 0.5 + 0.999))
+
+    part = instance % distinct_parts
+    repeat = instance // distinct_parts
+    code = colour_table[(part + repeat % colours) % len(colour_table)][0]
+    x = (instance % side) * parameters['spacing']
+    z = (instance // side) * parameters['spacing']
+    rotation = rotations[(instance // side) % len(rotations)]
+    return f"1 {code} {x} 0 {z} {rotation} {part_name(part)}"
+
+
+def model_body(instances, parameters):
+    """Part lines for the instances of one model, split into steps and wrapped in groups."""
+
+    steps = max(1, parameters['steps'])
+    group_size = parameters['group_size']
+    group_depth = parameters['group_depth']
+    step_size = max(1, -(-len(instances) // steps))
+
+    lines = []
+    in_group = False
+    for i, instance in enumerate(instances):
+        new_step = i > 0 and i % step_size == 0
+        if in_group and (new_step or i % group_size == 0):
+            lines.extend(["0 !LEOCAD GROUP END"] * group_depth)
+            in_group = False
+        if new_step:
+            lines.append("0 STEP")
+        # groups are named after their first instance so names are unique across submodels
+        if group_size and not in_group:
+            lines.extend(f"0 !LEOCAD GROUP BEGIN Group {instance} Level {level}" for level in range(group_depth))
+            in_group = True
+        lines.append(instance_line(instance, parameters))
+    if in_group:
+        lines.extend(["0 !LEOCAD GROUP END"] * group_depth)
+    lines.append("0 STEP")
+    return lines
+
+
+def model_header(name, description):
+    return [f"0 {description}", f"0 Name: {name}", "0 Author: synthetic_model", ""]
+
+
+def write_model(filepath, **parameters):
+    """Write a synthetic model to filepath, returning filepath.
+
+    Parts come from the library written by write_library with the same
+    distinct_parts. Models with submodels or texmaps are written as MPD.
+    """
+
+    parameters = dict(defaults, **parameters)
+    instance_count = parameters['instances']
+    depth = parameters['depth']
+    fan_out = max(1, parameters['fan_out'])
+    texmaps = parameters['texmaps']
+    name = os.path.basename(filepath)
+
+    if depth < 1 and texmaps < 1:
+        lines = model_header(name, "Synthetic model") + model_body(range(instance_count), parameters)
+        return write_lines(filepath, lines)
+
+    # the leaf models hold the parts in contiguous runs, so each leaf covers one area of the grid
+    leaf_count = fan_out ** depth
+    leaves = [range(leaf * instance_count // leaf_count, (leaf + 1) * instance_count // leaf_count) for leaf in range(leaf_count)]
+
+    files = []
+
+    def add_model(model_name, level, leaf):
+        description = f"Synthetic submodel level {level}" if level > 0 else "Synthetic model"
+        lines = [f"0 FILE {model_name}"] + model_header(model_name, description)
+        if level == depth:
+            lines.extend(model_body(leaves[leaf], parameters))
+        else:
+            for child in range(fan_out):
+                child_name = f"synth_sub_{level + 1}_{leaf * fan_out + child}.ldr"
+                lines.append(f"1 16 0 0 0 1 0 0 0 1 0 0 0 1 {child_name}")
+            lines.append("0 STEP")
+        files.append(lines)
+        if level < depth:
+            for child in range(fan_out):
+                add_model(f"synth_sub_{level + 1}_{leaf * fan_out + child}.ldr", level + 1, leaf * fan_out + child)
+
+    add_model(name, 0, 0)
+
+    # the texmapped parts are placed in a row in front of the grid
+    main = files[0]
+    for index in range(texmaps):
+        main.insert(len(main) - 1, f"1 {colour_table[index % len(colour_table)][0]} {index * 40} 0 -100 1 0 0 0 1 0 0 0 1 {texmap_part_name(index)}")
+
+    lines = []
+    for model_lines in files:
+        lines.extend(model_lines)
+        lines.append("0 NOFILE")
+        lines.append("")
+    for index in range(texmaps):
+        lines.extend(texmap_part_lines(index))
+        lines.append("0 NOFILE")
+        lines.append("")
+    for index in range(texmaps):
+        lines.extend(data_lines(index))
+    return write_lines(filepath, lines)
+
+
+def write_synthetic(directory, name="synthetic", **parameters):
+    """Write a synthetic model and its parts library to directory.
+
+    Returns (model filepath, library path).
+    """
+
+    parameters = dict(defaults, **parameters)
+    library = write_library(os.path.join(directory, "ldraw"), parameters['distinct_parts'], parameters['bfc_mix'])
+    extension = ".mpd" if parameters['depth'] > 0 or parameters['texmaps'] > 0 else ".ldr"
+    model = write_model(os.path.join(directory, name + extension), **parameters)
+    return model, library
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Write a synthetic LDraw model and stand-in parts library.")
+    arg_parser.add_argument("-o", "--output", required=True,
+                            help="Output folder, the library is written to <output>/ldraw")
+    arg_parser.add_argument("-n", "--instances", type=int, default=defaults['instances'],
+                            help="Part instances")
+    arg_parser.add_argument("-p", "--distinct_parts", type=int, default=defaults['distinct_parts'],
+                            help="Distinct parts")
+    arg_parser.add_argument("-c", "--colours", type=int, default=defaults['colours'],
+                            help="Colours per part")
+    arg_parser.add_argument("-d", "--depth", type=int, default=defaults['depth'],
+                            help="Submodel nesting depth")
+    arg_parser.add_argument("-f", "--fan_out", type=int, default=defaults['fan_out'],
+                            help="Submodels per model")
+    arg_parser.add_argument("-s", "--steps", type=int, default=defaults['steps'],
+                            help="Steps per model")
+    arg_parser.add_argument("-b", "--bfc_mix", type=float, default=defaults['bfc_mix'],
+                            help="Share of BFC certified parts")
+    arg_parser.add_argument("-t", "--texmaps", type=int, default=defaults['texmaps'],
+                            help="Texmapped parts with !DATA images")
+    arg_parser.add_argument("-g", "--group_size", type=int, default=defaults['group_size'],
+                            help="Parts per LeoCAD group")
+    arg_parser.add_argument("-r", "--group_depth", type=int, default=defaults['group_depth'],
+                            help="Group nesting depth")
+    options = vars(arg_parser.parse_args())
+
+    directory = options.pop("output")
+    model, library = write_synthetic(directory, **options)
+    print(f"Model: {model}")
+    print(f"Library: {library}")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -35,7 +35,7 @@ class Preferences():
         # Version 1.5 and later attribute updates:
         for section in self.__config.sections():
             if section == "ImportLDraw":
-                addList = ['realgapwidth,0.0002', 'realscale,0.02']
+                addList = ['realgapwidth,0.0002', 'realscale,0.02', 'bakebevel,False']
                 for addItem in addList:
                     pair = addItem.split(",")
                     if not self.__config.has_option(section, pair[0]):
@@ -47,7 +47,7 @@ class Preferences():
                         self.__config[section].pop(popItem)
                         self.__updateIni = True
             elif section == "ImportLDrawMM":
-                addList = ['colorstrategy,material']
+                addList = ['colorstrategy,material', 'bakebevel,False', 'usearchivelibrary,False', 'chunksize,0']
                 addList += ['casesensitivefilesystem,True'] if sys.platform == "linux" else ['casesensitivefilesystem,False']
                 for addItem in addList:
                     pair = addItem.split(",")
@@ -68,6 +68,7 @@ class Preferences():
             self.__default_settings = {
                 'add_environment': self.__config[self.__sectionName]['addenvironment'],
                 'additional_search_paths': self.__config[self.__sectionName]['additionalsearchpaths'],
+                'bake_bevel': self.__config[self.__sectionName]['bakebevel'],
                 'bevel_edges': self.__config[self.__sectionName]['beveledges'],
                 'bevel_weight': self.__config[self.__sectionName]['bevelweight'],
                 'bevel_width': self.__config[self.__sectionName]['bevelwidth'],
@@ -77,6 +78,7 @@ class Preferences():
                 'camera_border_percent': self.__config[self.__sectionName]['cameraborderpercent'],
                 'case_sensitive_filesystem': self.__config[self.__sectionName]['casesensitivefilesystem'],
                 'chosen_logo': self.__config[self.__sectionName]['chosenlogo'],
+                'chunk_size': self.__config[self.__sectionName]['chunksize'],
                 'color_strategy': self.__config[self.__sectionName]['colorstrategy'],
                 'crop_image': self.__config[self.__sectionName]['cropimage'],
                 'custom_ldconfig_file': self.__config[self.__sectionName]['customldconfigfile'],
@@ -126,6 +128,7 @@ class Preferences():
                 'transparent_background': self.__config[self.__sectionName]['transparentbackground'],
                 'treat_shortcut_as_model': self.__config[self.__sectionName]['treatshortcutasmodel'],
                 'triangulate': self.__config[self.__sectionName]['triangulate'],
+                'use_archive_library': self.__config[self.__sectionName]['usearchivelibrary'],
                 'use_colour_scheme': self.__config[self.__sectionName]['usecolourscheme'],
                 'use_freestyle_edges': self.__config[self.__sectionName]['usefreestyleedges'],
                 'verbose': self.__config[self.__sectionName]['verbose']